@@ -0,0 +1 @@
+"""Offline benchmarks and synthetic data for the live results dashboard."""
@@ -0,0 +1,124 @@
+"""Replay a recorded history at max speed as a throughput benchmark of the render path.
+
+Every recorded change of every competition goes through the same steps a dashboard session
+runs: point-in-time lookup, parse/clean/compact, CompetitionSnapshot, card HTML and the
+standings diff. It then reports how much memory compaction saves on each competition's
+latest recorded body.
+
+Usage:
+    python -m benchmarks.replay --db ifsc_history.sqlite3
+    python -m benchmarks.replay --synthetic /tmp/history.sqlite3   # record synthetic rounds first
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from io import StringIO
+from typing import List
+
+import pandas as pd
+
+import ifsc_core as app
+from benchmarks import synthetic
+
+
+def record_synthetic_history(path: str, step_seconds: float = 2.0) -> app.SnapshotHistory:
+    """Record every competition's generated timeline into a fresh history store at ``path``"""
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+    history = app.SnapshotHistory(path)
+    start = datetime.now().replace(microsecond=0) - timedelta(hours=1)
+    for seed, name in enumerate(app.Config.SHEET_GIDS):
+        athletes = 8 if "Final" in name else 24
+        timeline = synthetic.lead_timeline if "Lead" in name else synthetic.boulder_timeline
+        for i, frame in enumerate(timeline(athletes, seed=seed)):
+            body = synthetic.to_csv(frame).encode("utf-8")
+            history.record(name, start + timedelta(seconds=i * step_seconds),
+                           hashlib.sha256(body).hexdigest(), body)
+    history.flush()
+    return history
+
+
+def replay_all(source: app.ReplaySource, names: List[str]) -> dict:
+    """Render every recorded change in order and return throughput figures"""
+    previous = {}
+    frames = 0
+    started = time.perf_counter()
+
+    position = source.start
+    while position is not None:
+        for name in names:
+            snapshot, _ = source.load_snapshot(name, position)
+            cards = snapshot.cards
+            "\n".join(card.html for card in cards)
+            app.diff_standings(previous.get(name, []), cards)
+            previous[name] = cards
+        frames += 1
+        position = source.next_change(position, names)
+
+    elapsed = time.perf_counter() - started
+    return {
+        "frames": frames,
+        "competitions": len(names),
+        "seconds": round(elapsed, 3),
+        "frames_per_second": round(frames / elapsed, 1) if elapsed else None,
+        "ms_per_frame": round(elapsed / frames * 1000, 3) if frames else None,
+    }
+
+
+def memory_report(source: app.ReplaySource, names: List[str]) -> dict:
+    """Bytes of each competition's latest recorded body as a cleaned frame and once compacted"""
+    report = {}
+    for name in names:
+        body = source.history.body(source.result_at(name, source.end).body_hash)
+        raw = pd.read_csv(StringIO(body.decode("utf-8", "replace")), encoding="utf-8", low_memory=False)
+        cleaned = app.DataLoader._clean_dataframe(raw)
+        compact = app.DataLoader._compact_dataframe(cleaned)
+        report[name] = {
+            "raw_bytes": int(cleaned.memory_usage(deep=True).sum()),
+            "compact_bytes": int(compact.memory_usage(deep=True).sum()),
+        }
+    return report
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--db", help="history store recorded by the dashboard")
+    group.add_argument("--synthetic", metavar="PATH", help="record synthetic rounds to PATH and replay them")
+    parser.add_argument("--output", help="write the throughput figures as JSON")
+    args = parser.parse_args(argv)
+    pd.set_option("mode.copy_on_write", True)
+
+    history = record_synthetic_history(args.synthetic) if args.synthetic else app.SnapshotHistory(args.db)
+    source = app.ReplaySource(history, list(app.Config.SHEET_GIDS))
+    if not source.competitions:
+        print("No recorded snapshots to replay")
+        return 1
+
+    report = replay_all(source, source.competitions)
+    print(f"{report['frames']} frames x {report['competitions']} competitions in {report['seconds']} s: "
+          f"{report['frames_per_second']} frames/s, {report['ms_per_frame']} ms/frame")
+
+    report["memory"] = memory_report(source, source.competitions)
+    for name, row in report["memory"].items():
+        print(f"{name:24} memory {row['raw_bytes'] / 1024:9.1f} KB -> {row['compact_bytes'] / 1024:9.1f} KB")
+    raw = sum(row["raw_bytes"] for row in report["memory"].values())
+    compact = sum(row["compact_bytes"] for row in report["memory"].values())
+    print(f"{'All competitions':24} memory {raw / 1024:9.1f} KB -> {compact / 1024:9.1f} KB "
+          f"({100 * (1 - compact / max(raw, 1)):.0f}% smaller)")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
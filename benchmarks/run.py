@@ -0,0 +1,271 @@
+"""Benchmark the load -> clean -> classify -> render pipeline on synthetic sheets.
+
+Usage:
+    python -m benchmarks.run                              # all sizes, writes benchmarks/results.json
+    python -m benchmarks.run --sizes 8 24 --output out.json
+    python -m benchmarks.run --baseline old.json          # exit 1 on regressions
+    python -m benchmarks.run --check                      # only check clean_series on every code point
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+from io import StringIO
+from typing import Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+
+import ifsc_core as app
+from benchmarks import synthetic
+
+DEFAULT_SIZES = [8, 24, 200, 10000]
+DEFAULT_OUTPUT = "benchmarks/results.json"
+
+
+def time_stage(func: Callable, min_time: float = 0.2, min_repeats: int = 3, max_repeats: int = 200,
+               setup: Callable = None) -> Dict[str, float]:
+    """Run ``func`` until ``min_time`` has elapsed (and at least ``min_repeats`` times)"""
+    timings = []
+    started = time.perf_counter()
+    while len(timings) < max_repeats and (len(timings) < min_repeats or time.perf_counter() - started < min_time):
+        if setup is not None:
+            setup()
+        t0 = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - t0) * 1000)
+
+    return {
+        "median_ms": statistics.median(timings),
+        "min_ms": min(timings),
+        "mean_ms": statistics.fmean(timings),
+        "repeats": len(timings),
+    }
+
+
+def clear_clean_memo():
+    app.DataProcessor._clean_text_memo.clear()
+
+
+def benchmark_discipline(discipline: str, athletes: int, seed: int = 0) -> List[Dict]:
+    """Time every pipeline stage for one synthetic sheet"""
+    if discipline == "Boulder":
+        sheet = synthetic.boulder_sheet(athletes, seed=seed)
+        competition = "Male Boulder Final" if athletes <= 8 else "Male Boulder Semis"
+    else:
+        sheet = synthetic.lead_sheet(athletes, seed=seed)
+        competition = "Male Lead Final" if athletes <= 8 else "Male Lead Semis"
+
+    body = synthetic.to_csv(sheet)
+    raw = pd.read_csv(StringIO(body), encoding='utf-8', low_memory=False)
+    cleaned = app.DataLoader._clean_dataframe(raw)
+    compact = app.DataLoader._compact_dataframe(cleaned)
+    snapshot = app.CompetitionSnapshot(competition, compact)
+
+    stages = {
+        "parse_csv": (lambda: pd.read_csv(StringIO(body), encoding='utf-8', low_memory=False), None),
+        "clean_dataframe": (lambda: app.DataLoader._clean_dataframe(raw), clear_clean_memo),
+        "clean_dataframe_warm": (lambda: app.DataLoader._clean_dataframe(raw), None),
+        "compact_dataframe": (lambda: app.DataLoader._compact_dataframe(cleaned), None),
+        "competition_status": (lambda: app.CompetitionStatusDetector.get_competition_status(compact, competition), None),
+        "snapshot": (lambda: app.CompetitionSnapshot(competition, compact), None),
+    }
+
+    if discipline == "Boulder":
+        stages["metrics"] = (lambda: app.MetricsCalculator.calculate_boulder_metrics(compact), None)
+        infos = app.calculate_boulder_completion(snapshot.standings)
+        stages["scenarios"] = (
+            lambda: app.BoulderScenarios.solve_standings(snapshot.standings, snapshot.score_col, infos,
+                                                         snapshot.previous_ranks), None
+        )
+        if athletes <= 24:
+            # 10^5 simulations per call; only round-sized sheets are realistic here
+            stages["podium_simulation"] = (
+                lambda: app.PodiumSimulation.probabilities(snapshot, app.PodiumSimulation.DEFAULT_OUTCOMES), None
+            )
+        stages["athlete_status"] = (lambda: boulder_athlete_statuses(snapshot), None)
+        stages["cards_html"] = (
+            lambda: app.build_boulder_cards_html(snapshot.standings, snapshot.score_col, competition), None
+        )
+    else:
+        active = app.filter_active_athletes(compact, competition)
+        stages["filter_active_athletes"] = (lambda: app.filter_active_athletes(compact, competition), None)
+        stages["metrics"] = (lambda: app.MetricsCalculator.calculate_lead_metrics(active), None)
+        stages["athlete_status"] = (lambda: lead_athlete_statuses(snapshot), None)
+        stages["cards_html"] = (
+            lambda: app.build_lead_cards_html(snapshot.standings, snapshot.qualification_info), None
+        )
+
+    results = []
+    for stage, (func, setup) in stages.items():
+        timing = time_stage(func, setup=setup)
+        results.append({"discipline": discipline, "athletes": athletes, "stage": stage, **timing})
+
+    results.append({
+        "discipline": discipline, "athletes": athletes, "stage": "memory",
+        "raw_bytes": int(cleaned.memory_usage(deep=True).sum()),
+        "compact_bytes": int(compact.memory_usage(deep=True).sum()),
+    })
+    return results
+
+
+def boulder_athlete_statuses(snapshot: "app.CompetitionSnapshot") -> List:
+    standings = snapshot.standings
+    boulder_infos = app.calculate_boulder_completion(standings)
+    scenarios = app.BoulderScenarios.solve_standings(standings, snapshot.score_col, boulder_infos,
+                                                     snapshot.previous_ranks)
+    impossible = app.check_all_podium_impossible(standings, scenarios).tolist()
+    ranks = app.column_values(standings, 'Current Position/Rank', 'N/A')
+    scores = app.column_values(standings, snapshot.score_col, 'N/A')
+    return [
+        app.determine_athlete_status(rank, score, info, snapshot.name, flag)
+        for rank, score, info, flag in zip(ranks, scores, boulder_infos, impossible)
+    ]
+
+
+def lead_athlete_statuses(snapshot: "app.CompetitionSnapshot") -> List:
+    statuses = app.column_values(snapshot.standings, 'Status', 'Unknown')
+    scores = app.column_values(snapshot.standings, 'Manual Score', 'N/A')
+    return [
+        app.determine_lead_athlete_status(status, score not in ['N/A', '', None] and not pd.isna(score))
+        for status, score in zip(statuses, scores)
+    ]
+
+
+def check_clean_equivalence(sizes: List[int]) -> bool:
+    """Confirm the vectorized cleaner matches the scalar clean_text on every synthetic sheet"""
+    for athletes in sizes:
+        for sheet in (synthetic.boulder_sheet(athletes), synthetic.lead_sheet(athletes)):
+            raw = pd.read_csv(StringIO(synthetic.to_csv(sheet)), low_memory=False)
+            for col in raw.columns:
+                if raw[col].dtype == 'object':
+                    clear_clean_memo()
+                    if not raw[col].apply(app.DataProcessor.clean_text).equals(app.DataProcessor.clean_series(raw[col])):
+                        print(f"clean_series differs from clean_text on {col!r} ({athletes} athletes)")
+                        return False
+    return True
+
+
+# Pieces the edge-case strings are built from: plain text, the â/Â the scalar cleaner
+# strips, UTF-8 read as Latin-1/cp1252, lone surrogates and non-ASCII whitespace
+EDGE_CASE_PIECES = [
+    "a", "Z", "9", "_", "-", ".", ",", "(", ")", "é", "ß", "Ø", "中", "ı", "ǅ", "٣", "😀",
+    "â", "Â", "ââ", "Ã©", "Ã¼", "â€™", "â€œ", "Ã‰", "Â\xa0", "ï»¿", "\ufffd", "\x00",
+    "\ud800", "\udfff", "\udc80\ud83d",
+    " ", "  ", "\t", "\n", "\r\n", "\x0b", "\x0c", "\x1c", "\x1f", "\x85", "\xa0",
+    "\u1680", "\u2003", "\u200b", "\u2028", "\u2029", "\u202f", "\u3000", "\ufeff",
+]
+
+
+def edge_case_strings(count: int = 45000, seed: int = 0) -> List[str]:
+    """Every code point on its own and between letters, then ``count`` seeded random
+    strings of up to eight EDGE_CASE_PIECES"""
+    code_points = [chr(cp) for cp in range(0x110000)]
+    strings = code_points + [f"a{c}b" for c in code_points] + [""]
+    rng = np.random.default_rng(seed)
+    for length in rng.integers(1, 9, size=count):
+        strings.append("".join(EDGE_CASE_PIECES[i] for i in rng.integers(0, len(EDGE_CASE_PIECES), size=length)))
+    return strings
+
+
+def check_clean_edge_cases() -> bool:
+    """Confirm clean_series matches clean_text on every code point and on generated strings
+    mixing â/Â, mojibake, lone surrogates and Unicode whitespace"""
+    strings = edge_case_strings()
+    chunk = app.DataProcessor.CLEAN_TEXT_MEMO_LIMIT
+    for start in range(0, len(strings), chunk):
+        # With a missing value present, chunks holding NULs or lone surrogates still take
+        # the vectorized path instead of falling back to clean_text
+        for values in (strings[start:start + chunk], strings[start:start + chunk] + [None]):
+            raw = pd.Series(values, dtype=object)
+            clear_clean_memo()
+            expected = raw.apply(app.DataProcessor.clean_text)
+            actual = app.DataProcessor.clean_series(raw)
+            if not expected.equals(actual):
+                first = (expected != actual).idxmax()
+                print(f"clean_series differs from clean_text on {raw[first]!r}: "
+                      f"{actual[first]!r} != {expected[first]!r}")
+                return False
+    return True
+
+
+def compare(results: List[Dict], baseline: List[Dict], tolerance: float) -> List[str]:
+    """Return a description of every stage whose median got slower than ``tolerance`` allows"""
+    key = lambda row: (row["discipline"], row["athletes"], row["stage"])
+    previous = {key(row): row for row in baseline if "median_ms" in row}
+
+    regressions = []
+    for row in results:
+        old = previous.get(key(row))
+        if old is None or "median_ms" not in row:
+            continue
+        if row["median_ms"] > old["median_ms"] * (1 + tolerance) and row["median_ms"] - old["median_ms"] > 0.05:
+            regressions.append(
+                f"{row['discipline']} x{row['athletes']} {row['stage']}: "
+                f"{old['median_ms']:.3f} ms -> {row['median_ms']:.3f} ms"
+            )
+    return regressions
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="athlete counts to benchmark")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="where to write the JSON results")
+    parser.add_argument("--baseline", help="previous results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown before a stage is flagged")
+    parser.add_argument("--check", action="store_true",
+                        help="skip the timings and check clean_series against clean_text on every code point")
+    args = parser.parse_args(argv)
+    pd.set_option("mode.copy_on_write", True)
+
+    if args.check:
+        equivalent = check_clean_edge_cases()
+        print("clean_series matches clean_text" if equivalent else "clean_series differs from clean_text")
+        return 0 if equivalent else 1
+
+    results = []
+    for athletes in args.sizes:
+        for discipline in ("Boulder", "Lead"):
+            results.extend(benchmark_discipline(discipline, athletes))
+            for row in results[-1:]:
+                print(f"{discipline:8} x{athletes:<6} memory {row['raw_bytes'] / 1024:9.1f} KB -> "
+                      f"{row['compact_bytes'] / 1024:9.1f} KB")
+
+    for row in results:
+        if "median_ms" in row:
+            print(f"{row['discipline']:8} x{row['athletes']:<6} {row['stage']:24} {row['median_ms']:10.3f} ms")
+
+    equivalent = check_clean_equivalence([size for size in args.sizes if size <= 200])
+
+    report = {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "clean_series_matches_clean_text": equivalent,
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {args.output}")
+
+    status = 0 if equivalent else 1
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f)["results"], args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            status = 1
+
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,335 @@
+"""Local stand-in for the Google Sheets CSV export endpoint.
+
+Serves ``/export?format=csv&gid=...`` for every gid in ``Config.SHEET_GIDS`` from a timeline of
+snapshots that advances every ``--step`` seconds, with optional latency, 500s, 429s and ETags.
+``/export?format=xlsx`` serves every sheet's current frame as one workbook, one tab per
+competition, for ``IFSC_BULK_EXPORT`` (needs openpyxl).
+
+Usage:
+    python -m benchmarks.sheet_server --port 8765 --step 3
+    IFSC_SHEETS_BASE_URL=http://127.0.0.1:8765 streamlit run streamlit_app.py
+
+    python -m benchmarks.sheet_server --latency 0.5 --jitter 0.5 --slow 1415967322=12
+    python -m benchmarks.sheet_server --throttle-rate 0.3 --error-rate 0.05
+    python -m benchmarks.sheet_server --script timeline.json
+    python -m benchmarks.sheet_server --redirect-host localhost   # with the app on 127.0.0.1
+
+Like Google's export, which answers with a 307 to a ``*.googleusercontent.com`` host,
+``--redirect-host`` sends every export request that arrives under another host name to the
+same path on that host, so clients go through two hosts per fetch.
+
+A timeline script is JSON listing CSV files per gid (paths relative to the script); gids it
+does not mention keep their generated timeline:
+    {"step_seconds": 5, "sheets": {"1415967322": ["final_0.csv", "final_1.csv"]}}
+
+``GET /_status`` returns the current frame of every sheet and response counters.
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import random
+import threading
+import time
+from collections import Counter
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from benchmarks import synthetic
+
+
+class SheetTimeline:
+    """CSV snapshots of one sheet, advancing one frame every ``step_seconds``"""
+
+    def __init__(self, frames: List[str], step_seconds: float, loop: bool = False, title: str = ""):
+        if not frames:
+            raise ValueError("A timeline needs at least one frame")
+        self.frames = frames
+        self.title = title  # Tab title in the xlsx export
+        self.step_seconds = step_seconds
+        self.loop = loop
+        # Precomputed so every request can answer conditional headers without hashing
+        self.etags = [f'"{hashlib.sha256(frame.encode("utf-8")).hexdigest()[:32]}"' for frame in frames]
+
+    def index_at(self, elapsed: float) -> int:
+        step = int(elapsed / self.step_seconds) if self.step_seconds > 0 else 0
+        if self.loop:
+            return step % len(self.frames)
+        return min(step, len(self.frames) - 1)
+
+
+def generated_timeline(name: str, seed: int) -> List[str]:
+    """Default timeline for a competition: a round progressing climb by climb"""
+    athletes = 8 if "Final" in name else 24
+    if "Lead" in name:
+        frames = synthetic.lead_timeline(athletes, seed=seed)
+    else:
+        frames = synthetic.boulder_timeline(athletes, seed=seed)
+    return [synthetic.to_csv(frame) for frame in frames]
+
+
+def numeric_cell(value: str):
+    """A CSV cell as the number or blank Google Sheets would store in the workbook"""
+    if value == "":
+        return None
+    for convert in (int, float):
+        try:
+            return convert(value)
+        except ValueError:
+            pass
+    return value
+
+
+def workbook_bytes(tabs: Dict[str, str]) -> bytes:
+    """An xlsx workbook with one tab per ``{title: CSV text}``, typed the way Sheets exports it"""
+    import pandas as pd
+
+    buffer = io.BytesIO()
+    with pd.ExcelWriter(buffer, engine="openpyxl") as writer:
+        for title, text in tabs.items():
+            frame = pd.read_csv(io.StringIO(text), header=None, dtype=str, keep_default_na=False)
+            # Excel caps tab titles at 31 characters, as does the Sheets export
+            frame.apply(lambda column: column.map(numeric_cell)).to_excel(
+                writer, sheet_name=title[:31], header=False, index=False
+            )
+    return buffer.getvalue()
+
+
+def build_timelines(sheet_gids: Dict[str, str], step_seconds: float, loop: bool = False,
+                    script: Optional[str] = None) -> Dict[str, SheetTimeline]:
+    """Timelines keyed by gid, generated per competition and overridden by ``script``"""
+    timelines = {
+        gid: SheetTimeline(generated_timeline(name, seed), step_seconds, loop, title=name)
+        for seed, (name, gid) in enumerate(sheet_gids.items())
+    }
+
+    if script:
+        with open(script) as f:
+            spec = json.load(f)
+        base_dir = os.path.dirname(os.path.abspath(script))
+        script_step = spec.get("step_seconds", step_seconds)
+        for gid, paths in spec.get("sheets", {}).items():
+            frames = []
+            for path in paths:
+                with open(os.path.join(base_dir, path), encoding="utf-8") as f:
+                    frames.append(f.read())
+            title = timelines[str(gid)].title if str(gid) in timelines else str(gid)
+            timelines[str(gid)] = SheetTimeline(frames, script_step, spec.get("loop", loop), title=title)
+
+    return timelines
+
+
+class SheetServer(ThreadingHTTPServer):
+    """HTTP server holding the timelines, fault settings and response counters"""
+
+    daemon_threads = True
+
+    def __init__(self, address, timelines: Dict[str, SheetTimeline], latency: float = 0.0,
+                 jitter: float = 0.0, slow: Optional[Dict[str, float]] = None, error_rate: float = 0.0,
+                 throttle_rate: float = 0.0, retry_after: int = 5, etags: bool = True,
+                 seed: Optional[int] = None, quiet: bool = False, redirect_host: Optional[str] = None):
+        super().__init__(address, SheetRequestHandler)
+        self.timelines = timelines
+        self.latency = latency
+        self.jitter = jitter
+        self.slow = slow or {}
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.etags = etags
+        self.quiet = quiet
+        self.redirect_host = redirect_host
+        self.started = time.monotonic()
+        self.started_at = time.time()
+        self.counters = Counter()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._workbook = None  # (frame indexes, ETag, Last-Modified, body) of the last xlsx export
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    def random(self) -> float:
+        with self._lock:
+            return self._rng.random()
+
+    def count(self, key: str):
+        with self._lock:
+            self.counters[key] += 1
+
+    def workbook(self) -> Tuple[str, str, bytes]:
+        """ETag, Last-Modified and body of the xlsx export of every sheet's current frame"""
+        elapsed = self.elapsed()
+        timelines = list(self.timelines.values())
+        indexes = tuple(timeline.index_at(elapsed) for timeline in timelines)
+        with self._lock:
+            if self._workbook is not None and self._workbook[0] == indexes:
+                return self._workbook[1:]
+
+        # Built outside the lock; concurrent builds of the same frames give the same bytes
+        etag = "".join(timeline.etags[index] for timeline, index in zip(timelines, indexes))
+        etag = f'"{hashlib.sha256(etag.encode("utf-8")).hexdigest()[:32]}"'
+        changed_at = max(index * timeline.step_seconds for timeline, index in zip(timelines, indexes))
+        last_modified = formatdate(self.started_at + changed_at, usegmt=True)
+        body = workbook_bytes({
+            timeline.title: timeline.frames[index] for timeline, index in zip(timelines, indexes)
+        })
+        with self._lock:
+            self._workbook = (indexes, etag, last_modified, body)
+        return etag, last_modified, body
+
+    def status(self) -> Dict:
+        elapsed = self.elapsed()
+        with self._lock:
+            counters = dict(self.counters)
+        return {
+            "elapsed": round(elapsed, 3),
+            "sheets": {
+                gid: {"frame": timeline.index_at(elapsed), "frames": len(timeline.frames)}
+                for gid, timeline in self.timelines.items()
+            },
+            "responses": counters,
+        }
+
+
+class SheetRequestHandler(BaseHTTPRequestHandler):
+    """Answers CSV export requests the way Google Sheets does, plus the configured faults"""
+
+    server: SheetServer
+    protocol_version = "HTTP/1.1"  # Keep-alive, so clients can reuse pooled connections
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        if parsed.path == "/_status":
+            self._send(200, json.dumps(self.server.status()).encode("utf-8"), "application/json")
+            return
+        if not parsed.path.endswith("/export"):
+            self._send(404, b"Not found", "text/plain")
+            return
+
+        host = self.headers.get("Host", "").rsplit(":", 1)[0]
+        if self.server.redirect_host and host != self.server.redirect_host:
+            port = self.server.server_address[1]
+            self._send(307, b"", None, {"Location": f"http://{self.server.redirect_host}:{port}{self.path}"})
+            return
+
+        query = parse_qs(parsed.query)
+        bulk = query.get("format", ["csv"])[0] == "xlsx"
+        gid = query.get("gid", ["0"])[0]
+        timeline = self.server.timelines.get(gid)
+        if timeline is None and not bulk:
+            self._send(404, f"Unknown gid {gid}".encode("utf-8"), "text/plain")
+            return
+
+        latency = self.server.latency if bulk else self.server.slow.get(gid, self.server.latency)
+        delay = latency + self.server.jitter * self.server.random()
+        if delay > 0:
+            time.sleep(delay)
+
+        if self.server.random() < self.server.throttle_rate:
+            self._send(429, b"Too Many Requests", "text/plain",
+                       {"Retry-After": str(self.server.retry_after)})
+            return
+        if self.server.random() < self.server.error_rate:
+            self._send(500, b"Internal Server Error", "text/plain")
+            return
+
+        if bulk:
+            etag, last_modified, body = self.server.workbook()
+            content_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        else:
+            index = timeline.index_at(self.server.elapsed())
+            etag = timeline.etags[index]
+            last_modified = formatdate(self.server.started_at + index * timeline.step_seconds, usegmt=True)
+            body = timeline.frames[index].encode("utf-8")
+            content_type = "text/csv; charset=utf-8"
+
+        headers = {
+            "Last-Modified": last_modified,
+            "Cache-Control": "private, max-age=0",
+        }
+        if self.server.etags:
+            headers["ETag"] = etag
+            if self.headers.get("If-None-Match") == etag:
+                self._send(304, b"", None, headers)
+                return
+
+        self._send(200, body, content_type, headers)
+
+    def _send(self, code: int, body: bytes, content_type: Optional[str], headers: Optional[Dict[str, str]] = None):
+        self.server.count(str(code))
+        self.send_response(code)
+        if content_type:
+            self.send_header("Content-Type", content_type)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+def parse_slow(values: List[str]) -> Dict[str, float]:
+    """Parse ``GID=SECONDS`` pairs"""
+    slow = {}
+    for value in values:
+        gid, _, seconds = value.partition("=")
+        slow[gid] = float(seconds)
+    return slow
+
+
+def main(argv: List[str] = None):
+    # Imported here so importing the server module does not load the whole pipeline
+    from ifsc_core import Config
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--step", type=float, default=3.0, help="seconds between timeline frames")
+    parser.add_argument("--loop", action="store_true", help="restart timelines after the last frame")
+    parser.add_argument("--script", help="JSON timeline script overriding generated sheets")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="random extra latency, up to this many seconds")
+    parser.add_argument("--slow", action="append", default=[], metavar="GID=SECONDS",
+                        help="latency override for one sheet (repeatable)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 500")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="fraction of requests answered with 429")
+    parser.add_argument("--retry-after", type=int, default=5, help="Retry-After seconds sent with 429s")
+    parser.add_argument("--no-etag", action="store_true", help="omit ETags so every poll downloads the body")
+    parser.add_argument("--redirect-host", help="307-redirect export requests to this host name, as Google does")
+    parser.add_argument("--seed", type=int, help="seed for latency jitter and injected faults")
+    parser.add_argument("--quiet", action="store_true", help="do not log each request")
+    args = parser.parse_args(argv)
+
+    timelines = build_timelines(Config.SHEET_GIDS, args.step, args.loop, args.script)
+    server = SheetServer(
+        (args.host, args.port), timelines, latency=args.latency, jitter=args.jitter,
+        slow=parse_slow(args.slow), error_rate=args.error_rate, throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after, etags=not args.no_etag, seed=args.seed, quiet=args.quiet,
+        redirect_host=args.redirect_host,
+    )
+    print(f"Serving {len(timelines)} sheets at {server.base_url}")
+    print(f"Point the app at it with IFSC_SHEETS_BASE_URL={server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""Synthetic boulder and lead sheets shaped like the Google Sheets exports."""
+
+import random
+from typing import List, Optional
+
+import pandas as pd
+
+BOULDER_COUNT = 4
+
+FIRST_NAMES = ["Tomoa", "Mejdi", "Sorato", "Hannes", "Jongwon", "Toby", "Colin", "Adam",
+               "Janja", "Ai", "Brooke", "Oriane", "Natalia", "Jessica", "Chaehyun", "Mia"]
+LAST_NAMES = ["NARASAKI", "SCHALCK", "ANRAKU", "VAN DUYSEN", "CHON", "ROBERTS", "DUFFY", "ONDRA",
+              "GARNBRET", "MORI", "RABOUTOU", "BERTONE", "GROSSMAN", "PILZ", "SEO", "KRAMPL"]
+
+BOULDER_COLUMNS = (
+    ["Athlete Name"]
+    + [f"Boulder {i} Score (0-25)" for i in range(1, BOULDER_COUNT + 1)]
+    + ["Total Score", "Current Position/Rank", "Worst Finish",
+       "1st Place Strategy", "2nd Place Strategy", "3rd Place Strategy", "Points Needed for Top 8"]
+)
+
+LEAD_COLUMNS = ["Name", "Manual Score", "Current Rank", "Status", "Worst Finish",
+                "Hold for 1st", "Hold for 2nd", "Hold for 3rd", "Hold to Qualify", "Min to Qualify"]
+
+
+def athlete_names(count: int, seed: int = 0) -> List[str]:
+    """Return ``count`` distinct athlete names"""
+    rng = random.Random(seed)
+    names = []
+    for i in range(count):
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        names.append(name if i < len(FIRST_NAMES) else f"{name} {i}")
+    return names
+
+
+def boulder_points(top_attempt: Optional[int], zone_attempt: Optional[int]) -> float:
+    """Points for one boulder: 25 for a top, 10 for a zone, minus 0.1 per failed attempt"""
+    if top_attempt:
+        return round(25 - 0.1 * (top_attempt - 1), 1)
+    if zone_attempt:
+        return round(10 - 0.1 * (zone_attempt - 1), 1)
+    return 0.0
+
+
+def random_boulder_result(rng: random.Random):
+    """Return (top_attempt, zone_attempt) for one athlete on one boulder"""
+    zone_attempt = rng.choice([None, 1, 1, 2, 3, 4]) if rng.random() < 0.8 else None
+    top_attempt = None
+    if zone_attempt and rng.random() < 0.5:
+        top_attempt = zone_attempt + rng.choice([0, 0, 1, 2, 3])
+    return top_attempt, zone_attempt
+
+
+def boulder_sheet(count: int, progress: float = 0.75, seed: int = 0) -> pd.DataFrame:
+    """Build a boulder round sheet with ``progress`` of all boulder attempts completed"""
+    rng = random.Random(seed)
+    scores = [
+        [boulder_points(*random_boulder_result(rng)) if rng.random() < progress else None
+         for _ in range(BOULDER_COUNT)]
+        for _ in range(count)
+    ]
+    return boulder_sheet_from_scores(athlete_names(count, seed), scores, seed)
+
+
+def boulder_sheet_from_scores(names: List[str], scores: List[List[Optional[float]]], seed: int = 0) -> pd.DataFrame:
+    """Build a boulder round sheet from per-athlete boulder points (None for boulders not yet climbed)"""
+    rng = random.Random(seed)
+    count = len(names)
+    df = pd.DataFrame([[name] + row for name, row in zip(names, scores)], columns=BOULDER_COLUMNS[:1 + BOULDER_COUNT])
+    score_cols = BOULDER_COLUMNS[1:1 + BOULDER_COUNT]
+    df[score_cols] = df[score_cols].astype(float)
+    # Athletes who have not climbed yet have a blank total and rank, like the sheet formulas
+    df["Total Score"] = df[score_cols].sum(axis=1, min_count=1).round(1)
+    df["Current Position/Rank"] = df["Total Score"].rank(ascending=False, method="min").astype("Int64")
+    
+    totals = df["Total Score"].fillna(0)
+    completed = df[score_cols].notna().sum(axis=1)
+    df["Worst Finish"] = [rng.randint(1, count) if done == BOULDER_COUNT else None for done in completed]
+    
+    for place, column in zip(range(1, 4), ["1st Place Strategy", "2nd Place Strategy", "3rd Place Strategy"]):
+        target = totals.nlargest(place).min()
+        df[column] = [
+            strategy_text(target - total, BOULDER_COUNT - done) if done < BOULDER_COUNT else None
+            for total, done in zip(totals, completed)
+        ]
+    top8 = totals.nlargest(min(8, count)).min()
+    df["Points Needed for Top 8"] = [
+        strategy_text(top8 - total, BOULDER_COUNT - done) if done < BOULDER_COUNT else None
+        for total, done in zip(totals, completed)
+    ]
+    return df
+
+
+def boulder_timeline(count: int = 8, seed: int = 0) -> List[pd.DataFrame]:
+    """Snapshots of a boulder round progressing one climb at a time: every athlete tries
+    boulder 1 in start order, then boulder 2, and so on"""
+    rng = random.Random(seed)
+    names = athlete_names(count, seed)
+    final = [[boulder_points(*random_boulder_result(rng)) for _ in range(BOULDER_COUNT)] for _ in range(count)]
+    scores = [[None] * BOULDER_COUNT for _ in range(count)]
+    
+    frames = [boulder_sheet_from_scores(names, scores, seed)]
+    for boulder in range(BOULDER_COUNT):
+        for athlete in range(count):
+            scores[athlete][boulder] = final[athlete][boulder]
+            frames.append(boulder_sheet_from_scores(names, scores, seed))
+    return frames
+
+
+def strategy_text(points_needed: float, boulders_left: int) -> str:
+    """Strategy wording in the style of the sheet formulas"""
+    if points_needed <= 0:
+        return "Any result"
+    if points_needed > 25 * boulders_left:
+        return "IMPOSSIBLE"
+    if points_needed <= 10:
+        return f"Zone ({points_needed:.1f} pts)"
+    return f"Top ({points_needed:.1f} pts)"
+
+
+def lead_sheet(count: int, progress: float = 0.75, seed: int = 0) -> pd.DataFrame:
+    """Build a lead round sheet, including the threshold reference row the real sheet carries"""
+    rng = random.Random(seed)
+    scores = [random_lead_score(rng) if rng.random() < progress else None for _ in range(count)]
+    return lead_sheet_from_scores(athlete_names(count, seed), scores, seed)
+
+
+def random_lead_score(rng: random.Random) -> str:
+    """A lead score as the sheet writes it: the hold reached, with ``+`` for a usable move"""
+    hold = rng.randint(8, 45)
+    return f"{hold}+" if rng.random() < 0.4 else str(hold)
+
+
+def lead_sheet_from_scores(names: List[str], scores: List[Optional[str]], seed: int = 0) -> pd.DataFrame:
+    """Build a lead round sheet from per-athlete scores (None for athletes yet to climb)"""
+    rng = random.Random(seed)
+    df = pd.DataFrame({"Name": names, "Manual Score": pd.Series(scores, dtype=object)}, columns=LEAD_COLUMNS[:2])
+    climbed = df["Manual Score"].dropna()
+    holds = (climbed.str.rstrip("+").astype(float) + climbed.str.endswith("+").astype(float) * 0.5).reindex(df.index)
+    df["Current Rank"] = holds.rank(ascending=False, method="min")
+    df["Status"] = [
+        None if pd.isna(rank) else "Qualified" if rank <= 8 else "Eliminated"
+        for rank in df["Current Rank"]
+    ]
+    df["Worst Finish"] = [None if pd.isna(rank) else int(rank) + rng.randint(0, 3) for rank in df["Current Rank"]]
+    
+    ranked = df.loc[holds.sort_values(ascending=False).dropna().index, "Manual Score"].tolist()
+    thresholds = {
+        "Hold for 1st": ranked[0] if len(ranked) > 0 else None,
+        "Hold for 2nd": ranked[1] if len(ranked) > 1 else None,
+        "Hold for 3rd": ranked[2] if len(ranked) > 2 else None,
+        "Hold to Qualify": ranked[7] if len(ranked) > 7 else None,
+        "Min to Qualify": 8,
+    }
+    reference = {"Name": "Hold for 1st", **thresholds}
+    return pd.DataFrame(df.to_dict("records") + [reference], columns=LEAD_COLUMNS)
+
+
+def lead_timeline(count: int = 8, seed: int = 0) -> List[pd.DataFrame]:
+    """Snapshots of a lead round where athletes climb one after another in start order"""
+    rng = random.Random(seed)
+    names = athlete_names(count, seed)
+    final = [random_lead_score(rng) for _ in range(count)]
+    return [lead_sheet_from_scores(names, final[:climbed] + [None] * (count - climbed), seed)
+            for climbed in range(count + 1)]
+
+
+def to_csv(df: pd.DataFrame) -> str:
+    """Serialize a sheet the way the CSV export endpoint returns it"""
+    return df.to_csv(index=False)
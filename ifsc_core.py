@@ -0,0 +1,2970 @@
+"""Headless core of the IFSC results dashboard: sheet loading, history, scoring and card HTML.
+
+Nothing here imports Streamlit, so the benchmarks, replays and ad-hoc scripts can use the
+pipeline without a running app. ``streamlit_app`` adds the UI on top.
+
+Sheet frames are shared by every session without copying, so enabling pandas copy-on-write
+(``pd.set_option("mode.copy_on_write", True)``) before loading any sheet is a hard requirement;
+otherwise a derived frame can write into the shared one. The app and the benchmarks do this
+in their entry points, and ``SheetPoller`` and ``ReplaySource`` raise RuntimeError without it.
+"""
+
+import pandas as pd
+from io import StringIO
+import time
+from datetime import datetime
+import logging
+import re
+import os
+from typing import Dict, Tuple, List, Optional, Any, Callable
+import hashlib
+from collections import defaultdict, deque, OrderedDict
+from functools import wraps, cached_property
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor, wait
+import json
+import sys
+import threading
+import atexit
+import bisect
+import csv
+import queue
+import sqlite3
+import zlib
+from dataclasses import dataclass, field, replace
+
+logger = logging.getLogger(__name__)
+
+
+def process_singleton(func: Callable) -> Callable:
+    """Call ``func`` once per process and hand every later caller the same object.
+    
+    Streamlit reruns the app script but keeps imported modules, so module state here already
+    outlives sessions; the lock only stops two sessions building the same object at once.
+    """
+    lock = threading.RLock()
+    instance = {}
+    
+    @wraps(func)
+    def wrapper():
+        with lock:
+            if "value" not in instance:
+                instance["value"] = func()
+            return instance["value"]
+    
+    return wrapper
+
+
+def require_copy_on_write(owner: str):
+    """Refuse to hand out shared sheet frames unless pandas copy-on-write is on (see module docstring)"""
+    if not pd.get_option("mode.copy_on_write"):
+        raise RuntimeError(f"{owner} shares sheet frames between sessions; call "
+                           f'pd.set_option("mode.copy_on_write", True) before creating it')
+
+
+# Configuration with updated auto-refresh settings
+class Config:
+    CACHE_TTL = 2  # Reduced cache time to 2 seconds
+    AUTO_REFRESH_INTERVAL = 2  # Refresh every 2 seconds
+    
+    # Per-region refresh cadence in seconds; only these fragments rerun on a timer
+    REFRESH_INTERVALS = {
+        "overview": 10,
+        "results": 2,
+    }
+    MAX_RETRIES = 3  # Failed sheets back off 1s, 2s, 4s, 8s between background retries
+    REQUEST_TIMEOUT = 15
+    FETCH_DEADLINE = 20  # Hard limit for one sheet fetch
+    STALE_AFTER = 10  # Seconds before a served snapshot is flagged as stale
+    MAX_PARALLEL_FETCHES = 8
+    MAX_ATHLETES_DISPLAY = 50
+    
+    # Performance metrics: the admin panel opens with ?admin=<IFSC_ADMIN_TOKEN>; the Prometheus
+    # text export is written to IFSC_METRICS_FILE after every poll and served on IFSC_METRICS_PORT
+    ADMIN_TOKEN = os.environ.get("IFSC_ADMIN_TOKEN", "")
+    METRICS_FILE = os.environ.get("IFSC_METRICS_FILE", "")
+    METRICS_PORT = int(os.environ.get("IFSC_METRICS_PORT", "0") or 0)
+    
+    # Append-only record of every distinct sheet body; set IFSC_HISTORY_DB to "" to disable
+    HISTORY_DB = os.environ.get("IFSC_HISTORY_DB", "ifsc_history.sqlite3")
+    HISTORY_BATCH_SIZE = 50
+    HISTORY_FLUSH_INTERVAL = 5  # Seconds between batched history writes
+    HISTORY_KEYFRAME_INTERVAL = 50  # Stored changes per keyframe; the rest are cell-level deltas
+    
+    # Replay speeds for recorded timelines; None steps through every change as fast as it renders
+    REPLAY_SPEEDS = {"1×": 1, "10×": 10, "Max": None}
+    
+    # Google Sheets export endpoint. Set IFSC_SHEETS_BASE_URL (e.g. http://127.0.0.1:8765 for
+    # `python -m benchmarks.sheet_server`) to read every sheet from a local stand-in instead.
+    SHEETS_BASE_URL = os.environ.get(
+        "IFSC_SHEETS_BASE_URL",
+        "https://docs.google.com/spreadsheets/d/1MwVp1mBUoFrzRSIIu4UdMcFlXpxHAi_R7ztp1E4Vgx0"
+    ).rstrip("/")
+    
+    # Sheet tab (gid) for each competition
+    SHEET_GIDS = {
+        "Male Boulder Semis": "911620167",
+        "Female Boulder Semis": "920221506",
+        "Male Boulder Final": "1415967322",
+        "Female Boulder Final": "299577805",
+        "Male Lead Semis": "0",
+        "Female Lead Semis": "352924417",
+        "Male Lead Final": "1091240908",
+        "Female Lead Final": "528108640"
+    }
+    
+    # Google Sheets URLs (class-scope names are not visible inside comprehensions, hence map)
+    SHEET_EXPORT_URL = SHEETS_BASE_URL + "/export?format=csv&gid={}"
+    SHEETS_URLS = dict(zip(SHEET_GIDS, map(SHEET_EXPORT_URL.format, SHEET_GIDS.values())))
+    
+    # IFSC_BULK_EXPORT=1 downloads each spreadsheet once per cycle as xlsx (needs openpyxl) and
+    # splits it by tab, instead of one CSV request per tab. Tabs are found by competition name;
+    # map a gid to its tab title here when the tab is named differently
+    BULK_EXPORT = os.environ.get("IFSC_BULK_EXPORT", "").lower() in ("1", "true", "yes")
+    SHEET_TABS: Dict[str, str] = {}
+    
+    # Season of events from a JSON/TOML file (see EventRegistry); without one, the sheets above
+    DEFAULT_EVENT = "IFSC 2025 World Championships"
+    EVENTS_FILE = os.environ.get("IFSC_EVENTS_FILE", "")
+    SOURCE_IDLE_TIMEOUT = 120  # Seconds without a viewer before a source stops being polled
+
+
+@dataclass(frozen=True)
+class Competition:
+    """Category, discipline and round of one competition, for classifying it without reading its name.
+    
+    Field values are normalized, so "Women"/"Women's"/"Female", "Bouldering"/"Boulder" and
+    "Semi-Final"/"Semifinals"/"Semis" compare equal; unknown values are kept as given.
+    """
+    name: str
+    event: str
+    category: str
+    discipline: str
+    round: str
+    
+    CATEGORIES = {"male": "Male", "men": "Male", "man": "Male",
+                  "female": "Female", "women": "Female", "woman": "Female"}
+    DISCIPLINES = {"boulder": "Boulder", "bouldering": "Boulder", "lead": "Lead"}
+    ROUNDS = {"semis": "Semis", "semi": "Semis", "semifinal": "Semis", "semifinals": "Semis",
+              "final": "Final", "finals": "Final"}
+    
+    @staticmethod
+    def normalize(aliases: Dict[str, str], value: str) -> str:
+        key = re.sub(r'[^a-z]', '', str(value).lower())
+        # Possessives and plurals ("Women's", "Mens") fall back to the form without the "s"
+        return aliases.get(key) or (aliases.get(key[:-1]) if key.endswith('s') else None) or str(value)
+    
+    @staticmethod
+    def create(name: str, event: str, category: str, discipline: str, round_name: str) -> "Competition":
+        return Competition(name, event, Competition.normalize(Competition.CATEGORIES, category),
+                           Competition.normalize(Competition.DISCIPLINES, discipline),
+                           Competition.normalize(Competition.ROUNDS, round_name))
+    
+    @staticmethod
+    def parse(name: str, event: str = "") -> "Competition":
+        """Fields of a "<event> <category> <discipline> <round>" name, read from its last three words"""
+        words = name.split()
+        fields = words[-3:] if len(words) >= 3 else ["", "", ""]
+        return Competition.create(name, event or " ".join(words[:-3]), *fields)
+
+
+class EventRegistry:
+    """Competitions of every configured event, as ``{event: {competition name: CSV URL}}``.
+    
+    Loaded from ``Config.EVENTS_FILE`` (JSON, or TOML on Python 3.11+), nested as events ->
+    disciplines -> rounds -> one source per category::
+    
+        [[events]]
+        name = "Innsbruck 2025"
+        base_url = "https://docs.google.com/spreadsheets/d/<sheet id>"
+        
+        [events.disciplines.Boulder.Semis]
+        Male = "911620167"                 # a gid of base_url, or a full CSV export URL
+        Female = "https://example.org/female_semis.csv"
+    
+    Competitions are named "<event> <category> <discipline> <round>" for display; ``info``
+    keeps each one's fields as a ``Competition``, which filters and classifiers use instead.
+    Without a file the registry holds the built-in championship under its usual names.
+    """
+    
+    def __init__(self, events: Dict[str, Dict[str, str]], info: Optional[Dict[str, Competition]] = None):
+        self.events = events
+        self.info: Dict[str, Competition] = {
+            name: (info or {}).get(name) or Competition.parse(name, event)
+            for event, competitions in events.items() for name in competitions
+        }
+        # Each final's semis of the same event, category and discipline, for countback
+        semis = {(c.event, c.category, c.discipline): c.name for c in self.info.values() if c.round == "Semis"}
+        self.previous_rounds: Dict[str, str] = {
+            c.name: semis[(c.event, c.category, c.discipline)] for c in self.info.values()
+            if c.round == "Final" and (c.event, c.category, c.discipline) in semis
+        }
+    
+    @property
+    def sources(self) -> Dict[str, str]:
+        """Every competition of every event"""
+        return {name: url for competitions in self.events.values() for name, url in competitions.items()}
+    
+    def competitions(self, event: Optional[str] = None) -> Dict[str, str]:
+        """Competitions of one event (the first when ``event`` is None or unknown)"""
+        if event not in self.events:
+            event = next(iter(self.events), None)
+        return self.events.get(event, {})
+    
+    @staticmethod
+    def default() -> "EventRegistry":
+        return EventRegistry({Config.DEFAULT_EVENT: dict(Config.SHEETS_URLS)})
+    
+    @staticmethod
+    def from_spec(spec: Dict[str, Any]) -> "EventRegistry":
+        """Build a registry from the parsed file contents, raising ValueError when malformed"""
+        events = {}
+        info = {}
+        for event in spec.get("events", []):
+            name = event.get("name")
+            if not name:
+                raise ValueError("Every event needs a name")
+            base_url = str(event.get("base_url", "")).rstrip("/")
+            competitions = {}
+            for discipline, rounds in event.get("disciplines", {}).items():
+                for round_name, categories in rounds.items():
+                    for category, source in categories.items():
+                        source = str(source)
+                        if not source.startswith(("http://", "https://")):
+                            if not base_url:
+                                raise ValueError(f"{name}: gid {source} needs a base_url")
+                            source = f"{base_url}/export?format=csv&gid={source}"
+                        competition = f"{name} {category} {discipline} {round_name}"
+                        competitions[competition] = source
+                        info[competition] = Competition.create(competition, name, category, discipline,
+                                                               round_name)
+            if not competitions:
+                raise ValueError(f"{name}: no competitions configured")
+            events[name] = competitions
+        if not events:
+            raise ValueError("No events configured")
+        return EventRegistry(events, info)
+    
+    @staticmethod
+    def load(path: str) -> "EventRegistry":
+        """Read a JSON or TOML (by extension) event file"""
+        if path.endswith(".toml"):
+            try:
+                import tomllib  # Python 3.11+, only needed for TOML event files
+            except ImportError:
+                raise ValueError("TOML event files need Python 3.11+; use JSON instead")
+            with open(path, "rb") as f:
+                return EventRegistry.from_spec(tomllib.load(f))
+        with open(path, encoding="utf-8") as f:
+            return EventRegistry.from_spec(json.load(f))
+
+class PipelineMetrics:
+    """Thread-safe latency histograms and counters for the load -> clean -> classify -> render path"""
+    
+    # Histogram bucket upper bounds in seconds, as in Prometheus client defaults
+    BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+    RECENT_SAMPLES = 256
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._bucket_counts: Dict[str, List[int]] = defaultdict(lambda: [0] * len(self.BUCKETS))
+        self._sums: Dict[str, float] = defaultdict(float)
+        self._counts: Dict[str, int] = defaultdict(int)
+        self._recent: Dict[str, deque] = defaultdict(lambda: deque(maxlen=self.RECENT_SAMPLES))
+        self._counters: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], int] = defaultdict(int)
+    
+    def observe(self, stage: str, seconds: float):
+        """Record one latency sample for ``stage``"""
+        with self._lock:
+            buckets = self._bucket_counts[stage]
+            for i, bound in enumerate(self.BUCKETS):
+                if seconds <= bound:
+                    buckets[i] += 1
+                    break
+            self._sums[stage] += seconds
+            self._counts[stage] += 1
+            self._recent[stage].append(seconds)
+    
+    def increment(self, name: str, amount: int = 1, **labels):
+        """Add ``amount`` to the counter ``name`` with the given labels"""
+        key = (name, tuple(sorted((k, str(v)) for k, v in labels.items())))
+        with self._lock:
+            self._counters[key] += amount
+    
+    def counter_total(self, name: str, **labels) -> int:
+        """Sum of the counter ``name`` over every label set that includes ``labels``"""
+        wanted = {(k, str(v)) for k, v in labels.items()}
+        with self._lock:
+            return sum(value for (counter, key), value in self._counters.items()
+                       if counter == name and wanted <= set(key))
+    
+    def timed(self, stage: str) -> Callable:
+        """Decorator recording the wall time of every call under ``stage``"""
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.observe(stage, time.perf_counter() - started)
+            return wrapper
+        return decorator
+    
+    def stage_summary(self) -> pd.DataFrame:
+        """Per-stage call counts and latency percentiles (over recent calls) in milliseconds"""
+        with self._lock:
+            rows = [
+                {
+                    "Stage": stage,
+                    "Calls": self._counts[stage],
+                    "p50 ms": float(np.percentile(recent, 50)) * 1000,
+                    "p95 ms": float(np.percentile(recent, 95)) * 1000,
+                    "Max ms": max(recent) * 1000,
+                    "Total s": self._sums[stage],
+                }
+                for stage, recent in self._recent.items() if recent
+            ]
+        return pd.DataFrame(rows, columns=["Stage", "Calls", "p50 ms", "p95 ms", "Max ms", "Total s"])
+    
+    def counter_summary(self) -> pd.DataFrame:
+        """Every counter with its labels and current value"""
+        with self._lock:
+            rows = [
+                {"Counter": name, "Labels": ", ".join(f"{k}={v}" for k, v in labels), "Value": value}
+                for (name, labels), value in sorted(self._counters.items())
+            ]
+        return pd.DataFrame(rows, columns=["Counter", "Labels", "Value"])
+    
+    def to_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format"""
+        lines = [
+            "# HELP ifsc_stage_seconds Latency of dashboard pipeline stages",
+            "# TYPE ifsc_stage_seconds histogram",
+        ]
+        with self._lock:
+            for stage in sorted(self._counts):
+                cumulative = 0
+                for bound, count in zip(self.BUCKETS, self._bucket_counts[stage]):
+                    cumulative += count
+                    lines.append(f'ifsc_stage_seconds_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+                lines.append(f'ifsc_stage_seconds_bucket{{stage="{stage}",le="+Inf"}} {self._counts[stage]}')
+                lines.append(f'ifsc_stage_seconds_sum{{stage="{stage}"}} {self._sums[stage]:.6f}')
+                lines.append(f'ifsc_stage_seconds_count{{stage="{stage}"}} {self._counts[stage]}')
+            
+            names = sorted({name for name, _ in self._counters})
+            for name in names:
+                lines.append(f"# TYPE ifsc_{name}_total counter")
+                for (counter, labels), value in sorted(self._counters.items()):
+                    if counter == name:
+                        label_text = ",".join(f'{k}="{v}"' for k, v in labels)
+                        lines.append(f"ifsc_{name}_total{{{label_text}}} {value}")
+        return "\n".join(lines) + "\n"
+    
+    def write_prometheus(self, path: str):
+        """Atomically write the Prometheus text export to ``path``"""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp_path, path)
+    
+    def reset(self):
+        """Drop every recorded sample and counter"""
+        with self._lock:
+            for store in (self._bucket_counts, self._sums, self._counts, self._recent, self._counters):
+                store.clear()
+
+
+# Process-wide metrics shared by the poller thread and every session
+METRICS = PipelineMetrics()
+
+# Precompiled text cleaning patterns shared by the scalar and vectorized cleaners
+ENCODING_ARTIFACTS_PATTERN = re.compile(r'[^\w\s\-\.\,\(\)]+')
+CLEAN_TEXT_REMOVE_PATTERN = re.compile(r'[^\w\s\-\.\,\(\)]+|[âÂ]+')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+class DataProcessor:
+    """Enhanced data processing utilities"""
+    
+    # Cleaned value memo shared across polls; athlete names and statuses repeat on every refresh
+    _clean_text_memo: Dict[str, str] = {}
+    CLEAN_TEXT_MEMO_LIMIT = 50000
+    
+    @staticmethod
+    def safe_numeric_conversion(value, default=0) -> float:
+        """Safely convert value to numeric with proper error handling"""
+        try:
+            if pd.isna(value) or value == '' or value is None:
+                return default
+            if isinstance(value, (int, float, np.number)):
+                # Already typed by CompetitionSnapshot
+                return value
+            return pd.to_numeric(value, errors='coerce')
+        except Exception as e:
+            logger.warning(f"Error converting {value} to numeric: {e}")
+            return default
+
+    @staticmethod
+    def clean_text(text) -> str:
+        """Enhanced text cleaning with better Unicode handling"""
+        if not isinstance(text, str):
+            return str(text) if text is not None else ""
+        
+        try:
+            # Better Unicode handling
+            cleaned = text.encode('utf-8', 'ignore').decode('utf-8')
+            
+            # Remove common problematic characters and encoding artifacts
+            cleaned = cleaned.replace('â', '')  # Remove the specific problematic character
+            cleaned = cleaned.replace('Â', '')  # Remove capital version too
+            
+            # Remove other common encoding artifacts
+            cleaned = ENCODING_ARTIFACTS_PATTERN.sub('', cleaned)
+            
+            # Remove extra whitespace
+            cleaned = ' '.join(cleaned.split())
+            
+            return cleaned.strip()
+        except Exception as e:
+            logger.warning(f"Error cleaning text '{text}': {e}")
+            return str(text) if text is not None else ""
+        
+    @staticmethod
+    def _factorizes_exactly(values: np.ndarray) -> bool:
+        """pd.factorize hashes an all-string array as NUL-terminated UTF-8, which merges strings
+        that differ after a NUL and every string holding a lone surrogate"""
+        try:
+            joined = ''.join(values)
+        except TypeError:
+            # Missing values make factorize hash the Python objects instead, which is exact
+            return True
+        
+        if '\x00' in joined:
+            return False
+        try:
+            joined.encode('utf-8')
+        except UnicodeEncodeError:
+            return False
+        return True
+    
+    @staticmethod
+    def clean_series(series: pd.Series) -> pd.Series:
+        """Vectorized, memoized equivalent of ``series.apply(DataProcessor.clean_text)``"""
+        if pd.api.types.infer_dtype(series, skipna=True) not in ('string', 'empty'):
+            # Mixed Python objects keep the scalar path so their str() forms stay exact
+            return series.apply(DataProcessor.clean_text)
+        
+        values = series.to_numpy(dtype=object)
+        if not DataProcessor._factorizes_exactly(values):
+            return series.apply(DataProcessor.clean_text)
+        
+        codes, uniques = pd.factorize(values)
+        memo = DataProcessor._clean_text_memo
+        
+        cleaned_uniques = np.empty(len(uniques), dtype=object)
+        misses = []
+        for i, value in enumerate(uniques):
+            hit = memo.get(value)
+            if hit is None:
+                misses.append(i)
+            else:
+                cleaned_uniques[i] = hit
+        
+        METRICS.increment("cache_requests", len(uniques) - len(misses), cache="clean_text", result="hit")
+        METRICS.increment("cache_requests", len(misses), cache="clean_text", result="miss")
+        
+        if misses:
+            # encode/decode('ignore') only drops lone surrogates, which the removal pattern drops too
+            raw = pd.Series(uniques[misses], dtype=object)
+            cleaned = (raw.str.replace(CLEAN_TEXT_REMOVE_PATTERN, '', regex=True)
+                          .str.replace(WHITESPACE_PATTERN, ' ', regex=True)
+                          .str.strip())
+            cleaned_uniques[misses] = cleaned.to_numpy(dtype=object)
+            
+            if len(memo) + len(misses) > DataProcessor.CLEAN_TEXT_MEMO_LIMIT:
+                memo.clear()
+            memo.update(zip(raw, cleaned))
+        
+        result = np.empty(len(values), dtype=object)
+        valid = codes >= 0
+        result[valid] = cleaned_uniques[codes[valid]]
+        result[~valid] = [DataProcessor.clean_text(value) for value in values[~valid]]
+        
+        return pd.Series(result, index=series.index, name=series.name, dtype=object)
+    
+    @staticmethod
+    def validate_dataframe(df: pd.DataFrame, expected_columns: List[str]) -> Tuple[bool, List[str]]:
+        """Enhanced DataFrame validation"""
+        if df.empty:
+            return False, ["DataFrame is empty"]
+        
+        issues = []
+        missing_cols = [col for col in expected_columns if col not in df.columns]
+        
+        if missing_cols:
+            issues.append(f"Missing columns: {', '.join(missing_cols)}")
+        
+        # Check for minimum data requirements
+        if len(df) < 1:
+            issues.append("Insufficient data rows")
+        
+        return len(issues) == 0, issues
+
+class CompetitionStatusDetector:
+    """Enhanced competition status detection"""
+    
+    @staticmethod
+    def get_competition_status(df: pd.DataFrame, competition_name: str) -> Tuple[str, str]:
+        """Determine competition status with improved logic"""
+        if df.empty:
+            return "upcoming", "📄"
+        
+        try:
+            discipline = competition_info(competition_name).discipline
+            if discipline == "Boulder":
+                return CompetitionStatusDetector._get_boulder_status(df)
+            elif discipline == "Lead":
+                return CompetitionStatusDetector._get_lead_status(df)
+        except Exception as e:
+            logger.warning(f"Error determining status for {competition_name}: {e}")
+        
+        return "upcoming", "📄"
+    
+    @staticmethod
+    def _get_boulder_status(df: pd.DataFrame) -> Tuple[str, str]:
+        """Determine boulder competition status"""
+        score_cols = [col for col in df.columns if 'Score' in str(col)]
+        if not score_cols:
+            return "upcoming", "📄"
+        
+        has_scores = df[score_cols].notna().any().any()
+        if not has_scores:
+            return "upcoming", "📄"
+        
+        total_athletes = len(df[df.iloc[:, 0].notna() & (df.iloc[:, 0] != '')])
+        completed_athletes = len(df[df[score_cols].notna().any(axis=1)])
+        
+        completion_rate = completed_athletes / max(total_athletes, 1)
+        
+        if completion_rate >= 0.9:
+            return "completed", "✅"
+        elif completion_rate >= 0.1:
+            return "live", "🔴"
+        else:
+            return "upcoming", "📄"
+    
+    @staticmethod
+    def _get_lead_status(df: pd.DataFrame) -> Tuple[str, str]:
+        """Determine lead competition status"""
+        if 'Manual Score' not in df.columns:
+            return "upcoming", "📄"
+        
+        has_scores = df['Manual Score'].notna().any()
+        if not has_scores:
+            return "upcoming", "📄"
+        
+        total_athletes = len(df[df['Name'].notna() & (df['Name'] != '')])
+        completed_athletes = len(df[df['Manual Score'].notna()])
+        
+        completion_rate = completed_athletes / max(total_athletes, 1)
+        
+        if completion_rate >= 0.9:
+            return "completed", "✅"
+        elif completion_rate >= 0.1:
+            return "live", "🔴"
+        else:
+            return "upcoming", "📄"
+
+@dataclass
+class SheetResult:
+    """Outcome of one sheet fetch, including the validators used for the next conditional request"""
+    url: str
+    df: pd.DataFrame = field(default_factory=pd.DataFrame)
+    changed: bool = True
+    body_hash: Optional[str] = None
+    body: Optional[bytes] = field(default=None, repr=False)  # Raw CSV, kept for the history store
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    error: Optional[str] = None
+    snapshot: Optional["CompetitionSnapshot"] = None
+    fetched_at: datetime = field(default_factory=datetime.now)  # When ``df`` was last confirmed current
+    elapsed: float = 0.0
+    failures: int = 0  # Consecutive failed fetches since the last success
+    
+    @property
+    def age_seconds(self) -> float:
+        """Seconds since the served data was last confirmed current"""
+        return (datetime.now() - self.fetched_at).total_seconds()
+    
+    @property
+    def is_stale(self) -> bool:
+        """True when serving a last-good snapshot after failures or past ``Config.STALE_AFTER``"""
+        return self.failures > 0 or self.age_seconds > Config.STALE_AFTER
+
+
+class HttpSession:
+    """Keep-alive ``requests.Session`` shared by every sheet fetch in the process.
+    
+    Each poll used to open a new TLS connection per sheet. The pool keeps up to
+    ``pool_size`` connections per host open between cycles, for at least 10 hosts: Google
+    answers every export with a 307 to a ``*.googleusercontent.com`` host, and a pool that
+    only has room for the source hosts would close one host's connections on every hop. The session is configured once
+    and not changed afterwards: per-request headers go through ``get``, and urllib3 hands
+    each fetch thread its own pooled connection, so concurrent fetches are safe.
+    
+    Every request is counted as ``http_connections{connection="new"|"reused"}``.
+    """
+    
+    HEADERS = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+        'Accept': 'text/csv,text/plain,*/*',
+        'Accept-Encoding': 'gzip, deflate',
+        'Connection': 'keep-alive'
+    }
+    
+    def __init__(self, pool_size: int, hosts: int = 1):
+        self.pool_size = pool_size
+        self._local = threading.local()
+        self.session = requests.Session()
+        self.session.headers.update(self.HEADERS)
+        # Every source host plus the host its exports redirect to, never below requests' default
+        adapter = HTTPAdapter(pool_connections=max(10, 2 * hosts), pool_maxsize=max(1, pool_size))
+        # urllib3 opens connections on the thread that sends, so a thread-local flag tells
+        # which requests needed a new one
+        adapter.poolmanager.pool_classes_by_scheme = {
+            scheme: self._counting_pool(pool_class)
+            for scheme, pool_class in adapter.poolmanager.pool_classes_by_scheme.items()
+        }
+        for prefix in ("http://", "https://"):
+            self.session.mount(prefix, adapter)
+    
+    def _counting_pool(self, pool_class: type) -> type:
+        """Subclass of a urllib3 pool class that flags the calling thread when it opens a connection"""
+        local = self._local
+        
+        def _new_conn(pool):
+            local.opened = True
+            return pool_class._new_conn(pool)
+        
+        return type(pool_class.__name__, (pool_class,), {"_new_conn": _new_conn})
+    
+    def get(self, url: str, **kwargs):
+        """``requests.Session.get`` that records whether the request reused a pooled connection"""
+        self._local.opened = False
+        try:
+            return self.session.get(url, **kwargs)
+        finally:
+            METRICS.increment("http_connections", connection="new" if self._local.opened else "reused")
+    
+    @staticmethod
+    def reuse_rate() -> Optional[float]:
+        """Share of requests served on an already open connection, None before the first one"""
+        reused = METRICS.counter_total("http_connections", connection="reused")
+        total = METRICS.counter_total("http_connections")
+        return reused / total if total else None
+
+
+class DataLoader:
+    """Enhanced data loading with better error handling and caching"""
+    
+    @staticmethod
+    def load_sheet_result(url: str) -> SheetResult:
+        """Return the latest fetch result of a sheet, including its ``changed`` flag"""
+        return get_sheet_poller().get_result(url, timeout=Config.REQUEST_TIMEOUT)
+    
+    @staticmethod
+    @METRICS.timed("load_snapshot")
+    def load_snapshot(name: str, url: str) -> Tuple["CompetitionSnapshot", SheetResult]:
+        """Return the competition snapshot of a sheet along with its fetch result"""
+        result = DataLoader.load_sheet_result(url)
+        return snapshot_for(name, result, get_sheet_poller().previous_round_ranks(name)), result
+    
+    @staticmethod
+    def load_many(urls: List[str], previous: Optional[Dict[str, SheetResult]] = None,
+                  max_workers: int = Config.MAX_PARALLEL_FETCHES,
+                  deadline: float = Config.FETCH_DEADLINE, names: Optional[Dict[str, str]] = None,
+                  bulk: bool = Config.BULK_EXPORT) -> Dict[str, SheetResult]:
+        """Fetch several sheets concurrently with bounded parallelism and a per-sheet deadline.
+        
+        Every URL gets a result: sheets that fail or miss the deadline come back with
+        ``error`` set, and ``elapsed`` records how long each fetch took. With ``bulk``, tabs of
+        the same spreadsheet come from one workbook download (see ``bulk_groups``); ``names``
+        maps URLs to competition names, which double as tab titles.
+        """
+        previous = previous or {}
+        results: Dict[str, SheetResult] = {}
+        if not urls:
+            return results
+        
+        workbooks = DataLoader.bulk_groups(urls, names or {}) if bulk and bulk_export_available() else {}
+        grouped = {url for tabs in workbooks.values() for url in tabs}
+        
+        started = time.monotonic()
+        
+        def fetch_sheet(url: str) -> Dict[str, SheetResult]:
+            return {url: DataLoader.fetch_sheet_data(url, previous.get(url), started + deadline)}
+        
+        def fetch_workbook(url: str) -> Dict[str, SheetResult]:
+            return DataLoader.fetch_workbook(url, workbooks[url], previous, started + deadline)
+        
+        jobs = [(fetch_sheet, url, [url]) for url in urls if url not in grouped]
+        jobs += [(fetch_workbook, url, list(tabs)) for url, tabs in workbooks.items()]
+        executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(jobs))),
+                                      thread_name_prefix="sheet-fetch")
+        try:
+            futures = {executor.submit(fetch, url): sheet_urls for fetch, url, sheet_urls in jobs}
+            done, not_done = wait(futures, timeout=deadline)
+            
+            for future in done:
+                try:
+                    results.update(future.result())
+                except Exception as e:
+                    for url in futures[future]:
+                        results[url] = SheetResult(url=url, error=f"Unexpected error: {str(e)}",
+                                                   elapsed=time.monotonic() - started)
+            
+            for future in not_done:
+                for url in futures[future]:
+                    logger.warning(f"Fetch of {url} missed the {deadline}s deadline")
+                    results[url] = SheetResult(url=url, error=f"Timed out after {deadline}s", elapsed=deadline)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        return results
+    
+    @staticmethod
+    def fetch_sheet_data(url: str, previous: Optional[SheetResult] = None,
+                         deadline: Optional[float] = None) -> SheetResult:
+        """Download and parse a sheet once, reusing ``previous`` when the body has not changed.
+        
+        ``deadline`` is a ``time.monotonic()`` timestamp that caps the request timeout. Failures
+        are returned, not retried: the poller schedules retries in the background.
+        """
+        
+        started = time.monotonic()
+        try:
+            response = DataLoader._get(url, previous, DataLoader._timeout(started, deadline))
+            
+            if response.status_code == 304 and previous is not None:
+                METRICS.increment("cache_requests", cache="http_conditional", result="hit")
+                return replace(previous, changed=False, error=None, failures=0, fetched_at=datetime.now(),
+                               elapsed=time.monotonic() - started)
+            
+            response.raise_for_status()
+            return DataLoader._result_from_body(url, response.content, response.text, previous,
+                                                response.headers.get('ETag'),
+                                                response.headers.get('Last-Modified'), started)
+            
+        except requests.RequestException as e:
+            error_msg = f"Network error: {str(e)}"
+            logger.error(error_msg)
+            return SheetResult(url=url, error=error_msg, elapsed=time.monotonic() - started)
+            
+        except Exception as e:
+            error_msg = f"Unexpected error: {str(e)}"
+            logger.error(error_msg)
+            return SheetResult(url=url, error=error_msg, elapsed=time.monotonic() - started)
+    
+    # CSV export URL of one tab; its spreadsheet's xlsx export holds every tab
+    CSV_EXPORT_PATTERN = re.compile(r'^(?P<base>.+)/export\?format=csv&gid=(?P<gid>\d+)$')
+    # CSV URLs whose tab title was not found in their workbook; fetched one CSV at a time
+    _unmatched_tabs: set = set()
+    
+    @staticmethod
+    def bulk_groups(urls: List[str], names: Dict[str, str]) -> Dict[str, Dict[str, str]]:
+        """Group CSV export URLs by spreadsheet as {xlsx export URL: {CSV URL: tab title}}.
+        
+        A tab's title is ``Config.SHEET_TABS[gid]``, else its competition name. Tabs that a
+        workbook did not contain are left out, as are spreadsheets with a single open tab: one
+        CSV is cheaper than the whole workbook.
+        """
+        groups: Dict[str, Dict[str, str]] = defaultdict(dict)
+        for url in urls:
+            match = DataLoader.CSV_EXPORT_PATTERN.match(url)
+            if match is not None and url not in DataLoader._unmatched_tabs:
+                title = Config.SHEET_TABS.get(match["gid"], names.get(url, match["gid"]))
+                groups[f"{match['base']}/export?format=xlsx"][url] = title
+        return {url: tabs for url, tabs in groups.items() if len(tabs) > 1}
+    
+    @staticmethod
+    def fetch_workbook(url: str, tabs: Dict[str, str], previous: Dict[str, SheetResult],
+                       deadline: Optional[float] = None) -> Dict[str, SheetResult]:
+        """Download a spreadsheet once as xlsx and split it into a result per tab.
+        
+        ``tabs`` maps each tab's CSV URL to its title; results are keyed by those URLs and
+        go through the same body-hash check as single CSV fetches, so unchanged tabs are
+        not parsed again. Tabs missing from the workbook are fetched as single CSVs, now and
+        in later cycles.
+        """
+        
+        started = time.monotonic()
+        # Conditional only when every tab has data to keep serving after a 304
+        prior = [previous.get(tab_url) for tab_url in tabs]
+        validators = {(result.etag, result.last_modified) for result in prior if result is not None}
+        conditional = prior[0] if None not in prior and len(validators) == 1 else None
+        try:
+            response = DataLoader._get(url, conditional, DataLoader._timeout(started, deadline))
+            
+            if response.status_code == 304 and conditional is not None:
+                METRICS.increment("cache_requests", cache="http_conditional", result="hit", amount=len(tabs))
+                return {
+                    tab_url: replace(previous[tab_url], changed=False, error=None, failures=0,
+                                     fetched_at=datetime.now(), elapsed=time.monotonic() - started)
+                    for tab_url in tabs
+                }
+            
+            response.raise_for_status()
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            tables = DataLoader.split_workbook(response.content, list(tabs.values()))
+            
+            missing = {tab_url: title for tab_url, title in tabs.items() if title not in tables}
+            if missing:
+                logger.warning(f"No tab titled {', '.join(map(repr, missing.values()))} in {url}; "
+                               f"set Config.SHEET_TABS for them. Fetching them one CSV at a time")
+                DataLoader._unmatched_tabs.update(missing)
+            
+            results = {}
+            for tab_url, title in tabs.items():
+                if tab_url in missing:
+                    results[tab_url] = DataLoader.fetch_sheet_data(tab_url, previous.get(tab_url), deadline)
+                    continue
+                text = tables[title]
+                results[tab_url] = DataLoader._result_from_body(tab_url, text.encode('utf-8'), text,
+                                                                previous.get(tab_url), etag, last_modified,
+                                                                started)
+            return results
+            
+        except requests.RequestException as e:
+            error_msg = f"Network error: {str(e)}"
+        except Exception as e:
+            error_msg = f"Unexpected error: {str(e)}"
+        logger.error(error_msg)
+        return {tab_url: SheetResult(url=tab_url, error=error_msg, elapsed=time.monotonic() - started)
+                for tab_url in tabs}
+    
+    @staticmethod
+    @METRICS.timed("split_workbook")
+    def split_workbook(body: bytes, titles: List[str]) -> Dict[str, str]:
+        """CSV text of each requested tab of an xlsx workbook, keyed by the requested title.
+        
+        A title matches the tab of that name, or else the tab its competition name ends with
+        ("Innsbruck 2025 Male Boulder Semis" reads the "Male Boulder Semis" tab).
+        """
+        from io import BytesIO
+        
+        frames = pd.read_excel(BytesIO(body), sheet_name=None, header=None, dtype=object)
+        tables = {}
+        for title in titles:
+            tab = title if title in frames else next((t for t in frames if title.endswith(f" {t}")), None)
+            if tab is not None:
+                tables[title] = frames[tab].to_csv(index=False, header=False)
+        return tables
+    
+    @staticmethod
+    def _timeout(started: float, deadline: Optional[float]) -> float:
+        """Request timeout capped by a ``time.monotonic()`` deadline"""
+        if deadline is None:
+            return Config.REQUEST_TIMEOUT
+        return max(0.1, min(Config.REQUEST_TIMEOUT, deadline - started))
+    
+    @staticmethod
+    def _get(url: str, previous: Optional[SheetResult], timeout: float):
+        """GET ``url`` through the shared session, conditional on the validators of ``previous``"""
+        
+        headers = {}
+        # Conditional request so the server can answer 304 when nothing changed
+        if previous is not None:
+            if previous.etag:
+                headers['If-None-Match'] = previous.etag
+            if previous.last_modified:
+                headers['If-Modified-Since'] = previous.last_modified
+        
+        started = time.monotonic()
+        try:
+            response = get_http_session().get(url, timeout=timeout, headers=headers)
+            response.content
+        except requests.RequestException:
+            METRICS.increment("outbound_requests", status="error")
+            raise
+        finally:
+            METRICS.observe("network", time.monotonic() - started)
+        METRICS.increment("outbound_requests", status=response.status_code)
+        return response
+    
+    @staticmethod
+    def _result_from_body(url: str, body: bytes, text: str, previous: Optional[SheetResult],
+                          etag: Optional[str], last_modified: Optional[str], started: float) -> SheetResult:
+        """Result for a downloaded CSV body, parsed only when it differs from ``previous``"""
+        # Most polls return the exact same CSV, so skip parsing when the body is unchanged
+        body_hash = hashlib.sha256(body).hexdigest()
+        if previous is not None and previous.body_hash == body_hash:
+            METRICS.increment("cache_requests", cache="body_hash", result="hit")
+            return replace(previous, changed=False, error=None, failures=0, etag=etag,
+                           last_modified=last_modified, fetched_at=datetime.now(),
+                           elapsed=time.monotonic() - started)
+        
+        METRICS.increment("cache_requests", cache="body_hash", result="miss")
+        df = DataLoader.parse_body(text)
+        
+        logger.info(f"Successfully loaded data: {len(df)} rows, {len(df.columns)} columns")
+        return SheetResult(url=url, df=df, body_hash=body_hash, body=body, etag=etag,
+                           last_modified=last_modified, elapsed=time.monotonic() - started)
+    
+    @staticmethod
+    def parse_body(text: str) -> pd.DataFrame:
+        """Parse, clean and compact the CSV text of a sheet"""
+        # Read CSV data with better encoding handling
+        parse_started = time.perf_counter()
+        csv_data = StringIO(text)
+        df = pd.read_csv(csv_data, encoding='utf-8', low_memory=False)
+        METRICS.observe("parse", time.perf_counter() - parse_started)
+        
+        # Enhanced data cleaning
+        df = DataLoader._clean_dataframe(df)
+        return DataLoader._compact_dataframe(df)
+    
+    @staticmethod
+    @METRICS.timed("clean")
+    def _clean_dataframe(df: pd.DataFrame) -> pd.DataFrame:
+        """Enhanced DataFrame cleaning"""
+        # Remove completely empty rows
+        df = df.dropna(how='all')
+        
+        # Clean column names
+        df.columns = df.columns.str.strip()
+        
+        # Remove unnamed columns
+        unnamed_cols = [col for col in df.columns if str(col).startswith('Unnamed')]
+        df = df.drop(columns=unnamed_cols, errors='ignore')
+        
+        # Lead scores are parsed before cleaning, which would strip the "+" of a plus-hold
+        if LeadScoring.SCORE_COLUMN in df.columns:
+            df[LeadScoring.CODE_COLUMN] = LeadScoring.parse(df[LeadScoring.SCORE_COLUMN])
+        
+        # Clean text data
+        for col in df.columns:
+            if df[col].dtype == 'object':
+                df[col] = DataProcessor.clean_series(df[col])
+        
+        return df
+    
+    # Columns stored compactly by _compact_dataframe
+    NAME_COLUMNS = ('Athlete Name', 'Name')
+    CATEGORICAL_COLUMN_PATTERN = re.compile(r'Status|Strategy|Points Needed|Worst Finish', re.IGNORECASE)
+    SMALL_INT_COLUMN_PATTERN = re.compile(r'Rank|Boulder \d+ Score', re.IGNORECASE)
+    
+    @staticmethod
+    @METRICS.timed("compact")
+    def _compact_dataframe(df: pd.DataFrame) -> pd.DataFrame:
+        """Store a cleaned sheet compactly: categorical status/strategy text, small integer
+        ranks and boulder scores (where every value is whole), and interned athlete names"""
+        compacted = {}
+        
+        for col in df.columns:
+            series = df[col]
+            
+            if col in DataLoader.NAME_COLUMNS and series.dtype == 'object':
+                compacted[col] = series.map(lambda v: sys.intern(v) if isinstance(v, str) else v)
+            
+            elif DataLoader.CATEGORICAL_COLUMN_PATTERN.search(str(col)) and series.dtype == 'object':
+                if series.nunique(dropna=False) <= max(1, len(series) // 2):
+                    compacted[col] = series.astype('category')
+            
+            elif DataLoader.SMALL_INT_COLUMN_PATTERN.search(str(col)):
+                compacted_int = DataLoader._to_small_int(series)
+                if compacted_int is not None:
+                    compacted[col] = compacted_int
+        
+        if compacted:
+            df = df.assign(**compacted)
+        
+        return df
+    
+    @staticmethod
+    def _to_small_int(series: pd.Series) -> Optional[pd.Series]:
+        """Downcast a numeric column of whole numbers to the smallest integer dtype, or None if lossy"""
+        if pd.api.types.is_integer_dtype(series.dtype):
+            return pd.to_numeric(series, downcast='integer')
+        
+        if not pd.api.types.is_float_dtype(series.dtype):
+            return None
+        
+        values = series.dropna()
+        if values.empty or not (values == values.round()).all():
+            return None
+        
+        # Missing cells need a nullable integer dtype
+        for dtype, info in (('Int8', np.iinfo(np.int8)), ('Int16', np.iinfo(np.int16)), ('Int32', np.iinfo(np.int32))):
+            if info.min <= values.min() and values.max() <= info.max:
+                return series.astype(dtype)
+        return None
+
+class SheetDelta:
+    """Cell-level deltas between CSV sheet bodies.
+    
+    A body is parsed into a grid (header, rows, line ending) that renders back to the exact
+    same bytes; bodies that do not round-trip exactly are only ever stored whole.
+    """
+    
+    @staticmethod
+    def parse(body: bytes) -> Optional[Dict[str, Any]]:
+        """Parse a CSV body into a grid, or None when it cannot be rebuilt byte for byte"""
+        try:
+            text = body.decode('utf-8')
+        except UnicodeDecodeError:
+            return None
+        newline = '\r\n' if '\r\n' in text else '\n'
+        rows = list(csv.reader(StringIO(text, newline='')))
+        if not rows or any(len(row) != len(rows[0]) for row in rows):
+            return None
+        
+        grid = {"header": rows[0], "rows": rows[1:], "newline": newline, "trailing": text.endswith(newline)}
+        return grid if SheetDelta.render(grid) == body else None
+    
+    @staticmethod
+    def render(grid: Dict[str, Any]) -> bytes:
+        """Serialize a grid back into the CSV body it was parsed from"""
+        out = StringIO()
+        writer = csv.writer(out, lineterminator=grid["newline"])
+        writer.writerow(grid["header"])
+        writer.writerows(grid["rows"])
+        text = out.getvalue()
+        if not grid["trailing"]:
+            text = text[:-len(grid["newline"])]
+        return text.encode('utf-8')
+    
+    @staticmethod
+    def diff(old: Dict[str, Any], new: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Changes turning ``old`` into ``new`` as (row, column, old value, new value) cells.
+        
+        Returns None when the header or line format changed, which needs a keyframe.
+        """
+        if (old["header"] != new["header"] or old["newline"] != new["newline"]
+                or old["trailing"] != new["trailing"]):
+            return None
+        
+        blank = [''] * len(new["header"])
+        cells = []
+        for r, new_row in enumerate(new["rows"]):
+            old_row = old["rows"][r] if r < len(old["rows"]) else blank
+            if old_row != new_row:
+                cells.extend([r, c, before, after]
+                             for c, (before, after) in enumerate(zip(old_row, new_row)) if before != after)
+        return {"rows": len(new["rows"]), "cells": cells}
+    
+    @staticmethod
+    def apply(grid: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str, Any]:
+        """Return a new grid with ``delta`` applied; ``grid`` is left untouched"""
+        width = len(grid["header"])
+        rows = [list(row) for row in grid["rows"][:delta["rows"]]]
+        rows.extend([''] * width for _ in range(delta["rows"] - len(rows)))
+        for r, c, _, after in delta["cells"]:
+            rows[r][c] = after
+        return {**grid, "rows": rows}
+
+
+class SnapshotHistory:
+    """Append-only SQLite record of every distinct sheet body per competition.
+    
+    Each distinct body is stored once per content hash, either as a zlib-compressed keyframe
+    or as a cell-level delta against the competition's previous body. A keyframe is written
+    every ``keyframe_interval`` deltas, so rebuilding any body replays a bounded chain.
+    ``snapshots`` holds one small row per change. ``record`` just queues; a daemon thread
+    writes the queue in batched transactions.
+    """
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS frames (
+            hash TEXT PRIMARY KEY,
+            kind TEXT NOT NULL CHECK (kind IN ('key', 'delta')),
+            base TEXT REFERENCES frames(hash),
+            depth INTEGER NOT NULL,
+            payload BLOB NOT NULL,
+            size INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS snapshots (
+            id INTEGER PRIMARY KEY,
+            competition TEXT NOT NULL,
+            fetched_at REAL NOT NULL,
+            hash TEXT NOT NULL REFERENCES frames(hash)
+        );
+        CREATE INDEX IF NOT EXISTS snapshots_by_time ON snapshots (competition, fetched_at);
+    """
+    INSERT_FRAME = "INSERT INTO frames (hash, kind, base, depth, payload, size) VALUES (?, ?, ?, ?, ?, ?)"
+    GRID_CACHE_SIZE = 64
+    
+    def __init__(self, path: str, batch_size: int = Config.HISTORY_BATCH_SIZE,
+                 flush_interval: float = Config.HISTORY_FLUSH_INTERVAL,
+                 keyframe_interval: int = Config.HISTORY_KEYFRAME_INTERVAL):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.keyframe_interval = keyframe_interval
+        self._queue: "queue.Queue[Tuple[str, float, str, bytes]]" = queue.Queue()
+        self._write_lock = threading.Lock()
+        self._flush_now = threading.Event()
+        # Delta base for each competition: (hash, depth) of its latest recorded body
+        self._chain: Dict[str, Tuple[str, int]] = {}
+        self._grids: "OrderedDict[str, Optional[Dict[str, Any]]]" = OrderedDict()
+        self._grids_lock = threading.Lock()
+        
+        with self._connect() as conn:
+            conn.executescript(self.SCHEMA)
+            migrated = self._migrate_bodies(conn)
+            # Resume dedupe and delta chains across restarts from each competition's last body
+            for competition, body_hash, depth in conn.execute(
+                "SELECT s.competition, s.hash, f.depth FROM snapshots s JOIN frames f ON f.hash = s.hash "
+                "WHERE s.id IN (SELECT MAX(id) FROM snapshots GROUP BY competition)"
+            ):
+                self._chain[competition] = (body_hash, depth)
+        self._last_hash: Dict[str, str] = {competition: link[0] for competition, link in self._chain.items()}
+        if migrated:
+            self.compact()
+        
+        self._thread = threading.Thread(target=self._run, name="history-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.flush)
+    
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+    
+    @staticmethod
+    def _migrate_bodies(conn: sqlite3.Connection) -> bool:
+        """Move whole bodies from the original ``bodies`` table into keyframes"""
+        if not conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'bodies'").fetchone():
+            return False
+        conn.execute(
+            "INSERT OR IGNORE INTO frames (hash, kind, base, depth, payload, size) "
+            "SELECT hash, 'key', NULL, 0, body, size FROM bodies"
+        )
+        conn.execute("DROP TABLE bodies")
+        return True
+    
+    def record(self, competition: str, fetched_at: datetime, body_hash: str, body: bytes):
+        """Queue one fetched body; repeats of a competition's latest body are dropped"""
+        if self._last_hash.get(competition) == body_hash:
+            return
+        self._last_hash[competition] = body_hash
+        self._queue.put((competition, fetched_at.timestamp(), body_hash, body))
+        if self._queue.qsize() >= self.batch_size:
+            self._flush_now.set()
+    
+    def flush(self) -> int:
+        """Write everything queued so far in one transaction and return the number of snapshots"""
+        pending = []
+        while True:
+            try:
+                pending.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        if not pending:
+            return 0
+        
+        started = time.perf_counter()
+        with self._write_lock, self._connect() as conn:
+            for competition, fetched_at, body_hash, body in pending:
+                known = conn.execute("SELECT depth FROM frames WHERE hash = ?", (body_hash,)).fetchone()
+                if known is None:
+                    frame = self._encode(body_hash, body, self._chain.get(competition))
+                    conn.execute(self.INSERT_FRAME, frame)
+                    depth = frame[3]
+                else:
+                    depth = known[0]
+                conn.execute("INSERT INTO snapshots (competition, fetched_at, hash) VALUES (?, ?, ?)",
+                             (competition, fetched_at, body_hash))
+                self._chain[competition] = (body_hash, depth)
+        METRICS.observe("history_write", time.perf_counter() - started)
+        return len(pending)
+    
+    def _encode(self, body_hash: str, body: bytes, base: Optional[Tuple[str, int]]) -> Tuple:
+        """Frame row for a new body: a delta against ``base`` when that is smaller, else a keyframe"""
+        keyframe = zlib.compress(body, 9)
+        grid = self._remember(body_hash, SheetDelta.parse(body))
+        
+        if base is not None and base[1] + 1 < self.keyframe_interval and grid is not None:
+            base_grid = self.grid(base[0])
+            delta = SheetDelta.diff(base_grid, grid) if base_grid is not None else None
+            if delta is not None:
+                payload = zlib.compress(json.dumps(delta, separators=(',', ':')).encode('utf-8'), 9)
+                if len(payload) < len(keyframe):
+                    return body_hash, 'delta', base[0], base[1] + 1, payload, len(body)
+        
+        return body_hash, 'key', None, 0, keyframe, len(body)
+    
+    def _remember(self, body_hash: str, grid: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        with self._grids_lock:
+            self._grids[body_hash] = grid
+            self._grids.move_to_end(body_hash)
+            while len(self._grids) > self.GRID_CACHE_SIZE:
+                self._grids.popitem(last=False)
+        return grid
+    
+    def _run(self):
+        while True:
+            self._flush_now.wait(self.flush_interval)
+            self._flush_now.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Snapshot history write failed: {e}")
+    
+    def grid(self, body_hash: str) -> Optional[Dict[str, Any]]:
+        """Rebuild the grid of a stored body by replaying deltas from its keyframe"""
+        with self._grids_lock:
+            if body_hash in self._grids:
+                self._grids.move_to_end(body_hash)
+                return self._grids[body_hash]
+        
+        deltas = []
+        grid = None
+        with self._connect() as conn:
+            current = body_hash
+            while current is not None:
+                with self._grids_lock:
+                    if current in self._grids:
+                        grid = self._grids[current]
+                        break
+                row = conn.execute("SELECT kind, base, payload FROM frames WHERE hash = ?", (current,)).fetchone()
+                if row is None:
+                    return None
+                kind, base, payload = row
+                if kind == 'key':
+                    grid = SheetDelta.parse(zlib.decompress(payload))
+                    break
+                deltas.append(json.loads(zlib.decompress(payload)))
+                current = base
+        
+        if grid is None:
+            return None
+        for delta in reversed(deltas):
+            grid = SheetDelta.apply(grid, delta)
+        return self._remember(body_hash, grid)
+    
+    def body(self, body_hash: str) -> Optional[bytes]:
+        """The raw CSV body stored under a content hash"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT kind, payload FROM frames WHERE hash = ?", (body_hash,)).fetchone()
+        if row is None:
+            return None
+        if row[0] == 'key':
+            return zlib.decompress(row[1])
+        grid = self.grid(body_hash)
+        return SheetDelta.render(grid) if grid is not None else None
+    
+    def competitions(self) -> List[str]:
+        """Competitions with at least one recorded snapshot"""
+        with self._connect() as conn:
+            return [row[0] for row in conn.execute("SELECT DISTINCT competition FROM snapshots ORDER BY 1")]
+    
+    def timeline(self, competition: str) -> List[Tuple[datetime, str]]:
+        """(fetched_at, body hash) of every recorded change of a competition, oldest first"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT fetched_at, hash FROM snapshots WHERE competition = ? ORDER BY fetched_at, id",
+                (competition,)
+            ).fetchall()
+        return [(datetime.fromtimestamp(fetched_at), body_hash) for fetched_at, body_hash in rows]
+    
+    def timelines(self, competitions: List[str]) -> Dict[str, List[Tuple[datetime, str]]]:
+        """``timeline`` of every listed competition that has snapshots, read in one query"""
+        if not competitions:
+            return {}
+        placeholders = ", ".join("?" * len(competitions))
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT competition, fetched_at, hash FROM snapshots WHERE competition IN ({placeholders}) "
+                "ORDER BY fetched_at, id",
+                list(competitions)
+            ).fetchall()
+        
+        timelines: Dict[str, List[Tuple[datetime, str]]] = {}
+        for competition, fetched_at, body_hash in rows:
+            timelines.setdefault(competition, []).append((datetime.fromtimestamp(fetched_at), body_hash))
+        return {name: timelines[name] for name in competitions if name in timelines}
+    
+    def body_at(self, competition: str, when: datetime) -> Optional[bytes]:
+        """The body a competition's sheet showed at ``when``, or None before its first snapshot"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT hash FROM snapshots WHERE competition = ? AND fetched_at <= ? "
+                "ORDER BY fetched_at DESC, id DESC LIMIT 1",
+                (competition, when.timestamp())
+            ).fetchone()
+        return self.body(row[0]) if row else None
+    
+    def compact(self, keyframe_interval: Optional[int] = None) -> Dict[str, int]:
+        """Re-encode every stored body as keyframes plus deltas in recorded order, then VACUUM.
+        
+        Converts stores written before delta encoding and applies a new ``keyframe_interval``.
+        Returns the file size in bytes before and after.
+        """
+        if keyframe_interval is not None:
+            self.keyframe_interval = keyframe_interval
+        
+        with self._write_lock:
+            before = os.path.getsize(self.path)
+            with self._connect() as conn:
+                order = conn.execute(
+                    "SELECT competition, hash FROM snapshots ORDER BY competition, fetched_at, id"
+                ).fetchall()
+                bodies = {}
+                for _, body_hash in order:
+                    if body_hash not in bodies:
+                        bodies[body_hash] = self.body(body_hash)
+                
+                chain: Dict[str, Tuple[str, int]] = {}
+                frames = {}
+                for competition, body_hash in order:
+                    if body_hash not in frames and bodies[body_hash] is not None:
+                        frames[body_hash] = self._encode(body_hash, bodies[body_hash], chain.get(competition))
+                    if body_hash in frames:
+                        chain[competition] = (body_hash, frames[body_hash][3])
+                
+                conn.executemany("DELETE FROM frames WHERE hash = ?", [(body_hash,) for body_hash in frames])
+                conn.executemany(self.INSERT_FRAME, frames.values())
+                self._chain = chain
+            
+            conn = self._connect()
+            try:
+                conn.execute("VACUUM")
+            finally:
+                conn.close()
+            after = os.path.getsize(self.path)
+        
+        logger.info(f"Compacted snapshot history: {before / 1024:.1f} KB -> {after / 1024:.1f} KB")
+        return {"before": before, "after": after}
+
+
+@process_singleton
+def get_snapshot_history() -> Optional[SnapshotHistory]:
+    """Return the history store for this server process, or None when disabled or unavailable"""
+    if not Config.HISTORY_DB:
+        return None
+    try:
+        return SnapshotHistory(Config.HISTORY_DB)
+    except sqlite3.Error as e:
+        logger.warning(f"Snapshot history disabled: {e}")
+        return None
+
+
+class ReplaySource:
+    """Recorded history served as the same SheetResult/CompetitionSnapshot pairs as the poller.
+    
+    Change timestamps are kept sorted per competition, so finding the body shown at any
+    moment is a bisect rather than a scan; parsed results are cached per body.
+    """
+    
+    RESULT_CACHE_SIZE = 256
+    
+    def __init__(self, history: SnapshotHistory, names: List[str]):
+        require_copy_on_write("ReplaySource")
+        self.history = history
+        self._times: Dict[str, List[float]] = {}
+        self._hashes: Dict[str, List[str]] = {}
+        for name, timeline in history.timelines(names).items():
+            self._times[name] = [when.timestamp() for when, _ in timeline]
+            self._hashes[name] = [body_hash for _, body_hash in timeline]
+        self._change_times = sorted({when for times in self._times.values() for when in times})
+        self._results: "OrderedDict[Tuple[str, str, Optional[Tuple]], SheetResult]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    @property
+    def competitions(self) -> List[str]:
+        return list(self._times)
+    
+    @property
+    def start(self) -> Optional[float]:
+        return self._change_times[0] if self._change_times else None
+    
+    @property
+    def end(self) -> Optional[float]:
+        return self._change_times[-1] if self._change_times else None
+    
+    def next_change(self, after: float, names: Optional[List[str]] = None) -> Optional[float]:
+        """Timestamp of the first recorded change strictly after ``after``, optionally among ``names``"""
+        if names is None:
+            i = bisect.bisect_right(self._change_times, after)
+            return self._change_times[i] if i < len(self._change_times) else None
+        
+        upcoming = []
+        for name in names:
+            times = self._times.get(name, [])
+            i = bisect.bisect_right(times, after)
+            if i < len(times):
+                upcoming.append(times[i])
+        return min(upcoming) if upcoming else None
+    
+    def result_at(self, name: str, when: float) -> SheetResult:
+        """The result a poller would have published for ``name`` at ``when``"""
+        times = self._times.get(name, [])
+        i = bisect.bisect_right(times, when) - 1
+        if i < 0:
+            return SheetResult(url=name, changed=False, fetched_at=datetime.fromtimestamp(when))
+        
+        # A final is classified against its semis as recorded at the same moment, like the poller does
+        ranks = self.previous_round_ranks(name, when)
+        key = (name, self._hashes[name][i], tuple(sorted(ranks.items())) if ranks else None)
+        with self._lock:
+            cached = self._results.get(key)
+            if cached is not None:
+                self._results.move_to_end(key)
+            else:
+                # The same body under other countback ranks only needs classifying again
+                df = next((other.df for other_key, other in reversed(self._results.items())
+                           if other_key[:2] == key[:2]), None)
+        if cached is None:
+            if df is None:
+                body = self.history.body(key[1]) or b''
+                df = DataLoader.parse_body(body.decode('utf-8', 'replace')) if body else pd.DataFrame()
+            cached = SheetResult(url=name, df=df, body_hash=key[1], snapshot=CompetitionSnapshot(name, df, ranks))
+            with self._lock:
+                self._results[key] = cached
+                while len(self._results) > self.RESULT_CACHE_SIZE:
+                    self._results.popitem(last=False)
+        return replace(cached, fetched_at=datetime.fromtimestamp(times[i]))
+    
+    def load_snapshot(self, name: str, when: float) -> Tuple["CompetitionSnapshot", SheetResult]:
+        """Snapshot and result of ``name`` as recorded at ``when``"""
+        result = self.result_at(name, when)
+        return snapshot_for(name, result, self.previous_round_ranks(name, when)), result
+    
+    def previous_round_ranks(self, name: str, when: float) -> Optional[Dict[str, float]]:
+        """Local ranks of the round before ``name`` as recorded at ``when``, used for countback"""
+        previous = previous_round(name)
+        if previous not in self._times:
+            return None
+        result = self.result_at(previous, when)
+        return (result.snapshot.local_ranks or None) if result.snapshot is not None else None
+
+
+class SheetPoller:
+    """Process-wide background poller shared by every browser session.
+
+    A single daemon thread owns all outbound traffic to Google Sheets: it
+    re-downloads each source every ``Config.AUTO_REFRESH_INTERVAL`` seconds and
+    publishes the latest parsed frame. Sessions only read the published frames,
+    so the request rate stays constant no matter how many people are watching.
+    
+    Sources are opened on first read and released once nobody has read them for
+    ``idle_timeout`` seconds, so a season of registered events costs nothing until
+    someone views a competition.
+    """
+    
+    def __init__(self, sources: Dict[str, str], interval: float = Config.AUTO_REFRESH_INTERVAL,
+                 history: Optional[SnapshotHistory] = None, idle_timeout: float = Config.SOURCE_IDLE_TIMEOUT):
+        require_copy_on_write("SheetPoller")
+        self.interval = interval
+        self.history = history
+        self.idle_timeout = idle_timeout
+        self._urls: List[str] = []  # Open sources, polled every cycle
+        self._names: Dict[str, str] = {url: name for name, url in sources.items()}
+        self._urls_by_name: Dict[str, str] = dict(sources)
+        self._last_read: Dict[str, float] = {}
+        self._results: Dict[str, SheetResult] = {}
+        self._retry_at: Dict[str, float] = {}
+        self._ready: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="sheet-poller", daemon=True)
+    
+    def start(self) -> "SheetPoller":
+        """Start the polling thread (idempotent)"""
+        if not self._thread.is_alive():
+            self._thread.start()
+        return self
+    
+    def refresh_now(self):
+        """Skip the remaining wait and start the next polling cycle immediately"""
+        self._wakeup.set()
+    
+    def get_result(self, url: str, timeout: Optional[float] = None) -> SheetResult:
+        """Return the latest result for a URL, waiting up to ``timeout`` for the first fetch"""
+        with self._lock:
+            ready = self._open(url)
+            # A final's countback needs its semis, so reading one keeps both open
+            previous_url = self._urls_by_name.get(previous_round(self._names.get(url, "")) or "")
+            if previous_url is not None:
+                self._open(previous_url)
+        
+        hit = ready.is_set()
+        ready.wait(timeout)
+        with self._lock:
+            result = self._results.get(url)
+        METRICS.increment("cache_requests", cache="sheet_poller", result="hit" if hit else "miss")
+        return result if result is not None else SheetResult(url=url, changed=False)
+    
+    def peek(self, url: str) -> Optional[SheetResult]:
+        """Return the latest result without waiting, and without opening the source or keeping it open"""
+        with self._lock:
+            return self._results.get(url)
+    
+    @property
+    def open_sources(self) -> List[str]:
+        """Names of the sources currently being polled"""
+        with self._lock:
+            return [self._names.get(url, url) for url in self._urls]
+    
+    def _open(self, url: str) -> threading.Event:
+        """Mark a source as read now, opening it when it is not polled yet (caller holds the lock)"""
+        self._last_read[url] = time.monotonic()
+        ready = self._ready.get(url)
+        if ready is None:
+            # Start polling from the next cycle on, which starts right away
+            ready = self._ready[url] = threading.Event()
+            self._urls.append(url)
+            self._wakeup.set()
+            METRICS.increment("sources", event="open")
+            logger.info(f"Opened source {self._names.get(url, url)}")
+        return ready
+    
+    def _release_idle(self, now: float):
+        """Stop polling and drop the results of sources nobody has read within ``idle_timeout``"""
+        with self._lock:
+            for url in [url for url in self._urls if now - self._last_read.get(url, 0) > self.idle_timeout]:
+                self._urls.remove(url)
+                for state in (self._results, self._retry_at, self._ready, self._last_read):
+                    state.pop(url, None)
+                METRICS.increment("sources", event="release")
+                logger.info(f"Released idle source {self._names.get(url, url)}")
+    
+    @METRICS.timed("poll_cycle")
+    def poll_once(self):
+        """Fetch every open source that is due once and publish the results"""
+        now = time.monotonic()
+        self._release_idle(now)
+        with self._lock:
+            urls = [url for url in self._urls if self._retry_at.get(url, 0) <= now]
+            previous = {url: self._results[url] for url in urls if url in self._results}
+        
+        # Fetch concurrently so one slow sheet does not delay the others
+        results = DataLoader.load_many(urls, previous, names=self._names)
+        # Previous rounds first, so a final is classified against this cycle's semis
+        ordered = sorted(results, key=lambda url: previous_round(self._names.get(url, url)) is not None)
+        with self._lock:
+            for url in ordered:
+                result = results[url]
+                if result.error:
+                    result = self._handle_failure(url, result, previous.get(url))
+                else:
+                    self._retry_at.pop(url, None)
+                    name = self._names.get(url, url)
+                    ranks = self._previous_round_ranks(name)
+                    # New body, or an unchanged one whose countback ranks have changed since:
+                    # classify it once here instead of in every session
+                    if result.snapshot is None or (result.snapshot.previous_ranks or None) != ranks:
+                        result = replace(result, snapshot=CompetitionSnapshot(name, result.df, ranks))
+                    if self.history is not None and result.changed and result.body is not None:
+                        self.history.record(self._names.get(url, url), result.fetched_at, result.body_hash,
+                                            result.body)
+                if url not in self._ready:
+                    continue  # Released while the fetch was in flight
+                self._results[url] = result
+                self._ready[url].set()
+    
+    def previous_round_ranks(self, name: str) -> Optional[Dict[str, float]]:
+        """Local ranks of the round before ``name`` (semis for a final), used for countback"""
+        with self._lock:
+            return self._previous_round_ranks(name)
+    
+    def _previous_round_ranks(self, name: str) -> Optional[Dict[str, float]]:
+        """``previous_round_ranks`` for a caller that holds the lock"""
+        result = self._results.get(self._urls_by_name.get(previous_round(name) or ""))
+        if result is not None and result.snapshot is not None:
+            return result.snapshot.local_ranks or None
+        return None
+    
+    def _handle_failure(self, url: str, result: SheetResult, previous: Optional[SheetResult]) -> SheetResult:
+        """Schedule a backed-off retry and keep serving the last good snapshot (stale-while-revalidate)"""
+        failures = (previous.failures if previous is not None else 0) + 1
+        backoff = 2 ** min(failures - 1, Config.MAX_RETRIES)
+        self._retry_at[url] = time.monotonic() + backoff
+        logger.info(f"Retrying {url} in {backoff}s (failure {failures})")
+        
+        if previous is not None and not previous.df.empty:
+            return replace(previous, changed=False, error=result.error, failures=failures, elapsed=result.elapsed)
+        return replace(result, failures=failures)
+    
+    def _run(self):
+        while True:
+            started = time.monotonic()
+            try:
+                self.poll_once()
+                if Config.METRICS_FILE:
+                    METRICS.write_prometheus(Config.METRICS_FILE)
+            except Exception as e:
+                logger.error(f"Sheet poller cycle failed: {e}")
+            
+            remaining = self.interval - (time.monotonic() - started)
+            if remaining > 0:
+                self._wakeup.wait(remaining)
+            self._wakeup.clear()
+
+
+@process_singleton
+def get_event_registry() -> EventRegistry:
+    """Return the events from ``Config.EVENTS_FILE``, or the built-in championship"""
+    if Config.EVENTS_FILE:
+        try:
+            return EventRegistry.load(Config.EVENTS_FILE)
+        except (OSError, ValueError, AttributeError) as e:
+            logger.error(f"Could not load events from {Config.EVENTS_FILE}: {e}")
+    return EventRegistry.default()
+
+
+@process_singleton
+def get_http_session() -> HttpSession:
+    """Return the pooled HTTP session, sized to the registered sources and the fetch parallelism"""
+    sources = list(get_event_registry().sources.values())
+    hosts = len({source.split("/")[2] for source in sources if "://" in source})
+    return HttpSession(pool_size=min(len(sources), Config.MAX_PARALLEL_FETCHES), hosts=hosts)
+
+
+@process_singleton
+def bulk_export_available() -> bool:
+    """True when openpyxl is installed to read bulk xlsx exports, checked once per process"""
+    try:
+        import openpyxl  # noqa: F401  Optional, only needed by Config.BULK_EXPORT
+    except ImportError:
+        logger.warning("IFSC_BULK_EXPORT needs openpyxl; fetching one CSV per sheet instead")
+        return False
+    return True
+
+
+@process_singleton
+def get_sheet_poller() -> SheetPoller:
+    """Return the single poller for this server process, starting it on first use"""
+    return SheetPoller(get_event_registry().sources, history=get_snapshot_history()).start()
+
+
+def is_nullable_int(dtype) -> bool:
+    """True for the nullable integer dtypes used by DataLoader._compact_dataframe"""
+    return pd.api.types.is_extension_array_dtype(dtype) and pd.api.types.is_integer_dtype(dtype)
+
+
+def numeric_column(df: pd.DataFrame, col: str) -> pd.Series:
+    """Convert a column to numbers, expanding compact categorical and nullable integer storage.
+    
+    Nullable integers come from float columns with blanks, so they go back to float64 and
+    render exactly as the sheet's own values did.
+    """
+    series = df[col]
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        series = series.astype(object)
+    numeric = pd.to_numeric(series, errors='coerce')
+    return numeric.astype('float64') if is_nullable_int(numeric.dtype) else numeric
+
+
+def competition_info(name: str) -> Competition:
+    """Fields of a registered competition, or of any other name read from its last three words"""
+    return get_event_registry().info.get(name) or Competition.parse(name)
+
+
+def previous_round(name: str) -> Optional[str]:
+    """Name of the competition whose ranking breaks ties in ``name``, if it is tracked"""
+    return get_event_registry().previous_rounds.get(name)
+
+
+def snapshot_for(name: str, result: SheetResult,
+                 previous_ranks: Optional[Dict[str, float]] = None) -> "CompetitionSnapshot":
+    """Return the poller-built snapshot of a result, building one if it was classified under another name.
+    
+    ``previous_ranks`` are the countback ranks for a snapshot built here; pass the ones the
+    poller would have used so a final ranks the same either way.
+    """
+    if result.snapshot is not None and result.snapshot.name == name:
+        METRICS.increment("cache_requests", cache="snapshot", result="hit")
+        return result.snapshot
+    METRICS.increment("cache_requests", cache="snapshot", result="miss")
+    return CompetitionSnapshot(name, result.df, previous_ranks)
+
+class MetricsCalculator:
+    """Enhanced metrics calculation"""
+    
+    @staticmethod
+    def calculate_boulder_metrics(df: pd.DataFrame) -> Dict[str, any]:
+        """Calculate boulder competition metrics"""
+        try:
+            total_athletes = len(df[df['Athlete Name'].notna() & (df['Athlete Name'] != '')])
+            
+            boulder_cols = [col for col in df.columns if 'Boulder' in str(col) and 'Score' in str(col)]
+            completed_problems = sum(df[col].notna().sum() for col in boulder_cols) if boulder_cols else 0
+            
+            # Find total score column
+            score_col = next((col for col in df.columns if 'Total Score' in str(col)), None)
+            
+            avg_score = 0
+            if score_col:
+                numeric_scores = pd.to_numeric(df[score_col], errors='coerce')
+                avg_score = numeric_scores.mean() if not numeric_scores.isna().all() else 0
+            
+            # Find leader
+            leader = "TBD"
+            if 'Current Position/Rank' in df.columns:
+                try:
+                    leader_mask = pd.to_numeric(df['Current Position/Rank'], errors='coerce') == 1
+                    if leader_mask.any():
+                        leader = DataProcessor.clean_text(df.loc[leader_mask, 'Athlete Name'].iloc[0])
+                except:
+                    pass
+            
+            return {
+                'total_athletes': total_athletes,
+                'completed_problems': completed_problems,
+                'avg_score': avg_score,
+                'leader': leader
+            }
+        except Exception as e:
+            logger.error(f"Error calculating boulder metrics: {e}")
+            return {'total_athletes': 0, 'completed_problems': 0, 'avg_score': 0, 'leader': 'TBD'}
+    
+    @staticmethod
+    def calculate_lead_metrics(df: pd.DataFrame) -> Dict[str, any]:
+        """Calculate lead competition metrics"""
+        try:
+            # Filter active athletes
+            active_df = df[
+                df['Name'].notna() & 
+                (df['Name'] != '') & 
+                (~df['Name'].astype(str).str.contains('Hold for', na=False)) &
+                (~df['Name'].astype(str).str.contains('Min to', na=False))
+            ]
+            
+            total_athletes = len(active_df)
+            completed = len(active_df[active_df['Manual Score'].notna() & (active_df['Manual Score'] != '')])
+            
+            # Calculate average score, counting a plus-hold as half a hold more
+            avg_score = 0
+            if LeadScoring.CODE_COLUMN in active_df.columns:
+                scores = pd.Series(LeadScoring.holds(numeric_column(active_df, LeadScoring.CODE_COLUMN)))
+                avg_score = scores.mean() if not scores.isna().all() else 0
+            elif 'Manual Score' in active_df.columns:
+                scores = pd.to_numeric(active_df['Manual Score'], errors='coerce')
+                avg_score = scores.mean() if not scores.isna().all() else 0
+            
+            # Find leader
+            leader = "TBD"
+            if 'Current Rank' in active_df.columns:
+                try:
+                    leader_idx = pd.to_numeric(active_df['Current Rank'], errors='coerce') == 1
+                    if leader_idx.any():
+                        leader = DataProcessor.clean_text(active_df.loc[leader_idx, 'Name'].iloc[0])
+                except:
+                    pass
+            
+            return {
+                'total_athletes': total_athletes,
+                'completed': completed,
+                'avg_score': avg_score,
+                'leader': leader
+            }
+        except Exception as e:
+            logger.error(f"Error calculating lead metrics: {e}")
+            return {'total_athletes': 0, 'completed': 0, 'avg_score': 0, 'leader': 'TBD'}
+
+class BoulderScoring:
+    """Local IFSC boulder scoring and ranking, vectorized across every athlete.
+    
+    A boulder is worth 25 points for a top or 10 for a zone, minus 0.1 for every failed attempt
+    before it. Athletes rank by total points; ties are broken by countback to the previous round
+    and otherwise share the rank.
+    """
+    
+    TOP_POINTS = 25.0
+    ZONE_POINTS = 10.0
+    ATTEMPT_PENALTY = 0.1
+    SCORE_COLUMN_PATTERN = re.compile(r'Boulder (\d+) Score', re.IGNORECASE)
+    RAW_COLUMN_PATTERN = re.compile(r'Boulder (\d+) (Top|Zone)\b(?!.*Score)', re.IGNORECASE)
+    TOLERANCE = 0.05  # Points difference below which the sheet total counts as matching
+    
+    @staticmethod
+    def points(top_attempts: np.ndarray, zone_attempts: np.ndarray) -> np.ndarray:
+        """Points per boulder from the attempt of the top and of the zone.
+        
+        0 means not achieved and NaN means not attempted yet (NaN points).
+        """
+        top_attempts = np.asarray(top_attempts, dtype=float)
+        zone_attempts = np.asarray(zone_attempts, dtype=float)
+        penalty = BoulderScoring.ATTEMPT_PENALTY
+        points = np.where(
+            top_attempts > 0, BoulderScoring.TOP_POINTS - penalty * (top_attempts - 1),
+            np.where(zone_attempts > 0, BoulderScoring.ZONE_POINTS - penalty * (zone_attempts - 1), 0.0)
+        )
+        points = np.where(np.isnan(top_attempts) & np.isnan(zone_attempts), np.nan, points)
+        return np.round(points, 1)
+    
+    @staticmethod
+    def attempts_from_points(points: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Decompose boulder points into (top attempt, zone attempt, valid) arrays.
+        
+        Top attempts are 0 for boulders without a top. A top implies a zone on the same attempt
+        or earlier, which points alone cannot tell, so zone attempts are only set for zone-only
+        results. ``valid`` is False for values that no top/zone/attempt combination produces.
+        """
+        points = np.asarray(points, dtype=float)
+        penalty = BoulderScoring.ATTEMPT_PENALTY
+        with np.errstate(invalid='ignore'):
+            is_top = points > BoulderScoring.ZONE_POINTS
+            is_zone = (points > 0) & ~is_top
+            top_attempts = np.where(is_top, np.rint((BoulderScoring.TOP_POINTS - points) / penalty) + 1, 0)
+            zone_attempts = np.where(is_zone, np.rint((BoulderScoring.ZONE_POINTS - points) / penalty) + 1, 0)
+            rebuilt = BoulderScoring.points(top_attempts, zone_attempts)
+            valid = np.isnan(points) | ((points >= 0) & (np.abs(rebuilt - points) < 1e-6))
+        nan = np.isnan(points)
+        return np.where(nan, np.nan, top_attempts), np.where(nan, np.nan, zone_attempts), valid
+    
+    @staticmethod
+    def boulder_points(df: pd.DataFrame) -> Tuple[List[str], np.ndarray]:
+        """(boulder labels, athletes x boulders points) from raw top/zone attempt columns when the
+        sheet has them, otherwise from its per-boulder score columns"""
+        raw = {}
+        for col in df.columns:
+            match = BoulderScoring.RAW_COLUMN_PATTERN.search(str(col))
+            if match:
+                raw.setdefault(int(match.group(1)), {})[match.group(2).lower()] = col
+        complete = sorted(n for n, cols in raw.items() if len(cols) == 2)
+        if complete:
+            points = np.column_stack([
+                BoulderScoring.points(numeric_column(df, raw[n]['top']).to_numpy(dtype=float),
+                                      numeric_column(df, raw[n]['zone']).to_numpy(dtype=float))
+                for n in complete
+            ])
+            return [f"Boulder {n}" for n in complete], points
+        
+        score_cols = sorted(
+            (int(match.group(1)), col) for col in df.columns
+            if (match := BoulderScoring.SCORE_COLUMN_PATTERN.search(str(col)))
+        )
+        if not score_cols:
+            return [], np.empty((len(df), 0))
+        points = np.column_stack([numeric_column(df, col).to_numpy(dtype=float) for _, col in score_cols])
+        return [f"Boulder {n}" for n, _ in score_cols], points
+    
+    @staticmethod
+    def rank(totals: np.ndarray, previous_ranks: Optional[np.ndarray] = None) -> np.ndarray:
+        """Competition ranks (1 = best, ties share the best rank) for ``totals``.
+        
+        Ties on points are split by ``previous_ranks`` (countback to the previous round); athletes
+        without a previous rank sit behind those with one. NaN totals get a NaN rank.
+        """
+        totals = np.asarray(totals, dtype=float)
+        countback = (np.full(len(totals), np.inf) if previous_ranks is None
+                     else np.where(np.isnan(previous_ranks), np.inf, previous_ranks))
+        scored = ~np.isnan(totals)
+        
+        # lexsort sorts by the last key first: points descending, then previous-round rank
+        order = np.lexsort((countback, -np.where(scored, totals, -np.inf)))
+        sorted_totals = np.round(totals[order], 1)
+        sorted_countback = countback[order]
+        new_rank = np.ones(len(order), dtype=bool)
+        new_rank[1:] = (sorted_totals[1:] != sorted_totals[:-1]) | (sorted_countback[1:] != sorted_countback[:-1])
+        ranks_sorted = np.maximum.accumulate(np.where(new_rank, np.arange(1, len(order) + 1), 0))
+        
+        ranks = np.empty(len(order), dtype=float)
+        ranks[order] = ranks_sorted
+        return np.where(scored, ranks, np.nan)
+    
+    @staticmethod
+    def score(df: pd.DataFrame, athlete_col: str, previous_ranks: Optional[Dict[str, float]] = None) -> pd.DataFrame:
+        """Local tops, zones, total and rank for every row of ``df`` (same index).
+        
+        ``previous_ranks`` maps athlete names to their previous-round rank for countback.
+        """
+        labels, points = BoulderScoring.boulder_points(df)
+        top_attempts, _, valid = BoulderScoring.attempts_from_points(points)
+        attempted = ~np.isnan(points)
+        
+        with np.errstate(invalid='ignore'):
+            totals = np.where(attempted.any(axis=1), np.round(np.nansum(points, axis=1), 1), np.nan)
+            tops = np.where(attempted, top_attempts > 0, False).sum(axis=1)
+            zones = np.where(attempted, points > 0, False).sum(axis=1)
+        
+        countback = None
+        if previous_ranks:
+            countback = df[athlete_col].astype(object).map(previous_ranks).to_numpy(dtype=float)
+        
+        return pd.DataFrame({
+            'Local Tops': tops,
+            'Local Zones': zones,
+            'Local Total': totals,
+            'Local Rank': BoulderScoring.rank(totals, countback),
+            'Invalid Boulders': [
+                ", ".join(label for label, ok in zip(labels, row) if not ok) for row in valid
+            ] if labels else "",
+        }, index=df.index)
+    
+    @staticmethod
+    def disagreements(df: pd.DataFrame, local: pd.DataFrame, athlete_col: str, score_col: Optional[str],
+                      rank_col: str) -> pd.DataFrame:
+        """Rows where the sheet's total or rank differs from the local computation"""
+        sheet_total = numeric_column(df, score_col) if score_col else pd.Series(np.nan, index=df.index)
+        sheet_rank = numeric_column(df, rank_col)
+        
+        scored = local['Local Total'].notna()
+        total_off = scored & ((sheet_total - local['Local Total']).abs() > BoulderScoring.TOLERANCE)
+        total_missing = scored & sheet_total.isna()
+        rank_off = scored & (sheet_rank != local['Local Rank'])
+        invalid = local['Invalid Boulders'] != ""
+        flagged = (total_off | total_missing | rank_off | invalid) & df[athlete_col].notna() & (df[athlete_col] != '')
+        
+        issues = np.select(
+            [invalid, total_missing, total_off, rank_off],
+            ["Invalid boulder score", "Total missing in sheet", "Total differs", "Rank differs"],
+            default=""
+        )
+        return pd.DataFrame({
+            'Athlete': df[athlete_col].astype(object),
+            'Sheet Total': sheet_total,
+            'Local Total': local['Local Total'],
+            'Sheet Rank': sheet_rank,
+            'Local Rank': local['Local Rank'],
+            'Issue': np.where(invalid, "Invalid score on " + local['Invalid Boulders'], issues),
+        })[flagged].reset_index(drop=True)
+
+
+class BoulderScenarios:
+    """Minimum result each athlete needs on their remaining boulders for a podium place or top 8.
+    
+    Every other athlete is held at their current total. Totals only ever grow, so a place that
+    is out of reach now is out of reach for good (IMPOSSIBLE is a proof), and a requirement is
+    the least the athlete must score to pass the current holder. A tie is enough when the
+    athlete wins it on countback to the previous round; without countback ranks, or against a
+    better-ranked holder, ties are lost.
+    """
+    
+    PLACES = {'1st': 1, '2nd': 2, '3rd': 3, 'top8': 8}
+    MAX_ATTEMPTS = 20  # Attempt limits above this are not worth showing
+    
+    @staticmethod
+    def needed_points(totals: np.ndarray, places: List[int], countback: Optional[np.ndarray] = None) -> np.ndarray:
+        """Points each athlete must add to move ahead of the current holder of each place
+        (athletes x places); non-positive means the place is already held.
+        
+        ``countback`` holds previous-round ranks (NaN for none): matching the holder's total is
+        enough for an athlete ranked better than the holder, anyone else needs one attempt more.
+        """
+        n = len(totals)
+        countback = (np.full(n, np.inf) if countback is None
+                     else np.where(np.isnan(countback), np.inf, np.asarray(countback, dtype=float)))
+        # Standings order: total, then countback, then sheet order
+        order = np.lexsort((countback, -totals))
+        position = np.empty(n, dtype=int)
+        position[order] = np.arange(n)
+        # Totals and countback ranks by position, padded so "the k-th best of the others" always exists
+        pad = max(places) + 1
+        ranked = np.concatenate([totals[order], np.full(pad, -np.inf)])
+        ranked_countback = np.concatenate([countback[order], np.full(pad, np.inf)])
+        
+        places_arr = np.asarray(places)
+        # Athletes currently ahead of place k skip themselves when finding its holder
+        holder = np.where(position[:, None] >= places_arr[None, :], places_arr - 1, places_arr)
+        margin = np.where(countback[:, None] < ranked_countback[holder], 0.0, BoulderScoring.ATTEMPT_PENALTY)
+        return np.round(ranked[holder] - totals[:, None] + margin, 1)
+    
+    @staticmethod
+    def solve(totals: np.ndarray, remaining: np.ndarray, places: Dict[str, int] = None,
+              countback: Optional[np.ndarray] = None) -> pd.DataFrame:
+        """Requirement text per athlete and place, plus podium/top-8 impossibility flags.
+        
+        Candidate results are (tops, zones) combinations that fit the boulders left, tried with
+        the fewest boulders first and then the fewest points, so the least demanding requirement
+        wins ("Top" rather than "3 Zones"); its spare points become the failed-attempt allowance.
+        """
+        places = places or BoulderScenarios.PLACES
+        totals = np.nan_to_num(np.asarray(totals, dtype=float), nan=0.0)
+        remaining = np.asarray(remaining, dtype=int)
+        need = BoulderScenarios.needed_points(totals, list(places.values()), countback)
+        
+        most = int(remaining.max(initial=0))
+        points = lambda combo: combo[0] * BoulderScoring.TOP_POINTS + combo[1] * BoulderScoring.ZONE_POINTS
+        combos = sorted(((t, z) for t in range(most + 1) for z in range(most + 1 - t)),
+                        key=lambda combo: (sum(combo), points(combo)))
+        tops = np.array([t for t, _ in combos])
+        zones = np.array([z for _, z in combos])
+        best = tops * BoulderScoring.TOP_POINTS + zones * BoulderScoring.ZONE_POINTS
+        
+        # athletes x places x combos; combinations needing more boulders than are left are pruned
+        feasible = ((best[None, None, :] >= need[:, :, None] - 1e-9)
+                    & ((tops + zones)[None, None, :] <= remaining[:, None, None]))
+        possible = feasible.any(axis=2)
+        choice = feasible.argmax(axis=2)
+        # Places already held (need <= 0, or -inf when fewer athletes than places) spare nothing
+        spare = np.floor((best[choice] - np.clip(need, 0, None)) / BoulderScoring.ATTEMPT_PENALTY + 1e-6).astype(int)
+        
+        texts = {}
+        result = {}
+        for j, place in enumerate(places):
+            column = []
+            for i in range(len(totals)):
+                if remaining[i] <= 0:
+                    column.append("")
+                elif need[i, j] <= 0:
+                    column.append("Any")
+                elif not possible[i, j]:
+                    column.append("IMPOSSIBLE")
+                else:
+                    key = (combos[choice[i, j]], spare[i, j])
+                    if key not in texts:
+                        texts[key] = BoulderScenarios.describe(*key)
+                    column.append(texts[key])
+            result[place] = column
+        
+        frame = pd.DataFrame(result)
+        podium = [j for j, place in enumerate(places) if places[place] <= 3]
+        frame['podium_impossible'] = ~possible[:, podium].any(axis=1)
+        if 'top8' in places:
+            frame['top8_impossible'] = ~possible[:, list(places).index('top8')]
+        return frame
+    
+    @staticmethod
+    def describe(combo: Tuple[int, int], spare_attempts: int) -> str:
+        """Sheet-style wording, e.g. "Top in 3", "Zone", "Top + Zone (4 failed attempts max)" """
+        tops, zones = combo
+        if tops + zones == 1:
+            result = "Top" if tops else "Zone"
+            if spare_attempts + 1 < BoulderScenarios.MAX_ATTEMPTS:
+                return f"{result} in {spare_attempts + 1}"
+            return result
+        
+        parts = []
+        if tops:
+            parts.append("Top" if tops == 1 else f"{tops} Tops")
+        if zones:
+            parts.append("Zone" if zones == 1 else f"{zones} Zones")
+        text = " + ".join(parts)
+        if spare_attempts < BoulderScenarios.MAX_ATTEMPTS:
+            text += f" ({spare_attempts} failed attempts max)"
+        return text
+    
+    @staticmethod
+    def solve_standings(df: pd.DataFrame, score_col: Optional[str], boulder_infos: List[Dict],
+                        previous_ranks: Optional[Dict[str, float]] = None) -> Optional[pd.DataFrame]:
+        """Solve for a sorted standings frame, or None when it has no boulder score columns.
+        
+        ``previous_ranks`` maps athlete names to their previous-round rank for countback.
+        """
+        labels, _ = BoulderScoring.boulder_points(df)
+        if not labels or score_col is None:
+            return None
+        totals = numeric_column(df, score_col).to_numpy(dtype=float)
+        completed = np.array([info['completed_boulders'] for info in boulder_infos], dtype=int)
+        countback = None
+        if previous_ranks and 'Athlete Name' in df.columns:
+            countback = df['Athlete Name'].astype(object).map(previous_ranks).to_numpy(dtype=float)
+        return BoulderScenarios.solve(totals, len(labels) - completed, countback=countback)
+
+
+class LeadScoring:
+    """Lead scores as single sortable integers: twice the hold reached, plus one for a "+".
+    
+    "35" is 70 and "35+" is 71, so a higher code is always a better score. Local ranks and the
+    hold thresholds for each place come from the sorted codes of the athletes who have climbed.
+    """
+    
+    SCORE_COLUMN = 'Manual Score'
+    CODE_COLUMN = 'Hold Code'
+    # Whole numbers only; CSV export may write an all-numeric column as floats ("41.0")
+    SCORE_PATTERN = r'^\s*(\d+)(?:\.0+)?\s*(\+)?\s*$'
+    PODIUM_THRESHOLDS = {'Hold for 1st': 1, 'Hold for 2nd': 2, 'Hold for 3rd': 3}
+    # Semis send their top 8 to the final; a final has nothing left to qualify for
+    SEMIS_THRESHOLDS = {**PODIUM_THRESHOLDS, 'Hold to Qualify': 8}
+    
+    @staticmethod
+    def parse(series: pd.Series) -> pd.Series:
+        """Hold codes for raw sheet scores (nullable Int16, missing for blank or unreadable cells).
+        
+        Parses each distinct value once, so it must run before text cleaning strips the "+".
+        """
+        codes, uniques = pd.factorize(series.to_numpy(dtype=object))
+        parts = pd.Series(uniques, dtype=object).astype(str).str.extract(LeadScoring.SCORE_PATTERN)
+        unique_codes = pd.to_numeric(parts[0]).to_numpy(dtype=float) * 2 + parts[1].notna().to_numpy()
+        values = np.where(codes >= 0, unique_codes[codes] if len(unique_codes) else np.nan, np.nan)
+        return pd.Series(values, index=series.index).astype('Int16')
+    
+    @staticmethod
+    def format(code: float) -> str:
+        """Sheet notation for a hold code, e.g. 71 -> "35+" """
+        code = int(code)
+        return f"{code // 2}+" if code % 2 else str(code // 2)
+    
+    @staticmethod
+    def holds(codes: np.ndarray) -> np.ndarray:
+        """Codes as hold numbers, with a "+" worth half a hold (for averages)"""
+        return np.asarray(codes, dtype=float) / 2
+    
+    @staticmethod
+    def rank(codes: np.ndarray) -> np.ndarray:
+        """Competition ranks (1 = best, equal scores share the best rank); NaN for no score"""
+        codes = np.asarray(codes, dtype=float)
+        scored = ~np.isnan(codes)
+        ordered = np.sort(codes[scored])
+        # Athletes ahead = scores strictly higher = everything right of the insertion point
+        ahead = len(ordered) - np.searchsorted(ordered, codes, side='right')
+        return np.where(scored, ahead + 1, np.nan)
+    
+    @staticmethod
+    def thresholds(codes: np.ndarray, places: Dict[str, int] = None) -> Dict[str, str]:
+        """Score needed for each place, in sheet notation.
+        
+        Matching the current holder of place k shares it, so the threshold is the k-th best
+        score; places with fewer than k scores so far are left out. ``places`` defaults to the
+        podium only; pass SEMIS_THRESHOLDS for a semi-final.
+        """
+        places = places or LeadScoring.PODIUM_THRESHOLDS
+        codes = np.asarray(codes, dtype=float)
+        ordered = np.sort(codes[~np.isnan(codes)])
+        return {
+            key: LeadScoring.format(ordered[len(ordered) - place])
+            for key, place in places.items() if len(ordered) >= place
+        }
+
+
+class PodiumSimulation:
+    """Monte Carlo finishing probabilities for a boulder round in progress.
+    
+    Every remaining boulder of every athlete is drawn from an outcome distribution of boulder
+    points fitted from recorded rounds, all simulations at once as (simulations x athletes)
+    arrays. Ties are split by previous-round rank as in BoulderScoring.rank, then at random.
+    """
+    
+    SIMULATIONS = 100_000
+    BATCH_SIZE = 20_000  # Simulations per batch, bounding memory for large rounds
+    TABLE_SIZE = 4096  # Resolution of the outcome sampling table (probabilities to 1/4096)
+    MIN_SAMPLES = 40  # Recorded boulder results needed before the fit replaces the default
+    # Used until enough results are recorded: share of tops/zones by attempt, and no score
+    DEFAULT_OUTCOMES = (
+        np.array([25.0, 24.9, 24.8, 24.7, 10.0, 9.9, 9.8, 9.7, 0.0]),
+        np.array([0.20, 0.08, 0.04, 0.02, 0.15, 0.08, 0.05, 0.03, 0.35]),
+    )
+    
+    @staticmethod
+    def fit(frames: List[pd.DataFrame]) -> Tuple[np.ndarray, np.ndarray]:
+        """(points values, probabilities) of the boulder results in ``frames``, or the default
+        distribution when they hold fewer than ``MIN_SAMPLES`` results"""
+        samples = []
+        for df in frames:
+            _, points = BoulderScoring.boulder_points(df)
+            samples.append(points[~np.isnan(points)])
+        samples = np.round(np.concatenate(samples), 1) if samples else np.empty(0)
+        if len(samples) < PodiumSimulation.MIN_SAMPLES:
+            return PodiumSimulation.DEFAULT_OUTCOMES
+        values, counts = np.unique(samples, return_counts=True)
+        return values, counts / counts.sum()
+    
+    @staticmethod
+    def simulate(totals: np.ndarray, remaining: np.ndarray, outcomes: Tuple[np.ndarray, np.ndarray],
+                 places: List[int], countback: Optional[np.ndarray] = None,
+                 simulations: int = None, seed: Optional[int] = None) -> np.ndarray:
+        """Probability of each athlete finishing at or above each place (athletes x places)"""
+        simulations = simulations or PodiumSimulation.SIMULATIONS
+        totals = np.nan_to_num(np.asarray(totals, dtype=float), nan=0.0)
+        remaining = np.asarray(remaining, dtype=int)
+        n = len(totals)
+        values, probabilities = outcomes
+        rng = np.random.default_rng(seed)
+        
+        # Previous-round rank breaks ties; its weight stays far below the 0.1 point resolution
+        tiebreak = np.zeros(n) if countback is None else -np.where(np.isnan(countback), 999, countback) * 1e-5
+        base = totals + tiebreak
+        
+        # Inverse-CDF lookup table: one integer draw per boulder instead of a search per draw
+        cdf = np.cumsum(probabilities)
+        table = values[np.minimum(np.searchsorted(cdf, (np.arange(PodiumSimulation.TABLE_SIZE) + 0.5)
+                                                  / PodiumSimulation.TABLE_SIZE), len(values) - 1)]
+        hits = np.zeros((n, len(places)))
+        for start in range(0, simulations, PodiumSimulation.BATCH_SIZE):
+            size = min(PodiumSimulation.BATCH_SIZE, simulations - start)
+            final = np.tile(base, (size, 1))
+            for boulder in range(int(remaining.max(initial=0))):
+                draws = table[rng.integers(0, PodiumSimulation.TABLE_SIZE, size=(size, n))]
+                final += np.where(remaining > boulder, draws, 0.0)
+            final += rng.random((size, n)) * 1e-6
+            
+            # In the top k when at least the k-th best of the simulation; partition avoids a full sort
+            for j, place in enumerate(places):
+                if place >= n:
+                    hits[:, j] += size
+                    continue
+                kth = -np.partition(-final, place - 1, axis=1)[:, place - 1]
+                hits[:, j] += (final >= kth[:, None]).sum(axis=0)
+        return hits / simulations
+    
+    @staticmethod
+    def probabilities(snapshot: "CompetitionSnapshot", outcomes: Tuple[np.ndarray, np.ndarray],
+                      simulations: int = None, seed: Optional[int] = None) -> pd.DataFrame:
+        """Win/podium (and top-8 qualification for semis) percentages for a snapshot's standings,
+        most likely podium first; empty when no athlete has boulders left"""
+        df = snapshot.standings
+        labels, _ = BoulderScoring.boulder_points(df)
+        if df.empty or not labels or snapshot.score_col is None:
+            return pd.DataFrame()
+        df = df[df['Athlete Name'].notna() & (df['Athlete Name'] != '')]
+        
+        completed = np.array([info['completed_boulders'] for info in calculate_boulder_completion(df)], dtype=int)
+        remaining = len(labels) - completed
+        # Only rounds in progress: started, with boulders left
+        if not (completed > 0).any() or not (remaining > 0).any():
+            return pd.DataFrame()
+        
+        places = {'Win %': 1, 'Podium %': 3}
+        if snapshot.competition.round == "Semis":
+            places['Top 8 %'] = 8
+        countback = None
+        if snapshot.previous_ranks:
+            countback = df['Athlete Name'].astype(object).map(snapshot.previous_ranks).to_numpy(dtype=float)
+        
+        chances = PodiumSimulation.simulate(
+            numeric_column(df, snapshot.score_col).to_numpy(dtype=float), remaining, outcomes,
+            list(places.values()), countback, simulations, seed
+        )
+        result = pd.DataFrame({
+            'Athlete': cleaned_column_values(df, 'Athlete Name', 'Unknown'),
+            'Rank': numeric_column(df, 'Current Position/Rank').to_numpy(),
+            'Boulders Left': remaining,
+            **{label: np.round(chances[:, j] * 100, 1) for j, label in enumerate(places)},
+        })
+        return result.sort_values(['Podium %', 'Win %'], ascending=False).reset_index(drop=True)
+
+
+class CompetitionSnapshot:
+    """Typed, pre-classified view of one fetched sheet.
+    
+    Built once per distinct sheet body on the poller thread and shared by every session:
+    numeric rank/score columns, the resolved column map, the active-athlete mask, status,
+    metrics and the sorted standings are all computed here instead of on every render.
+    """
+    
+    @METRICS.timed("classify")
+    def __init__(self, name: str, df: pd.DataFrame, previous_ranks: Optional[Dict[str, float]] = None):
+        self.name = name
+        self.df = df
+        self.previous_ranks = previous_ranks
+        self.competition = competition_info(name)
+        discipline = self.competition.discipline
+        self.discipline = discipline if discipline in ("Boulder", "Lead") else None
+        self.status, self.status_emoji = CompetitionStatusDetector.get_competition_status(df, name)
+        
+        self.columns: Dict[str, Optional[str]] = {}
+        self.issues: List[str] = []
+        self.metrics: Dict[str, any] = {}
+        self.qualification_info: Dict[str, str] = {}
+        self.active_mask = pd.Series(False, index=df.index)
+        self.standings = pd.DataFrame()
+        self.scoring = pd.DataFrame()
+        self.score_disagreements = pd.DataFrame()
+        
+        if df.empty:
+            self.issues = ["DataFrame is empty"]
+        elif self.discipline == "Boulder":
+            self._build_boulder()
+        elif self.discipline == "Lead":
+            self._build_lead()
+    
+    @property
+    def is_valid(self) -> bool:
+        return not self.issues
+    
+    @property
+    def score_col(self) -> Optional[str]:
+        return self.columns.get('score')
+    
+    @property
+    def local_ranks(self) -> Dict[str, float]:
+        """Locally computed rank of every scored athlete, for countback in the next round"""
+        if self.scoring.empty:
+            return {}
+        ranked = self.scoring['Local Rank'].notna()
+        return dict(zip(self.df.loc[ranked, 'Athlete Name'].astype(object), self.scoring.loc[ranked, 'Local Rank']))
+    
+    def _build_boulder(self):
+        df = self.df
+        
+        # Validate required columns
+        required_cols = ['Athlete Name', 'Current Position/Rank']
+        is_valid, self.issues = DataProcessor.validate_dataframe(df, required_cols)
+        if not is_valid:
+            return
+        
+        score_col = next((col for col in df.columns if 'Total Score' in str(col)), None)
+        self.columns = {'athlete': 'Athlete Name', 'rank': 'Current Position/Rank', 'score': score_col}
+        self.active_mask = df['Athlete Name'].notna() & (df['Athlete Name'] != '')
+        self.metrics = MetricsCalculator.calculate_boulder_metrics(df)
+        
+        # Typed numeric rank and score, converted once per snapshot
+        numeric = {'Current Position/Rank': numeric_column(df, 'Current Position/Rank')}
+        if score_col is not None:
+            numeric[score_col] = numeric_column(df, score_col)
+        
+        # Boulder scores stored as nullable small ints are shown as the float values the sheet exported
+        for col in df.columns:
+            if 'Boulder' in str(col) and 'Score' in str(col) and is_nullable_int(df[col].dtype):
+                numeric[col] = numeric_column(df, col)
+        
+        # Local scoring catches sheet formula errors and fills cells the sheet has not recalculated yet
+        self.scoring = BoulderScoring.score(df, 'Athlete Name', self.previous_ranks)
+        self.score_disagreements = BoulderScoring.disagreements(df, self.scoring, 'Athlete Name', score_col,
+                                                               'Current Position/Rank')
+        numeric['Current Position/Rank'] = numeric['Current Position/Rank'].fillna(self.scoring['Local Rank'])
+        if score_col is not None:
+            numeric[score_col] = numeric[score_col].fillna(self.scoring['Local Total'])
+        df_sorted = df.assign(**numeric)
+        
+        # Sort by position
+        try:
+            df_sorted = df_sorted.sort_values('Current Position/Rank', ascending=True).reset_index(drop=True)
+        except Exception as e:
+            logger.warning(f"Could not sort data: {e}")
+            df_sorted = df.copy()
+        
+        self.standings = df_sorted
+    
+    def _build_lead(self):
+        df = self.df
+        
+        if 'Name' not in df.columns:
+            self.issues = ["Name column not found in data"]
+            return
+        
+        self.columns = {'athlete': 'Name', 'rank': 'Current Rank', 'score': 'Manual Score', 'status': 'Status'}
+        
+        # Extract qualification info and filter active athletes
+        semis = self.competition.round == "Semis"
+        self.qualification_info = extract_qualification_info(df)
+        if not semis:
+            self.qualification_info = {key: value for key, value in self.qualification_info.items()
+                                       if key not in LEAD_QUALIFY_COLUMNS}
+        active_df = filter_active_athletes(df, self.name)
+        self.active_mask = df.index.isin(active_df.index)
+        self.metrics = MetricsCalculator.calculate_lead_metrics(active_df)
+        
+        # Local thresholds and ranks follow a new score at once instead of waiting for the sheet
+        local_ranks = None
+        if LeadScoring.CODE_COLUMN in active_df.columns:
+            codes = numeric_column(active_df, LeadScoring.CODE_COLUMN).to_numpy()
+            places = LeadScoring.SEMIS_THRESHOLDS if semis else LeadScoring.PODIUM_THRESHOLDS
+            thresholds = {**self.qualification_info, **LeadScoring.thresholds(codes, places)}
+            self.qualification_info = {key: thresholds[key] for key in LEAD_THRESHOLD_COLUMNS if key in thresholds}
+            local_ranks = pd.Series(LeadScoring.rank(codes), index=active_df.index)
+        
+        try:
+            if 'Current Rank' in active_df.columns:
+                ranks = numeric_column(active_df, 'Current Rank')
+                if local_ranks is not None:
+                    ranks = ranks.fillna(local_ranks)
+                active_df = active_df.assign(**{'Current Rank': ranks})
+                active_df = active_df.sort_values('Current Rank', ascending=True).reset_index(drop=True)
+        except Exception as e:
+            logger.warning(f"Could not sort by rank: {e}")
+        
+        self.standings = active_df
+    
+    @cached_property
+    @METRICS.timed("cards")
+    def cards(self) -> List["CardState"]:
+        """Card states for the standings, built on first use and shared by all sessions"""
+        if self.standings.empty:
+            return []
+        if self.discipline == "Boulder":
+            return build_boulder_cards(self.standings, self.score_col, self.name, self.previous_ranks)
+        if self.discipline == "Lead":
+            return build_lead_cards(self.standings, self.qualification_info)
+        return []
+
+
+@dataclass
+class CardState:
+    """Rendered state of one athlete card, compared between refreshes to find what changed"""
+    key: str
+    rank: any
+    score: any
+    status: str
+    strategy: str
+    detail: str
+    html: str
+    
+    DIFF_FIELDS = ('score', 'rank', 'status', 'strategy', 'detail')
+    
+    def changed_fields(self, other: "CardState") -> List[str]:
+        """Return the names of the displayed fields that differ from ``other``"""
+        return [
+            name for name in self.DIFF_FIELDS
+            if not values_equal(getattr(self, name), getattr(other, name))
+        ]
+
+
+def values_equal(a: any, b: any) -> bool:
+    """Compare two cell values, treating NaN as equal to NaN"""
+    if isinstance(a, float) and isinstance(b, float) and np.isnan(a) and np.isnan(b):
+        return True
+    return a == b
+
+
+@dataclass
+class StandingsDiff:
+    """Athlete-keyed difference between two renders of a competition's standings"""
+    added: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    changed: Dict[str, List[str]] = field(default_factory=dict)
+    order_changed: bool = False
+    
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.added or self.removed or self.changed or self.order_changed)
+    
+    @property
+    def updated_keys(self) -> List[str]:
+        """Athletes whose cards need re-rendering"""
+        return self.added + list(self.changed)
+
+
+def diff_standings(previous: List[CardState], current: List[CardState]) -> StandingsDiff:
+    """Compare two standings snapshots keyed by athlete"""
+    previous_by_key = {card.key: card for card in previous}
+    current_keys = [card.key for card in current]
+    
+    diff = StandingsDiff()
+    for card in current:
+        old = previous_by_key.get(card.key)
+        if old is None:
+            diff.added.append(card.key)
+        else:
+            fields = card.changed_fields(old)
+            if fields:
+                diff.changed[card.key] = fields
+    
+    current_key_set = set(current_keys)
+    diff.removed = [key for key in previous_by_key if key not in current_key_set]
+    diff.order_changed = [card.key for card in previous if card.key in current_key_set] != \
+        [key for key in current_keys if key in previous_by_key]
+    
+    return diff
+
+def determine_athlete_status(rank: any, total_score: any, boulder_info: Dict, competition_name: str, podium_impossible: bool = False) -> Tuple[str, str]:
+    """Determine athlete status and appropriate styling - FIXED"""
+    try:
+        rank_num = DataProcessor.safe_numeric_conversion(rank)
+        completed_boulders = boulder_info['completed_boulders']
+        worst_finish_display = boulder_info['worst_finish_display']
+        competition = competition_info(competition_name)
+        
+        # If no valid rank, return gray
+        if rank_num <= 0:
+            return "awaiting-result", "⏳"
+        
+        # BOULDER FINALS - Check if all podium positions are impossible
+        if competition.discipline == "Boulder" and competition.round == "Final":
+            # Check if all podium positions are impossible (regardless of completion status)
+            if podium_impossible:
+                return "no-podium", "❌"  # RED - All podium positions impossible
+            
+            if completed_boulders < 4:
+                # Still competing - yellow for everyone (unless impossible above)
+                return "podium-contention", "⚠️"
+            else:
+                # All 4 boulders completed - check rank AND worst finish for podium
+                if rank_num <= 3:
+                    # Extract worst finish number from the display string
+                    worst_finish_num = extract_worst_finish_number(boulder_info)
+                    if worst_finish_num is not None and worst_finish_num <= 3:
+                        return "podium-position", "🏆"  # GREEN - Top 3 with worst finish 1, 2, or 3
+                    else:
+                        return "podium-contention", "⚠️"  # YELLOW - Top 3 but worst finish > 3
+                else:
+                    return "no-podium", "❌"  # RED - Not in top 3
+        
+        # BOULDER SEMIS - Check worst finish
+        elif competition.discipline == "Boulder" and competition.round == "Semis":
+            if completed_boulders < 4:
+                # Still competing - yellow for everyone
+                return "podium-contention", "⚠️"
+            else:
+                # All 4 boulders completed - check rank AND worst finish
+                if rank_num <= 8:
+                    # Extract worst finish number from the display string
+                    worst_finish_num = extract_worst_finish_number(boulder_info)
+                    if worst_finish_num is not None and worst_finish_num < 8:
+                        return "qualified", "✅"  # GREEN - Top 8 with good worst finish
+                    else:
+                        return "podium-contention", "⚠️"  # YELLOW - Top 8 but bad worst finish
+                else:
+                    return "eliminated", "❌"  # RED - Not in top 8
+        
+        # Default for all other cases
+        else:
+            if rank_num <= 3:
+                return "podium-position", "🏆"  # GREEN
+            elif rank_num <= 8:
+                return "qualified", "✅"  # GREEN
+            else:
+                return "eliminated", "❌"  # RED
+            
+    except Exception as e:
+        logger.warning(f"Error: {e}")
+        return "awaiting-result", "⏳"
+
+
+def extract_worst_finish_number(boulder_info: Dict) -> Optional[int]:
+    """Extract the worst finish number from boulder info"""
+    try:
+        worst_finish_display = boulder_info.get('worst_finish_display', '')
+        if worst_finish_display:
+            # Look for patterns like "Worst Finish: 9.0" or "Worst Finish: 7"
+            import re
+            match = re.search(r'Worst Finish:\s*(\d+(?:\.\d+)?)', worst_finish_display)
+            if match:
+                return int(float(match.group(1)))
+    except Exception as e:
+        logger.warning(f"Error extracting worst finish number: {e}")
+    return None
+
+def check_all_podium_impossible(df: pd.DataFrame, scenarios: Optional[pd.DataFrame] = None) -> pd.Series:
+    """Flag athletes for whom all podium positions (1st, 2nd, 3rd) are impossible - ONLY for finals"""
+    if scenarios is not None:
+        return pd.Series(scenarios['podium_impossible'].to_numpy(), index=df.index)
+    
+    strategy_cols = ['1st Place Strategy', '2nd Place Strategy', '3rd Place Strategy']
+    impossible_count = pd.Series(0, index=df.index)
+    
+    try:
+        for col in strategy_cols:
+            if col in df.columns:
+                impossible_count += df[col].astype(str).str.upper().str.contains("IMPOSSIBLE", regex=False)
+    except Exception as e:
+        logger.warning(f"Error checking impossible podium positions: {e}")
+        return pd.Series(False, index=df.index)
+    
+    # True where all three positions are impossible
+    return impossible_count == 3
+    
+def determine_lead_athlete_status(status: str, has_score: bool) -> Tuple[str, str]:
+    """Determine lead athlete status - FIXED"""
+    if not has_score:
+        return "awaiting-result", "🔄"
+    
+    status_lower = str(status).lower()
+    
+    if "qualified" in status_lower and "contention" not in status_lower:
+        return "qualified", "✅"
+    elif "eliminated" in status_lower:
+        return "eliminated", "❌"
+    elif "podium" in status_lower and "no podium" not in status_lower and "contention" not in status_lower:
+        return "podium-position", "🏆"
+    elif "contention" in status_lower or "podium contention" in status_lower:
+        return "podium-contention", "⚠️"  # YELLOW for podium contention
+    elif "no podium" in status_lower:
+        return "no-podium", "❌"
+    else:
+        return "podium-contention", "📊"
+
+
+def build_boulder_cards_html(df_sorted: pd.DataFrame, score_col: Optional[str], competition_name: str,
+                             previous_ranks: Optional[Dict[str, float]] = None) -> str:
+    """Build the HTML for every boulder athlete card"""
+    return "\n".join(card.html for card in build_boulder_cards(df_sorted, score_col, competition_name,
+                                                                previous_ranks))
+
+
+def build_boulder_cards(df_sorted: pd.DataFrame, score_col: Optional[str], competition_name: str,
+                        previous_ranks: Optional[Dict[str, float]] = None) -> List[CardState]:
+    """Build the card state of every boulder athlete from column arrays; ``previous_ranks``
+    (previous-round rank by athlete name) decides ties in the scenarios"""
+    if 'Athlete Name' not in df_sorted.columns:
+        return []
+    
+    names = df_sorted['Athlete Name']
+    df_sorted = df_sorted[names.notna() & (names != '')]
+    
+    athletes = cleaned_column_values(df_sorted, 'Athlete Name', 'Unknown')
+    ranks = column_values(df_sorted, 'Current Position/Rank', 'N/A')
+    total_scores = column_values(df_sorted, score_col, 'N/A') if score_col else ['N/A'] * len(df_sorted)
+    
+    boulder_infos = calculate_boulder_completion(df_sorted)
+    scenarios = BoulderScenarios.solve_standings(df_sorted, score_col, boulder_infos, previous_ranks)
+    podium_impossible = check_all_podium_impossible(df_sorted, scenarios).tolist()
+    strategy_displays = create_strategy_displays(df_sorted, boulder_infos, competition_name, scenarios)
+    
+    cards = []
+    keys = athlete_keys(athletes)
+    for key, athlete, rank, total_score, boulder_info, impossible, strategy_display in zip(
+        keys, athletes, ranks, total_scores, boulder_infos, podium_impossible, strategy_displays
+    ):
+        card_class, position_emoji = determine_athlete_status(
+            rank, total_score, boulder_info, competition_name, impossible
+        )
+        cards.append(build_athlete_card(
+            key, position_emoji, athlete, rank, total_score, boulder_info,
+            strategy_display, card_class
+        ))
+    
+    return cards
+
+
+def athlete_keys(names: List[str]) -> List[str]:
+    """Return a stable per-athlete key, numbering repeated names so every key is unique"""
+    seen = defaultdict(int)
+    keys = []
+    for name in names:
+        seen[name] += 1
+        keys.append(name if seen[name] == 1 else f"{name}#{seen[name]}")
+    return keys
+
+
+def column_values(df: pd.DataFrame, col: str, default: any) -> List[any]:
+    """Return a column as a list, or ``default`` for every row when the column is missing"""
+    return df[col].tolist() if col in df.columns else [default] * len(df)
+
+
+def cleaned_column_values(df: pd.DataFrame, col: str, default: str) -> List[str]:
+    """Return a column as cleaned text, or ``default`` for every row when the column is missing"""
+    if col not in df.columns:
+        return [default] * len(df)
+    return DataProcessor.clean_series(df[col].astype(str)).tolist()
+
+
+def calculate_boulder_completion(df: pd.DataFrame) -> List[Dict[str, any]]:
+    """Calculate boulder completion information for every athlete"""
+    boulder_scores = [[] for _ in range(len(df))]
+    completed_boulders = np.zeros(len(df), dtype=int)
+    
+    for i in range(1, 5):
+        col_name = f'Boulder {i} Score (0-25)'
+        if col_name in df.columns:
+            scores = df[col_name]
+            as_text = scores.astype(str)
+            done = (scores.notna() & (as_text != '-') & (as_text != '')).to_numpy()
+            completed_boulders += done
+            for entries, score, is_done in zip(boulder_scores, scores.tolist(), done):
+                entries.append(f"B{i}: {score}" if is_done else f"B{i}: -")
+    
+    # Check for worst finish information
+    worst_finish_col = next((
+        col for col in df.columns 
+        if 'worst' in str(col).lower() and 'finish' in str(col).lower()
+    ), None)
+    worst_finishes = column_values(df, worst_finish_col, None) if worst_finish_col else [None] * len(df)
+    
+    boulder_infos = []
+    for scores, completed, worst_finish in zip(boulder_scores, completed_boulders.tolist(), worst_finishes):
+        worst_finish_display = ""
+        if completed == 4 and worst_finish not in ['N/A', '', None] and not pd.isna(worst_finish):
+            worst_finish_clean = DataProcessor.clean_text(str(worst_finish))
+            if worst_finish_clean and worst_finish_clean != '-':
+                worst_finish_display = f" | Worst Finish: {worst_finish_clean}"
+        
+        boulder_infos.append({
+            'boulder_scores': scores,
+            'completed_boulders': completed,
+            'boulder_display': " | ".join(scores) if scores else "No boulder data",
+            'worst_finish_display': worst_finish_display
+        })
+    
+    return boulder_infos
+
+
+def create_strategy_displays(df: pd.DataFrame, boulder_infos: List[Dict], competition_name: str,
+                             scenarios: Optional[pd.DataFrame] = None) -> List[any]:
+    """Create strategy displays for boulder competitions, one per athlete.
+    
+    Uses the locally solved ``scenarios`` when given (every athlete who has started and has
+    boulders left), otherwise the sheet's strategy columns (athletes on their last boulder).
+    """
+    strategy_displays = [""] * len(df)
+    if competition_info(competition_name).round not in ("Semis", "Final"):
+        return strategy_displays
+    
+    if scenarios is not None:
+        strategy_values = {place: scenarios[place].tolist() for place in BoulderScenarios.PLACES}
+        return strategy_display_html(strategy_values, boulder_infos, competition_name,
+                                     lambda info: info['completed_boulders'] > 0, clean=False)
+    
+    strategy_cols = {}
+    for col in df.columns:
+        col_str = str(col)
+        if '1st Place Strategy' in col_str:
+            strategy_cols['1st'] = col
+        elif '2nd Place Strategy' in col_str:
+            strategy_cols['2nd'] = col
+        elif '3rd Place Strategy' in col_str:
+            strategy_cols['3rd'] = col
+        elif 'Points Needed for Top 8' in col_str:
+            strategy_cols['top8'] = col
+    
+    if not strategy_cols:
+        return strategy_displays
+    
+    strategy_values = {place: df[col].tolist() for place, col in strategy_cols.items()}
+    return strategy_display_html(strategy_values, boulder_infos, competition_name,
+                                 lambda info: info['completed_boulders'] == 3, clean=True)
+
+
+def strategy_display_html(strategy_values: Dict[str, List[any]], boulder_infos: List[Dict], competition_name: str,
+                          eligible: Callable[[Dict], bool], clean: bool) -> List[any]:
+    """Format per-place strategy values into each eligible athlete's strategy line"""
+    strategy_displays = [""] * len(boulder_infos)
+    semis = competition_info(competition_name).round == "Semis"
+    comp_type = "Semi" if semis else "Final"
+    
+    for idx, boulder_info in enumerate(boulder_infos):
+        if not eligible(boulder_info):
+            continue
+        
+        strategies = []
+        has_impossible_top8 = False
+        
+        for place, values in strategy_values.items():
+            strategy_value = values[idx]
+            if strategy_value and str(strategy_value) not in ['', 'nan', 'N/A']:
+                strategy_clean = DataProcessor.clean_text(str(strategy_value)) if clean else str(strategy_value)
+                if strategy_clean:
+                    if place == '1st':
+                        strategies.append(f"🥇 1st: {strategy_clean}")
+                    elif place == '2nd':
+                        strategies.append(f"🥈 2nd: {strategy_clean}")
+                    elif place == '3rd':
+                        strategies.append(f"🥉 3rd: {strategy_clean}")
+                    elif place == 'top8' and semis:
+                        strategies.append(f"🎯 Top 8: {strategy_clean}")
+                        if "IMPOSSIBLE" in strategy_clean.upper():
+                            has_impossible_top8 = True
+        
+        if strategies:
+            strategy_display = f"<br><div class='targets'><strong>{comp_type} Strategy:</strong> {' | '.join(strategies)}</div>"
+            
+            if has_impossible_top8 and semis:
+                strategy_displays[idx] = (strategy_display, "eliminated")
+            else:
+                strategy_displays[idx] = strategy_display
+    
+    return strategy_displays
+
+
+def build_athlete_card(key: str, position_emoji: str, athlete: str, rank: any, total_score: any, 
+                       boulder_info: Dict, strategy_display: str, card_class: str) -> CardState:
+    """Build the card state and HTML for one boulder athlete"""
+    completed_boulders = boulder_info['completed_boulders']
+    boulder_display = boulder_info['boulder_display']
+    worst_finish_display = boulder_info['worst_finish_display']
+    
+    # Ensure card_class is never empty
+    if not card_class or card_class.strip() == "":
+        card_class = "awaiting-result"
+    
+    # Check if strategy display indicates impossible Top 8
+    if isinstance(strategy_display, tuple):
+        strategy_display, override_class = strategy_display
+        if override_class == "eliminated":
+            card_class = "eliminated"
+            position_emoji = "❌"
+    
+    # Create detail text based on completion status
+    if completed_boulders == 4:
+        detail_text = f"Total: {total_score} | {boulder_display}{worst_finish_display}"
+    elif completed_boulders == 3:
+        detail_text = f"Total: {total_score} | {boulder_display} | 1 boulder remaining"
+    else:
+        detail_text = f"Total: {total_score} | {boulder_display} | Progress: {completed_boulders}/4"
+    
+    # No blank lines: the cards of a competition are emitted together as one raw HTML block
+    html = (
+        f'<div class="athlete-row {card_class}">\n'
+        f'    <strong>{position_emoji} - {athlete}</strong><br>\n'
+        f'    <small>{detail_text}</small>{strategy_display}\n'
+        f'</div>'
+    )
+    
+    return CardState(key=key, rank=rank, score=total_score, status=card_class,
+                     strategy=strategy_display, detail=detail_text, html=html)
+
+
+LEAD_THRESHOLD_COLUMNS = ['Hold for 1st', 'Hold for 2nd', 'Hold for 3rd', 'Hold to Qualify', 'Min to Qualify']
+LEAD_QUALIFY_COLUMNS = ['Hold to Qualify', 'Min to Qualify']
+
+
+def extract_qualification_info(df: pd.DataFrame) -> Dict[str, str]:
+    """Extract qualification threshold information from dataframe"""
+    qualification_info = {}
+    try:
+        named = df['Name'].notna() & (df['Name'] != '') if 'Name' in df.columns else pd.Series(False, index=df.index)
+        for col in LEAD_THRESHOLD_COLUMNS:
+            if col not in df.columns:
+                continue
+            # The last named row that fills the column wins
+            values = df.loc[named, col].dropna()
+            if not values.empty:
+                qualification_info[col] = DataProcessor.clean_text(str(values.iloc[-1]))
+    except Exception as e:
+        logger.warning(f"Error extracting qualification thresholds: {e}")
+    return qualification_info
+
+
+def filter_active_athletes(df: pd.DataFrame, competition_name: str) -> pd.DataFrame:
+    """Filter out reference rows to get only active athletes"""
+    competition = competition_info(competition_name)
+    lead_semis = competition.discipline == "Lead" and competition.round == "Semis"
+    try:
+        active_df = df[
+            df['Name'].notna() & 
+            (df['Name'] != '') & 
+            (~df['Name'].astype(str).str.isdigit()) &
+            (~df['Name'].astype(str).str.contains('Hold for', na=False)) &
+            (~df['Name'].astype(str).str.contains('Min to', na=False)) &
+            (~df['Name'].astype(str).str.contains('TBD|TBA|Qualification|Threshold|Zone|Top', na=False, case=False)) &
+            (~df['Name'].astype(str).str.startswith(('Hold', 'Min', '#'), na=False)) &
+            (~df['Name'].apply(is_placeholder_athlete))
+        ]
+        
+        # Set expected athlete counts based on competition type
+        if lead_semis:
+            expected_max = 24
+        elif competition.discipline == "Boulder" and competition.round == "Semis":
+            expected_max = 20
+        elif competition.round == "Final":
+            expected_max = 8
+        else:
+            expected_max = 999
+        
+        if lead_semis:
+            if len(active_df) >= 24:
+                active_df = active_df.head(24)
+                logger.info(f"{competition_name}: Using first 24 athletes")
+            else:
+                logger.warning(f"{competition_name}: Only found {len(active_df)} athletes, expected 24")
+        
+        elif expected_max < 999 and len(active_df) > expected_max and 'Current Rank' in active_df.columns:
+            active_df['temp_rank'] = pd.to_numeric(active_df['Current Rank'], errors='coerce')
+            
+            rank_filtered = active_df[
+                (active_df['temp_rank'].notna()) & 
+                (active_df['temp_rank'] >= 1) & 
+                (active_df['temp_rank'] <= expected_max)
+            ]
+            
+            if len(rank_filtered) == expected_max:
+                active_df = rank_filtered.drop('temp_rank', axis=1)
+            else:
+                active_df = active_df.drop('temp_rank', axis=1).head(expected_max)
+        
+        elif expected_max < 999 and len(active_df) > expected_max:
+            active_df = active_df.head(expected_max)
+        
+        return active_df
+        
+    except Exception as e:
+        logger.error(f"Error filtering athletes: {e}")
+        fallback_df = df[
+            df['Name'].notna() & 
+            (df['Name'] != '') &
+            (~df['Name'].astype(str).str.contains('Hold for', na=False))
+        ]
+        
+        if lead_semis:
+            fallback_df = fallback_df.head(24)
+        elif competition.round == "Final":
+            fallback_df = fallback_df.head(8)
+            
+        return fallback_df
+
+
+def is_placeholder_athlete(name: str) -> bool:
+    """Check if name is a placeholder like 'Athlete 1', 'Athlete 23', etc."""
+    name_str = str(name).strip()
+    if name_str.startswith('Athlete '):
+        remaining = name_str[8:].strip()
+        return remaining.isdigit()
+    return False
+
+
+def build_lead_cards_html(active_df: pd.DataFrame, qualification_info: Dict[str, str]) -> str:
+    """Build the HTML for every lead athlete card"""
+    return "\n".join(card.html for card in build_lead_cards(active_df, qualification_info))
+
+
+def build_lead_cards(active_df: pd.DataFrame, qualification_info: Dict[str, str]) -> List[CardState]:
+    """Build the card state of every lead athlete from column arrays"""
+    names = cleaned_column_values(active_df, 'Name', 'Unknown')
+    scores = column_values(active_df, 'Manual Score', 'N/A')
+    codes = column_values(active_df, LeadScoring.CODE_COLUMN, None)
+    ranks = column_values(active_df, 'Current Rank', 'N/A')
+    statuses = cleaned_column_values(active_df, 'Status', 'Unknown')
+    worst_finishes = column_values(active_df, 'Worst Finish', 'N/A')
+    
+    # Targets only depend on whether the athlete has a score
+    threshold_displays = {
+        has_score: create_threshold_display(has_score, qualification_info) for has_score in (True, False)
+    }
+    
+    cards = []
+    for key, name, score, code, rank, status, worst_finish in zip(
+        athlete_keys(names), names, scores, codes, ranks, statuses, worst_finishes
+    ):
+        has_score = score not in ['N/A', '', None] and not pd.isna(score)
+        
+        threshold_display = threshold_displays[has_score]
+        
+        card_class, status_emoji = determine_lead_athlete_status(status, has_score)
+        
+        position_emoji = get_lead_position_emoji(rank, has_score, card_class, status_emoji)
+        
+        # The cleaned score text has lost the "+" of a plus-hold; the hold code keeps it
+        if has_score and code is not None and not pd.isna(code):
+            score = LeadScoring.format(code)
+        score_display = score if has_score else "Awaiting Result"
+        worst_finish_display = format_worst_finish(worst_finish, has_score)
+        
+        detail_text = f"Score: {score_display} | Status: {status}{worst_finish_display}"
+        
+        # No blank lines: the cards of a competition are emitted together as one raw HTML block
+        html = (
+            f'<div class="athlete-row {card_class}">\n'
+            f'    <strong>{position_emoji} #{rank} - {name}</strong><br>\n'
+            f'    <small>{detail_text}</small>{threshold_display}\n'
+            f'</div>'
+        )
+        cards.append(CardState(key=key, rank=rank, score=score, status=card_class,
+                               strategy=threshold_display, detail=detail_text, html=html))
+    
+    return cards
+
+
+def create_threshold_display(has_score: bool, qualification_info: Dict[str, str]) -> str:
+    """Create threshold display for athletes without scores"""
+    if has_score or not qualification_info:
+        return ""
+    
+    thresholds = []
+    for key, value in qualification_info.items():
+        if key == 'Hold for 1st':
+            thresholds.append(f'🥇 For 1st Hold: {value}')
+        elif key == 'Hold for 2nd':
+            thresholds.append(f'🥈 For 2nd Hold: {value}')
+        elif key == 'Hold for 3rd':
+            thresholds.append(f'🥉 For 3rd Hold: {value}')
+        elif key == 'Hold to Qualify':
+            thresholds.append(f'🎯 For 8th Hold: {value}')
+        elif key == 'Min to Qualify':
+            thresholds.append(f'📊 For 8th Points: {value}')
+    
+    if thresholds:
+        return f"<br><div class='targets'><strong>Targets:</strong><br>{' | '.join(thresholds)}</div>"
+    return ""
+
+
+def get_lead_position_emoji(rank: any, has_score: bool, card_class: str, status_emoji: str) -> str:
+    """Get position emoji for lead athletes"""
+    rank_num = DataProcessor.safe_numeric_conversion(rank)
+    if rank_num > 0:
+        return status_emoji if has_score and card_class else f"#{rank_num}"
+    return "📄"
+
+
+def format_worst_finish(worst_finish: any, has_score: bool) -> str:
+    """Format worst finish display"""
+    if not has_score or worst_finish in ['N/A', '', None] or pd.isna(worst_finish):
+        return ""
+    
+    worst_finish_clean = DataProcessor.clean_text(str(worst_finish))
+    return f" | Worst Finish: {worst_finish_clean}" if worst_finish_clean and worst_finish_clean != '-' else ""
@@ -1,40 +1,29 @@
 import streamlit as st
+from streamlit.errors import StreamlitAPIException
 import pandas as pd
-import requests
-from io import StringIO
 import time
 from datetime import datetime, timedelta
 import logging
-import re
-import os
-import unicodedata
-from typing import Dict, Tuple, List, Optional, Any, Callable
-import hashlib
+from typing import Dict, Tuple, List, Optional
 import hmac
-from collections import defaultdict, deque
-from functools import wraps
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import numpy as np
-from scipy import stats
-from concurrent.futures import ThreadPoolExecutor
-import json
+import threading
+import sqlite3
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from ifsc_core import (
+    METRICS, CardState, CompetitionSnapshot, Config, DataLoader, HttpSession, PodiumSimulation,
+    ReplaySource, SheetResult, StandingsDiff, competition_info, diff_standings, get_event_registry,
+    get_sheet_poller, get_snapshot_history, snapshot_for,
+)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Configure the page
-st.set_page_config(
-    page_title="🧗‍♂️ IFSC 2025 World Championships",
-    page_icon="🧗‍♂️",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
 
 # Enhanced CSS with better mobile responsiveness
-st.markdown("""
+PAGE_CSS = """
 <style>
     /* Main header styling */
     .main-header {
@@ -128,6 +117,16 @@ st.markdown("""
         color: #495057 !important;
     }
     
+    /* Cards that changed in the latest refresh */
+    .athlete-row.recently-updated {
+        animation: cardUpdated 1.5s ease-out;
+    }
+    
+    @keyframes cardUpdated {
+        from { box-shadow: 0 0 0 4px rgba(33, 150, 243, 0.7); }
+        to { box-shadow: 0 3px 8px rgba(0,0,0,0.12); }
+    }
+    
     /* Enhanced metric cards */
     .metric-card {
         background: linear-gradient(135deg, white, #f8f9fa);
@@ -257,308 +256,89 @@ st.markdown("""
         }
     }
 </style>
-""", unsafe_allow_html=True)
-
-# Configuration with updated auto-refresh settings
-class Config:
-    CACHE_TTL = 2  # Reduced cache time to 2 seconds
-    AUTO_REFRESH_INTERVAL = 2  # Refresh every 2 seconds
-    MAX_RETRIES = 3
-    REQUEST_TIMEOUT = 15
-    MAX_ATHLETES_DISPLAY = 50
-    
-    # Google Sheets URLs
-    SHEETS_URLS = {
-        "Male Boulder Semis": "https://docs.google.com/spreadsheets/d/1MwVp1mBUoFrzRSIIu4UdMcFlXpxHAi_R7ztp1E4Vgx0/export?format=csv&gid=911620167",
-        "Female Boulder Semis": "https://docs.google.com/spreadsheets/d/1MwVp1mBUoFrzRSIIu4UdMcFlXpxHAi_R7ztp1E4Vgx0/export?format=csv&gid=920221506",
-        "Male Boulder Final": "https://docs.google.com/spreadsheets/d/1MwVp1mBUoFrzRSIIu4UdMcFlXpxHAi_R7ztp1E4Vgx0/export?format=csv&gid=1415967322",
-        "Female Boulder Final": "https://docs.google.com/spreadsheets/d/1MwVp1mBUoFrzRSIIu4UdMcFlXpxHAi_R7ztp1E4Vgx0/export?format=csv&gid=299577805",
-        "Male Lead Semis": "https://docs.google.com/spreadsheets/d/1MwVp1mBUoFrzRSIIu4UdMcFlXpxHAi_R7ztp1E4Vgx0/export?format=csv&gid=0",
-        "Female Lead Semis": "https://docs.google.com/spreadsheets/d/1MwVp1mBUoFrzRSIIu4UdMcFlXpxHAi_R7ztp1E4Vgx0/export?format=csv&gid=352924417",
-        "Male Lead Final": "https://docs.google.com/spreadsheets/d/1MwVp1mBUoFrzRSIIu4UdMcFlXpxHAi_R7ztp1E4Vgx0/export?format=csv&gid=1091240908",
-        "Female Lead Final": "https://docs.google.com/spreadsheets/d/1MwVp1mBUoFrzRSIIu4UdMcFlXpxHAi_R7ztp1E4Vgx0/export?format=csv&gid=528108640"
-    }
-
-class DataProcessor:
-    """Enhanced data processing utilities"""
-    
-    @staticmethod
-    def safe_numeric_conversion(value, default=0) -> float:
-        """Safely convert value to numeric with proper error handling"""
-        try:
-            if pd.isna(value) or value == '' or value is None:
-                return default
-            return pd.to_numeric(value, errors='coerce')
-        except Exception as e:
-            logger.warning(f"Error converting {value} to numeric: {e}")
-            return default
-
-    @staticmethod
-    def clean_text(text) -> str:
-        """Enhanced text cleaning with better Unicode handling"""
-        if not isinstance(text, str):
-            return str(text) if text is not None else ""
-        
+"""
+
+
+def configure_page():
+    """Set the page config and inject the CSS; called when Streamlit runs the script, not on import"""
+    st.set_page_config(
+        page_title="🧗‍♂️ IFSC 2025 World Championships",
+        page_icon="🧗‍♂️",
+        layout="wide",
+        initial_sidebar_state="expanded"
+    )
+    st.markdown(PAGE_CSS, unsafe_allow_html=True)
+
+
+@st.cache_resource(show_spinner=False, ttl=600)
+def get_boulder_outcomes() -> Tuple[np.ndarray, np.ndarray]:
+    """Boulder outcome distribution fitted from the latest recorded body of every boulder round"""
+    history = get_snapshot_history()
+    frames = []
+    if history is not None:
         try:
-            # Better Unicode handling
-            cleaned = text.encode('utf-8', 'ignore').decode('utf-8')
-            
-            # Remove common problematic characters and encoding artifacts
-            cleaned = cleaned.replace('â', '')  # Remove the specific problematic character
-            cleaned = cleaned.replace('Â', '')  # Remove capital version too
-            
-            # Remove other common encoding artifacts
-            cleaned = re.sub(r'[^\w\s\-\.\,\(\)]+', '', cleaned)
-            
-            # Remove extra whitespace
-            cleaned = ' '.join(cleaned.split())
-            
-            return cleaned.strip()
-        except Exception as e:
-            logger.warning(f"Error cleaning text '{text}': {e}")
-            return str(text) if text is not None else ""
-        
-    @staticmethod
-    def validate_dataframe(df: pd.DataFrame, expected_columns: List[str]) -> Tuple[bool, List[str]]:
-        """Enhanced DataFrame validation"""
-        if df.empty:
-            return False, ["DataFrame is empty"]
-        
-        issues = []
-        missing_cols = [col for col in expected_columns if col not in df.columns]
-        
-        if missing_cols:
-            issues.append(f"Missing columns: {', '.join(missing_cols)}")
-        
-        # Check for minimum data requirements
-        if len(df) < 1:
-            issues.append("Insufficient data rows")
-        
-        return len(issues) == 0, issues
-
-class CompetitionStatusDetector:
-    """Enhanced competition status detection"""
-    
-    @staticmethod
-    def get_competition_status(df: pd.DataFrame, competition_name: str) -> Tuple[str, str]:
-        """Determine competition status with improved logic"""
-        if df.empty:
-            return "upcoming", "📄"
-        
-        try:
-            if "Boulder" in competition_name:
-                return CompetitionStatusDetector._get_boulder_status(df)
-            elif "Lead" in competition_name:
-                return CompetitionStatusDetector._get_lead_status(df)
-        except Exception as e:
-            logger.warning(f"Error determining status for {competition_name}: {e}")
-        
-        return "upcoming", "📄"
-    
-    @staticmethod
-    def _get_boulder_status(df: pd.DataFrame) -> Tuple[str, str]:
-        """Determine boulder competition status"""
-        score_cols = [col for col in df.columns if 'Score' in str(col)]
-        if not score_cols:
-            return "upcoming", "📄"
-        
-        has_scores = df[score_cols].notna().any().any()
-        if not has_scores:
-            return "upcoming", "📄"
-        
-        total_athletes = len(df[df.iloc[:, 0].notna() & (df.iloc[:, 0] != '')])
-        completed_athletes = len(df[df[score_cols].notna().any(axis=1)])
-        
-        completion_rate = completed_athletes / max(total_athletes, 1)
-        
-        if completion_rate >= 0.9:
-            return "completed", "✅"
-        elif completion_rate >= 0.1:
-            return "live", "🔴"
-        else:
-            return "upcoming", "📄"
-    
-    @staticmethod
-    def _get_lead_status(df: pd.DataFrame) -> Tuple[str, str]:
-        """Determine lead competition status"""
-        if 'Manual Score' not in df.columns:
-            return "upcoming", "📄"
-        
-        has_scores = df['Manual Score'].notna().any()
-        if not has_scores:
-            return "upcoming", "📄"
-        
-        total_athletes = len(df[df['Name'].notna() & (df['Name'] != '')])
-        completed_athletes = len(df[df['Manual Score'].notna()])
-        
-        completion_rate = completed_athletes / max(total_athletes, 1)
-        
-        if completion_rate >= 0.9:
-            return "completed", "✅"
-        elif completion_rate >= 0.1:
-            return "live", "🔴"
-        else:
-            return "upcoming", "📄"
-
-class DataLoader:
-    """Enhanced data loading with better error handling and caching"""
-    
-    @staticmethod
-    @st.cache_data(ttl=Config.CACHE_TTL, show_spinner=False)
-    def load_sheet_data(url: str, retries: int = 0) -> pd.DataFrame:
-        """Load data from Google Sheets with enhanced error handling"""
-        try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-                'Accept': 'text/csv,text/plain,*/*',
-                'Accept-Encoding': 'gzip, deflate',
-                'Connection': 'keep-alive'
-            }
-            
-            response = requests.get(
-                url, 
-                timeout=Config.REQUEST_TIMEOUT,
-                headers=headers,
-                stream=True
-            )
-            response.raise_for_status()
-            
-            # Read CSV data with better encoding handling
-            csv_data = StringIO(response.text)
-            df = pd.read_csv(csv_data, encoding='utf-8', low_memory=False)
-            
-            # Enhanced data cleaning
-            df = DataLoader._clean_dataframe(df)
-            
-            logger.info(f"Successfully loaded data: {len(df)} rows, {len(df.columns)} columns")
-            return df
-            
-        except requests.RequestException as e:
-            error_msg = f"Network error: {str(e)}"
-            logger.error(error_msg)
-            
-            if retries < Config.MAX_RETRIES:
-                logger.info(f"Retrying... attempt {retries + 1}")
-                time.sleep(2 ** retries)
-                return DataLoader.load_sheet_data(url, retries + 1)
-            
-            st.error(f"🚫 {error_msg}")
-            return pd.DataFrame()
-            
-        except Exception as e:
-            error_msg = f"Unexpected error: {str(e)}"
-            logger.error(error_msg)
-            st.error(f"🚫 {error_msg}")
-            return pd.DataFrame()
-    
-    @staticmethod
-    def _clean_dataframe(df: pd.DataFrame) -> pd.DataFrame:
-        """Enhanced DataFrame cleaning"""
-        # Remove completely empty rows
-        df = df.dropna(how='all')
-        
-        # Clean column names
-        df.columns = df.columns.str.strip()
-        
-        # Remove unnamed columns
-        unnamed_cols = [col for col in df.columns if str(col).startswith('Unnamed')]
-        df = df.drop(columns=unnamed_cols, errors='ignore')
-        
-        # Clean text data
-        for col in df.columns:
-            if df[col].dtype == 'object':
-                df[col] = df[col].apply(DataProcessor.clean_text)
-        
-        return df
+            for name in history.competitions():
+                if competition_info(name).discipline != "Boulder":
+                    continue
+                timeline = history.timeline(name)
+                body = history.body(timeline[-1][1]) if timeline else None
+                if body is not None:
+                    frames.append(DataLoader.parse_body(body.decode('utf-8')))
+        except (sqlite3.Error, ValueError) as e:
+            logger.warning(f"Could not fit boulder outcomes from history: {e}")
+    return PodiumSimulation.fit(frames)
+
+
+@st.cache_resource(show_spinner=False, ttl=60)
+def get_replay_source() -> Optional[ReplaySource]:
+    """Return the recorded timelines of every competition, reloaded at most once a minute.
+    
+    Only reads what the history's writer thread has already committed; snapshots still
+    queued show up on a later reload."""
+    history = get_snapshot_history()
+    if history is None:
+        return None
+    source = ReplaySource(history, list(get_event_registry().sources))
+    return source if source.competitions else None
+
+
+class MetricsRequestHandler(BaseHTTPRequestHandler):
+    """Serves ``METRICS`` in the Prometheus text format at ``/metrics``"""
+    
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = METRICS.to_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        pass
+
+
+@st.cache_resource(show_spinner=False)
+def start_metrics_endpoint(port: int) -> Optional[ThreadingHTTPServer]:
+    """Serve the Prometheus export on localhost:``port`` from a daemon thread, once per process"""
+    try:
+        server = ThreadingHTTPServer(("127.0.0.1", port), MetricsRequestHandler)
+    except OSError as e:
+        logger.warning(f"Metrics endpoint not started on port {port}: {e}")
+        return None
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-endpoint", daemon=True).start()
+    return server
 
-class MetricsCalculator:
-    """Enhanced metrics calculation"""
-    
-    @staticmethod
-    def calculate_boulder_metrics(df: pd.DataFrame) -> Dict[str, any]:
-        """Calculate boulder competition metrics"""
-        try:
-            total_athletes = len(df[df['Athlete Name'].notna() & (df['Athlete Name'] != '')])
-            
-            boulder_cols = [col for col in df.columns if 'Boulder' in str(col) and 'Score' in str(col)]
-            completed_problems = sum(df[col].notna().sum() for col in boulder_cols) if boulder_cols else 0
-            
-            # Find total score column
-            score_col = next((col for col in df.columns if 'Total Score' in str(col)), None)
-            
-            avg_score = 0
-            if score_col:
-                numeric_scores = pd.to_numeric(df[score_col], errors='coerce')
-                avg_score = numeric_scores.mean() if not numeric_scores.isna().all() else 0
-            
-            # Find leader
-            leader = "TBD"
-            if 'Current Position/Rank' in df.columns:
-                try:
-                    leader_mask = pd.to_numeric(df['Current Position/Rank'], errors='coerce') == 1
-                    if leader_mask.any():
-                        leader = DataProcessor.clean_text(df.loc[leader_mask, 'Athlete Name'].iloc[0])
-                except:
-                    pass
-            
-            return {
-                'total_athletes': total_athletes,
-                'completed_problems': completed_problems,
-                'avg_score': avg_score,
-                'leader': leader
-            }
-        except Exception as e:
-            logger.error(f"Error calculating boulder metrics: {e}")
-            return {'total_athletes': 0, 'completed_problems': 0, 'avg_score': 0, 'leader': 'TBD'}
-    
-    @staticmethod
-    def calculate_lead_metrics(df: pd.DataFrame) -> Dict[str, any]:
-        """Calculate lead competition metrics"""
-        try:
-            # Filter active athletes
-            active_df = df[
-                df['Name'].notna() & 
-                (df['Name'] != '') & 
-                (~df['Name'].astype(str).str.contains('Hold for', na=False)) &
-                (~df['Name'].astype(str).str.contains('Min to', na=False))
-            ]
-            
-            total_athletes = len(active_df)
-            completed = len(active_df[active_df['Manual Score'].notna() & (active_df['Manual Score'] != '')])
-            
-            # Calculate average score
-            avg_score = 0
-            if 'Manual Score' in active_df.columns:
-                scores = pd.to_numeric(active_df['Manual Score'], errors='coerce')
-                avg_score = scores.mean() if not scores.isna().all() else 0
-            
-            # Find leader
-            leader = "TBD"
-            if 'Current Rank' in active_df.columns:
-                try:
-                    leader_idx = pd.to_numeric(active_df['Current Rank'], errors='coerce') == 1
-                    if leader_idx.any():
-                        leader = DataProcessor.clean_text(active_df.loc[leader_idx, 'Name'].iloc[0])
-                except:
-                    pass
-            
-            return {
-                'total_athletes': total_athletes,
-                'completed': completed,
-                'avg_score': avg_score,
-                'leader': leader
-            }
-        except Exception as e:
-            logger.error(f"Error calculating lead metrics: {e}")
-            return {'total_athletes': 0, 'completed': 0, 'avg_score': 0, 'leader': 'TBD'}
 
-def display_enhanced_metrics(df: pd.DataFrame, competition_name: str):
+def display_enhanced_metrics(metrics: Dict[str, any], competition_name: str):
     """Display enhanced metrics with progress indicators"""
     col1, col2, col3, col4 = st.columns(4)
+    discipline = competition_info(competition_name).discipline
     
-    if "Boulder" in competition_name:
-        metrics = MetricsCalculator.calculate_boulder_metrics(df)
-        
+    if discipline == "Boulder":
         with col1:
             st.markdown(f'''
             <div class="metric-card">
@@ -591,9 +371,7 @@ def display_enhanced_metrics(df: pd.DataFrame, competition_name: str):
             </div>
             ''', unsafe_allow_html=True)
     
-    elif "Lead" in competition_name:
-        metrics = MetricsCalculator.calculate_lead_metrics(df)
-        
+    elif discipline == "Lead":
         with col1:
             st.markdown(f'''
             <div class="metric-card">
@@ -630,141 +408,21 @@ def display_enhanced_metrics(df: pd.DataFrame, competition_name: str):
             </div>
             ''', unsafe_allow_html=True)
 
-def determine_athlete_status(rank: any, total_score: any, boulder_info: Dict, competition_name: str, row: pd.Series = None) -> Tuple[str, str]:
-    """Determine athlete status and appropriate styling - FIXED"""
-    try:
-        rank_num = DataProcessor.safe_numeric_conversion(rank)
-        completed_boulders = boulder_info['completed_boulders']
-        worst_finish_display = boulder_info['worst_finish_display']
-        
-        # If no valid rank, return gray
-        if rank_num <= 0:
-            return "awaiting-result", "⏳"
-        
-        # BOULDER FINALS - Check if all podium positions are impossible
-        if "Boulder" in competition_name and "Final" in competition_name:
-            # Check if all podium positions are impossible (regardless of completion status)
-            if row is not None and check_all_podium_impossible(row):
-                return "no-podium", "❌"  # RED - All podium positions impossible
-            
-            if completed_boulders < 4:
-                # Still competing - yellow for everyone (unless impossible above)
-                return "podium-contention", "⚠️"
-            else:
-                # All 4 boulders completed - check rank AND worst finish for podium
-                if rank_num <= 3:
-                    # Extract worst finish number from the display string
-                    worst_finish_num = extract_worst_finish_number(boulder_info)
-                    if worst_finish_num is not None and worst_finish_num <= 3:
-                        return "podium-position", "🏆"  # GREEN - Top 3 with worst finish 1, 2, or 3
-                    else:
-                        return "podium-contention", "⚠️"  # YELLOW - Top 3 but worst finish > 3
-                else:
-                    return "no-podium", "❌"  # RED - Not in top 3
-        
-        # BOULDER SEMIS - Check worst finish
-        elif "Boulder" in competition_name and "Semis" in competition_name:
-            if completed_boulders < 4:
-                # Still competing - yellow for everyone
-                return "podium-contention", "⚠️"
-            else:
-                # All 4 boulders completed - check rank AND worst finish
-                if rank_num <= 8:
-                    # Extract worst finish number from the display string
-                    worst_finish_num = extract_worst_finish_number(boulder_info)
-                    if worst_finish_num is not None and worst_finish_num < 8:
-                        return "qualified", "✅"  # GREEN - Top 8 with good worst finish
-                    else:
-                        return "podium-contention", "⚠️"  # YELLOW - Top 8 but bad worst finish
-                else:
-                    return "eliminated", "❌"  # RED - Not in top 8
-        
-        # Default for all other cases
-        else:
-            if rank_num <= 3:
-                return "podium-position", "🏆"  # GREEN
-            elif rank_num <= 8:
-                return "qualified", "✅"  # GREEN
-            else:
-                return "eliminated", "❌"  # RED
-            
-    except Exception as e:
-        logger.warning(f"Error: {e}")
-        return "awaiting-result", "⏳"
-
-
-def extract_worst_finish_number(boulder_info: Dict) -> Optional[int]:
-    """Extract the worst finish number from boulder info"""
-    try:
-        worst_finish_display = boulder_info.get('worst_finish_display', '')
-        if worst_finish_display:
-            # Look for patterns like "Worst Finish: 9.0" or "Worst Finish: 7"
-            import re
-            match = re.search(r'Worst Finish:\s*(\d+(?:\.\d+)?)', worst_finish_display)
-            if match:
-                return int(float(match.group(1)))
-    except Exception as e:
-        logger.warning(f"Error extracting worst finish number: {e}")
-    return None
-
-def check_all_podium_impossible(row: pd.Series) -> bool:
-    """Check if all podium positions (1st, 2nd, 3rd) are impossible - ONLY for finals"""
-    try:
-        strategy_cols = ['1st Place Strategy', '2nd Place Strategy', '3rd Place Strategy']
-        impossible_count = 0
-        
-        for col in strategy_cols:
-            if col in row.index:
-                strategy_value = row.get(col, '')
-                if strategy_value and str(strategy_value) not in ['', 'nan', 'N/A']:
-                    strategy_clean = str(strategy_value).upper()
-                    if "IMPOSSIBLE" in strategy_clean:
-                        impossible_count += 1
-        
-        # Return True if all three positions are impossible
-        return impossible_count == 3
-        
-    except Exception as e:
-        logger.warning(f"Error checking impossible podium positions: {e}")
-        return False
-    
-def determine_lead_athlete_status(status: str, has_score: bool) -> Tuple[str, str]:
-    """Determine lead athlete status - FIXED"""
-    if not has_score:
-        return "awaiting-result", "🔄"
-    
-    status_lower = str(status).lower()
-    
-    if "qualified" in status_lower and "contention" not in status_lower:
-        return "qualified", "✅"
-    elif "eliminated" in status_lower:
-        return "eliminated", "❌"
-    elif "podium" in status_lower and "no podium" not in status_lower and "contention" not in status_lower:
-        return "podium-position", "🏆"
-    elif "contention" in status_lower or "podium contention" in status_lower:
-        return "podium-contention", "⚠️"  # YELLOW for podium contention
-    elif "no podium" in status_lower:
-        return "no-podium", "❌"
-    else:
-        return "podium-contention", "📊"
-
 def main():
-    """Enhanced main application function with forced auto-refresh"""
+    """Enhanced main application function with fragment-based auto-refresh"""
     
     # Initialize session state
     if 'last_refresh' not in st.session_state:
         st.session_state.last_refresh = datetime.now()
     if 'auto_refresh_enabled' not in st.session_state:
         st.session_state.auto_refresh_enabled = True  # Always enabled
-    if 'selected_competitions' not in st.session_state:
-        st.session_state.selected_competitions = []
     
     # Enhanced header
-    st.markdown("""
+    st.markdown(f"""
     <div class="main-header">
         <h1>🧗‍♂️ IFSC 2025 World Championships</h1>
         <h3>Live Competition Results Dashboard</h3>
-        <p style="margin: 0; opacity: 0.9;">Real-time climbing competition tracking - Auto-refreshing every 2 seconds</p>
+        <p style="margin: 0; opacity: 0.9;">Real-time climbing competition tracking - Auto-refreshing every {Config.REFRESH_INTERVALS["results"]} seconds</p>
     </div>
     """, unsafe_allow_html=True)
     
@@ -773,12 +431,12 @@ def main():
     
     # Auto-refresh section - ALWAYS ENABLED
     with st.sidebar.expander("🔄 Refresh Settings", expanded=True):
-        st.markdown("**Auto-refresh is ALWAYS ON - Every 2 seconds**")
+        st.markdown(f"**Auto-refresh is ALWAYS ON - Every {Config.REFRESH_INTERVALS['results']} seconds**")
         
         col1, col2 = st.columns(2)
         with col1:
             if st.button("🔄 Manual Refresh", type="primary", use_container_width=True):
-                st.cache_data.clear()
+                get_sheet_poller().refresh_now()
                 st.session_state.last_refresh = datetime.now()
                 st.success("✅ Refreshed!")
                 time.sleep(0.5)
@@ -789,13 +447,18 @@ def main():
                 st.cache_data.clear()
                 st.success("✅ Cache cleared!")
         
-        # Show refresh status
-        time_since = (datetime.now() - st.session_state.last_refresh).seconds
-        st.caption(f"🕒 Last refresh: {time_since}s ago")
-        st.caption("⚡ Next refresh in: " + str(2 - (time_since % 2)) + "s")
+        # Show refresh status; the sidebar itself only reruns on interaction
+        st.caption(f"🕒 Last manual refresh: {st.session_state.last_refresh.strftime('%H:%M:%S')}")
+        st.caption(f"⚡ Overview every {Config.REFRESH_INTERVALS['overview']}s, "
+                   f"results every {Config.REFRESH_INTERVALS['results']}s")
     
     # Competition filters
+    registry = get_event_registry()
     with st.sidebar.expander("🎯 Competition Filters", expanded=True):
+        event = None
+        if len(registry.events) > 1:
+            event = st.selectbox("📅 Event", list(registry.events), help="Only the selected event is loaded")
+        
         competition_type = st.selectbox(
             "⛰️ Discipline",
             ["All", "Boulder", "Lead"],
@@ -814,8 +477,15 @@ def main():
             help="Filter by competition round"
         )
     
+    display_replay_controls()
+    
+    if Config.METRICS_PORT:
+        start_metrics_endpoint(Config.METRICS_PORT)
+    if is_admin():
+        display_admin_panel()
+    
     # Filter competitions
-    filtered_competitions = get_filtered_competitions(competition_type, gender_filter, round_filter)
+    filtered_competitions = get_filtered_competitions(competition_type, gender_filter, round_filter, event)
     
     if not filtered_competitions:
         st.markdown("""
@@ -828,7 +498,26 @@ def main():
     
     # Competition overview
     st.markdown("### 🚀 Competition Overview")
+    display_overview(filtered_competitions)
     
+    # Display results
+    st.markdown("### 📊 Live Results")
+    display_live_results(filtered_competitions)
+    
+    # Enhanced footer
+    st.markdown("---")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.markdown("**⛰️ IFSC World Championships 2025**")
+    with col2:
+        st.markdown("**📊 Real-time Results**")
+    with col3:
+        st.markdown(f"**🔄 Auto-refresh: ALWAYS ON ({Config.REFRESH_INTERVALS['results']}s)**")
+
+
+@st.fragment(run_every=Config.REFRESH_INTERVALS["overview"])
+def display_overview(filtered_competitions: Dict[str, str]):
+    """Overview metric cards, refreshed on their own timer without rerunning the page"""
     # Calculate overview metrics with progress
     overview_metrics = calculate_overview_metrics(filtered_competitions)
     
@@ -864,55 +553,209 @@ def main():
             <h2>{overview_metrics["upcoming"]}</h2>
         </div>
         ''', unsafe_allow_html=True)
+
+
+@st.fragment(run_every=Config.REFRESH_INTERVALS["results"])
+def display_live_results(filtered_competitions: Dict[str, str]):
+    """Competition standings, refreshed on their own timer without rerunning the page"""
+    replay_at = advance_replay(list(filtered_competitions)) if replay_enabled() else None
+    started = time.perf_counter()
     
-    # Display results
-    st.markdown("### 📊 Live Results")
+    # Only the selected competition is loaded and rendered; the others just show their status
+    comp_name = select_competition(filtered_competitions, replay_at)
+    display_competition_results(comp_name, filtered_competitions[comp_name], replay_at)
     
-    if len(filtered_competitions) > 1:
-        # Create tabs for multiple competitions
-        tab_names = list(filtered_competitions.keys())
-        tabs = st.tabs(tab_names)
-        
-        for i, (comp_name, url) in enumerate(filtered_competitions.items()):
-            with tabs[i]:
-                display_competition_results(comp_name, url)
-    else:
-        # Single competition view
-        comp_name, url = list(filtered_competitions.items())[0]
-        display_competition_results(comp_name, url)
+    if replay_at is not None:
+        finish_replay_frame(time.perf_counter() - started)
+
+
+def select_competition(filtered_competitions: Dict[str, str], replay_at: Optional[float] = None) -> str:
+    """Competition picker labelled with each competition's status; returns the selected name"""
+    names = list(filtered_competitions)
+    if len(names) == 1:
+        return names[0]
     
-    # Enhanced footer
-    st.markdown("---")
-    col1, col2, col3 = st.columns(3)
-    with col1:
-        st.markdown("**⛰️ IFSC World Championships 2025**")
-    with col2:
-        st.markdown("**📊 Real-time Results**")
-    with col3:
-        st.markdown("**🔄 Auto-refresh: ALWAYS ON (2s)**")
+    if st.session_state.get('active_competition') not in names:
+        st.session_state.active_competition = names[0]
+    statuses = competition_status_emojis(filtered_competitions, replay_at)
+    return st.radio("Competition", names, key="active_competition", horizontal=True,
+                    label_visibility="collapsed", format_func=lambda name: f"{statuses[name]} {name}")
+
+
+def peek_results(filtered_competitions: Dict[str, str], replay_at: Optional[float] = None) -> Dict[str, Optional[SheetResult]]:
+    """Latest result of every competition without fetching; None for live sources nobody has opened"""
+    replay = get_replay_source() if replay_at is not None else None
+    poller = get_sheet_poller() if replay is None else None
+    return {
+        comp_name: replay.result_at(comp_name, replay_at) if replay is not None else poller.peek(url)
+        for comp_name, url in filtered_competitions.items()
+    }
+
+
+def competition_status_emojis(filtered_competitions: Dict[str, str], replay_at: Optional[float] = None) -> Dict[str, str]:
+    """Status emoji of every competition from the already classified snapshots, without fetching.
     
-    # FORCED Auto-refresh logic - ALWAYS ACTIVE
-    time_since_last = (datetime.now() - st.session_state.last_refresh).total_seconds()
-    if time_since_last >= Config.AUTO_REFRESH_INTERVAL:
-        st.session_state.last_refresh = datetime.now()
-        st.cache_data.clear()  # Clear cache on each refresh
-        st.rerun()
+    Live sources that no session has opened yet show ⏳ instead of being opened here.
+    """
+    return {
+        comp_name: snapshot_for(comp_name, result).status_emoji if result is not None else "⏳"
+        for comp_name, result in peek_results(filtered_competitions, replay_at).items()
+    }
+
 
+def replay_enabled() -> bool:
+    """True when this session is replaying recorded timelines instead of following the live sheets"""
+    return bool(st.session_state.get('replay_enabled')) and 'replay_clock' in st.session_state
 
-def get_filtered_competitions(competition_type: str, gender_filter: str, round_filter: str) -> Dict[str, str]:
-    """Get filtered competitions based on user selection"""
+
+def replay_position() -> float:
+    """Current replay timestamp: the last seek plus elapsed wall time scaled by the speed"""
+    clock = st.session_state.replay_clock
+    speed = Config.REPLAY_SPEEDS[st.session_state.get('replay_speed', "1×")]
+    if not clock["playing"] or speed is None:
+        return clock["position"]
+    position = clock["position"] + (time.monotonic() - clock["wall"]) * speed
+    return min(position, clock["end"])
+
+
+def seek_replay(position: float, playing: Optional[bool] = None):
+    """Move the replay clock to ``position`` and restart the throughput counters"""
+    clock = st.session_state.replay_clock
+    clock.update(position=position, wall=time.monotonic(), frames=0, busy=0.0, since=time.monotonic())
+    if playing is not None:
+        clock["playing"] = playing
+
+
+def advance_replay(names: List[str]) -> float:
+    """Replay timestamp for this render; at max speed, step to the next recorded change"""
+    clock = st.session_state.replay_clock
+    if clock["playing"] and Config.REPLAY_SPEEDS[st.session_state.get('replay_speed', "1×")] is None:
+        if clock["frames"] > 0:
+            upcoming = get_replay_source().next_change(clock["position"], names)
+            if upcoming is None:
+                clock["playing"] = False
+            else:
+                clock["position"] = upcoming
+        return clock["position"]
+    
+    position = replay_position()
+    if position >= clock["end"]:
+        clock.update(position=clock["end"], playing=False)
+    return position
+
+
+def finish_replay_frame(elapsed: float):
+    """Count one rendered replay frame, report throughput and keep max speed going"""
+    clock = st.session_state.replay_clock
+    clock["frames"] += 1
+    clock["busy"] += elapsed
+    METRICS.observe("replay_frame", elapsed)
+    
+    wall = max(time.monotonic() - clock["since"], 1e-9)
+    speed = st.session_state.get('replay_speed', "1×")
+    st.caption(f"⏯️ Replay {datetime.fromtimestamp(replay_position()).strftime('%H:%M:%S')} at {speed} - "
+               f"{clock['frames']} frames, {clock['frames'] / wall:.1f} frames/s, "
+               f"{clock['busy'] / clock['frames'] * 1000:.1f} ms per frame")
+    
+    if clock["playing"] and Config.REPLAY_SPEEDS[speed] is None:
+        try:
+            st.rerun(scope="fragment")
+        except StreamlitAPIException:
+            # The first frame renders during a full-page run, where only a full rerun is allowed
+            st.rerun()
+
+
+def display_replay_controls():
+    """Sidebar controls for replaying recorded timelines: toggle, speed, play/pause and scrubber"""
+    source = get_replay_source()
+    if source is None:
+        return
+    
+    start, end = datetime.fromtimestamp(source.start), datetime.fromtimestamp(source.end)
+    
+    def on_toggle():
+        st.session_state.replay_clock = {"position": source.start, "end": source.end, "playing": True,
+                                         "wall": time.monotonic(), "frames": 0, "busy": 0.0,
+                                         "since": time.monotonic()}
+    
+    def on_speed():
+        if 'replay_clock' in st.session_state:
+            seek_replay(replay_position())
+    
+    def on_scrub():
+        seek_replay(st.session_state.replay_seek.timestamp())
+    
+    with st.sidebar.expander("⏯️ Replay", expanded=False):
+        st.toggle("Replay recorded timeline", key="replay_enabled", on_change=on_toggle)
+        if not replay_enabled():
+            st.caption(f"📼 {len(source.competitions)} competitions recorded, "
+                       f"{start.strftime('%d %b %H:%M')} - {end.strftime('%H:%M')}")
+            return
+        
+        st.session_state.replay_clock["end"] = source.end
+        st.radio("Speed", list(Config.REPLAY_SPEEDS), horizontal=True, key="replay_speed", on_change=on_speed)
+        st.slider("Position", min_value=start, max_value=end, value=start, step=timedelta(seconds=1),
+                  format="HH:mm:ss", key="replay_seek", on_change=on_scrub)
+        
+        playing = st.session_state.replay_clock["playing"]
+        if st.button("⏸️ Pause" if playing else "▶️ Play", use_container_width=True):
+            position = replay_position()
+            if not playing and position >= source.end:
+                position = source.start
+            seek_replay(position, playing=not playing)
+            st.rerun()
+
+
+def is_admin() -> bool:
+    """True when the page was opened with ``?admin=`` matching ``Config.ADMIN_TOKEN``"""
+    if not Config.ADMIN_TOKEN:
+        return False
+    return hmac.compare_digest(st.query_params.get("admin", ""), Config.ADMIN_TOKEN)
+
+
+def display_admin_panel():
+    """Sidebar panel with per-stage latency, cache and outbound request metrics"""
+    with st.sidebar.expander("🛠️ Performance", expanded=False):
+        st.markdown("**Stage latency**")
+        st.dataframe(METRICS.stage_summary().round(2), hide_index=True, use_container_width=True)
+        
+        st.markdown("**Caches and requests**")
+        reuse_rate = HttpSession.reuse_rate()
+        st.metric("🔁 Connection reuse", f"{reuse_rate:.0%}" if reuse_rate is not None else "N/A")
+        st.dataframe(METRICS.counter_summary(), hide_index=True, use_container_width=True)
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.download_button("📥 Prometheus", METRICS.to_prometheus(), file_name="ifsc_metrics.prom",
+                               mime="text/plain", use_container_width=True)
+        with col2:
+            if st.button("♻️ Reset", use_container_width=True):
+                METRICS.reset()
+                st.rerun()
+        
+        if Config.METRICS_FILE:
+            st.caption(f"Written to {Config.METRICS_FILE} after every poll")
+        if Config.METRICS_PORT:
+            st.caption(f"Served at http://127.0.0.1:{Config.METRICS_PORT}/metrics")
+
+
+def get_filtered_competitions(competition_type: str, gender_filter: str, round_filter: str,
+                              event: Optional[str] = None) -> Dict[str, str]:
+    """Get filtered competitions of one event based on user selection"""
     filtered_competitions = {}
     
-    for name, url in Config.SHEETS_URLS.items():
+    registry = get_event_registry()
+    for name, url in registry.competitions(event).items():
         include = True
+        competition = registry.info[name]
         
-        if competition_type != "All" and competition_type.lower() not in name.lower():
+        if competition_type != "All" and competition.discipline != competition_type:
             include = False
         
-        if gender_filter != "All" and gender_filter.lower() not in name.lower():
+        if gender_filter != "All" and competition.category != gender_filter:
             include = False
                 
-        if round_filter != "All" and round_filter.lower() not in name.lower():
+        if round_filter != "All" and competition.round != round_filter:
             include = False
         
         if include:
@@ -921,36 +764,54 @@ def get_filtered_competitions(competition_type: str, gender_filter: str, round_f
     return filtered_competitions
 
 
+@METRICS.timed("overview_metrics")
 def calculate_overview_metrics(filtered_competitions: Dict[str, str]) -> Dict[str, int]:
-    """Calculate overview metrics for all competitions"""
+    """Calculate overview metrics for all competitions from the already classified snapshots.
+    
+    Nothing is fetched here; live sources that no session has opened yet count as upcoming.
+    """
     metrics = {"total": 0, "live": 0, "completed": 0, "upcoming": 0}
     
-    for comp_name, url in filtered_competitions.items():
+    replay_at = replay_position() if replay_enabled() and get_replay_source() is not None else None
+    for comp_name, result in peek_results(filtered_competitions, replay_at).items():
+        metrics["total"] += 1
         try:
-            df = DataLoader.load_sheet_data(url)
-            status, _ = CompetitionStatusDetector.get_competition_status(df, comp_name)
-            metrics["total"] += 1
+            status = snapshot_for(comp_name, result).status if result is not None else "upcoming"
             metrics[status] += 1
         except Exception as e:
             logger.warning(f"Error calculating metrics for {comp_name}: {e}")
-            metrics["total"] += 1
             metrics["upcoming"] += 1
     
     return metrics
 
 
-def display_competition_results(comp_name: str, url: str):
-    """Display results for a single competition"""
-    with st.spinner(f"Loading {comp_name}..."):
-        df = DataLoader.load_sheet_data(url)
+def display_competition_results(comp_name: str, url: str, replay_at: Optional[float] = None):
+    """Display results for a single competition, live or as recorded at ``replay_at``"""
+    replay = get_replay_source() if replay_at is not None else None
+    if replay is not None:
+        snapshot, result = replay.load_snapshot(comp_name, replay_at)
+    else:
+        with st.spinner(f"Loading {comp_name}..."):
+            snapshot, result = DataLoader.load_snapshot(comp_name, url)
+    df = result.df
     
-    current_time = datetime.now().strftime("%H:%M:%S")
-    st.caption(f"📡 Last updated: {current_time}")
+    if df.empty and result.error:
+        st.error(f"🚫 {result.error}")
     
-    if "Boulder" in comp_name:
-        display_boulder_results(df, comp_name)
-    elif "Lead" in comp_name:
-        display_lead_results(df, comp_name)
+    age = int(result.age_seconds)
+    if replay is not None:
+        st.caption(f"⏯️ Recorded at {result.fetched_at.strftime('%H:%M:%S')}")
+    else:
+        st.caption(f"📡 Last updated: {result.fetched_at.strftime('%H:%M:%S')} ({age}s ago)")
+    
+    if replay is None and result.is_stale and not df.empty:
+        reason = f" - {result.error}" if result.error else ""
+        st.warning(f"⏱️ Showing the last good data from {age}s ago{reason}. Retrying in the background.")
+    
+    if snapshot.discipline == "Boulder":
+        display_boulder_results(snapshot, result.body_hash)
+    elif snapshot.discipline == "Lead":
+        display_lead_results(snapshot)
     else:
         if not df.empty:
             st.dataframe(df, use_container_width=True, hide_index=True)
@@ -958,337 +819,147 @@ def display_competition_results(comp_name: str, url: str):
             st.markdown('<div class="error-card">⚠️ No data available</div>', unsafe_allow_html=True)
 
 
-def display_boulder_results(df: pd.DataFrame, competition_name: str):
+@METRICS.timed("render_boulder")
+def display_boulder_results(snapshot: CompetitionSnapshot, body_hash: Optional[str] = None):
     """Enhanced boulder competition results display"""
-    status, status_emoji = CompetitionStatusDetector.get_competition_status(df, competition_name)
-    status_class = f"badge-{status}"
+    competition_name = snapshot.name
+    status_class = f"badge-{snapshot.status}"
     
     st.markdown(f"""
     ### 🪨 {competition_name} 
-    <span class="status-badge {status_class}">{status_emoji} {status.upper()}</span>
+    <span class="status-badge {status_class}">{snapshot.status_emoji} {snapshot.status.upper()}</span>
     """, unsafe_allow_html=True)
     
-    if df.empty:
+    if snapshot.df.empty:
         st.markdown('<div class="error-card">⚠️ No data available for this competition</div>', unsafe_allow_html=True)
         return
     
-    # Validate required columns
-    required_cols = ['Athlete Name', 'Current Position/Rank']
-    is_valid, issues = DataProcessor.validate_dataframe(df, required_cols)
-    
-    if not is_valid:
-        st.markdown(f'<div class="error-card">⚠️ Data validation failed: {"; ".join(issues)}</div>', unsafe_allow_html=True)
+    if not snapshot.is_valid:
+        st.markdown(f'<div class="error-card">⚠️ Data validation failed: {"; ".join(snapshot.issues)}</div>', unsafe_allow_html=True)
         with st.expander("🔍 Raw Data"):
-            st.dataframe(df, use_container_width=True, hide_index=True)
+            st.dataframe(snapshot.df, use_container_width=True, hide_index=True)
         return
     
     # Display enhanced metrics
-    display_enhanced_metrics(df, competition_name)
-    
-    st.markdown("#### 📋 Current Standings")
+    display_enhanced_metrics(snapshot.metrics, competition_name)
     
-    # Find the total score column
-    score_col = next((col for col in df.columns if 'Total Score' in str(col)), None)
+    if not snapshot.score_disagreements.empty:
+        display_score_disagreements(snapshot.score_disagreements)
     
-    # Sort and prepare data
-    df_sorted = df.copy()
+    if body_hash is not None:
+        display_podium_probabilities(snapshot, body_hash)
     
-    # Convert rank to numeric
-    if 'Current Position/Rank' in df.columns:
-        df_sorted['Current Position/Rank'] = pd.to_numeric(df_sorted['Current Position/Rank'], errors='coerce')
-    
-    # Convert score to numeric if available
-    if score_col is not None:
-        df_sorted[score_col] = pd.to_numeric(df_sorted[score_col], errors='coerce')
-    
-    # Sort by position
-    try:
-        if 'Current Position/Rank' in df_sorted.columns:
-            df_sorted = df_sorted.sort_values('Current Position/Rank', ascending=True).reset_index(drop=True)
-        elif score_col is not None:
-            df_sorted = df_sorted.sort_values(score_col, ascending=False).reset_index(drop=True)
-    except Exception as e:
-        logger.warning(f"Could not sort data: {e}")
-        df_sorted = df.copy()
+    st.markdown("#### 📋 Current Standings")
     
     # Display results with enhanced athlete cards
-    display_boulder_athlete_cards(df_sorted, score_col, competition_name)
+    display_boulder_athlete_cards(snapshot)
 
 
-def display_boulder_athlete_cards(df_sorted: pd.DataFrame, score_col: Optional[str], competition_name: str):
-    """Display enhanced athlete cards for boulder competitions"""
+@st.cache_data(show_spinner=False, max_entries=64)
+@METRICS.timed("simulate")
+def podium_probabilities(competition: str, body_hash: str, previous_ranks: Tuple[Tuple[str, float], ...],
+                         outcomes: Tuple[np.ndarray, np.ndarray], _snapshot: CompetitionSnapshot) -> pd.DataFrame:
+    """Simulated finishing probabilities, computed once per distinct sheet body.
     
-    for idx, row in df_sorted.iterrows():
-        if pd.isna(row.get('Athlete Name')) or row.get('Athlete Name') == '':
-            continue
-            
-        rank = row.get('Current Position/Rank', 'N/A')
-        athlete = DataProcessor.clean_text(str(row.get('Athlete Name', 'Unknown')))
-        total_score = row.get(score_col, 'N/A') if score_col else 'N/A'
-        
-        # Calculate boulder completion
-        boulder_info = calculate_boulder_completion(row)
-        
-        # Determine athlete status and styling - PASS THE ROW DATA
-        card_class, position_emoji = determine_athlete_status(
-            rank, total_score, boulder_info, competition_name, row
-        )
-        
-        # Create strategy display if applicable
-        strategy_display = create_strategy_display(row, boulder_info, competition_name)
-        
-        # Create the athlete card
-        create_athlete_card(
-            position_emoji, athlete, total_score, boulder_info, 
-            strategy_display, card_class
-        )
+    Keyed by competition, body hash, the countback ranks the snapshot was built with and the
+    outcome table (the snapshot itself is not hashed), so every session and every rerun showing
+    the same body shares one simulation, while a countback change or a refitted table reruns it.
+    """
+    return PodiumSimulation.probabilities(_snapshot, outcomes)
 
 
-def calculate_boulder_completion(row: pd.Series) -> Dict[str, any]:
-    """Calculate boulder completion information for an athlete"""
-    boulder_scores = []
-    completed_boulders = 0
-    
-    for i in range(1, 5):
-        col_name = f'Boulder {i} Score (0-25)'
-        if col_name in row.index:
-            score = row.get(col_name, '-')
-            if pd.notna(score) and str(score) != '-' and str(score) != '':
-                boulder_scores.append(f"B{i}: {score}")
-                completed_boulders += 1
-            else:
-                boulder_scores.append(f"B{i}: -")
+def display_podium_probabilities(snapshot: CompetitionSnapshot, body_hash: str):
+    """Show simulated win/podium chances while athletes still have boulders to climb"""
+    previous_ranks = tuple(sorted((snapshot.previous_ranks or {}).items()))
+    chances = podium_probabilities(snapshot.name, body_hash, previous_ranks, get_boulder_outcomes(), snapshot)
+    if chances.empty:
+        return
+    with st.expander("🎲 Podium probabilities"):
+        st.caption(f"{PodiumSimulation.SIMULATIONS:,} simulations of the remaining boulders, "
+                   f"drawn from recorded boulder results")
+        st.dataframe(chances, use_container_width=True, hide_index=True)
+
+
+def display_score_disagreements(disagreements: pd.DataFrame):
+    """Flag athletes whose sheet total or rank differs from local scoring"""
+    st.warning(f"🧮 Local scoring disagrees with the sheet for {len(disagreements)} athlete(s)")
+    with st.expander("🔍 Scoring differences"):
+        st.dataframe(disagreements, use_container_width=True, hide_index=True)
+
+
+def display_boulder_athlete_cards(snapshot: CompetitionSnapshot):
+    """Display enhanced athlete cards for boulder competitions as a single element"""
+    render_standings(snapshot.name, snapshot.cards)
+
+
+def render_standings(competition_name: str, cards: List[CardState]):
+    """Emit a competition's cards, re-rendering only athletes whose card changed since the last refresh"""
+    if not cards:
+        return
     
-    boulder_display = " | ".join(boulder_scores) if boulder_scores else "No boulder data"
+    standings_state = st.session_state.setdefault('standings_state', {})
+    previous = standings_state.get(competition_name)
     
-    # Check for worst finish information
-    worst_finish_display = ""
-    if completed_boulders == 4:
-        worst_finish_col = next((
-            col for col in row.index 
-            if 'worst' in str(col).lower() and 'finish' in str(col).lower()
-        ), None)
-        
-        if worst_finish_col:
-            worst_finish = row.get(worst_finish_col, 'N/A')
-            if worst_finish not in ['N/A', '', None] and not pd.isna(worst_finish):
-                worst_finish_clean = DataProcessor.clean_text(str(worst_finish))
-                if worst_finish_clean and worst_finish_clean != '-':
-                    worst_finish_display = f" | Worst Finish: {worst_finish_clean}"
+    if previous is None:
+        diff = StandingsDiff()
+        html = "\n".join(card.html for card in cards)
+        last_update = None
+    else:
+        diff = diff_standings(previous['cards'], cards)
+        if not diff.has_changes:
+            # Byte-identical element: the browser keeps the existing DOM untouched
+            html = previous['html']
+            diff = previous['diff']
+            last_update = previous['last_update']
+        else:
+            updated = set(diff.updated_keys)
+            html = "\n".join(
+                card.html.replace('class="athlete-row ', 'class="athlete-row recently-updated ', 1)
+                if card.key in updated else card.html
+                for card in cards
+            )
+            last_update = datetime.now() if diff.updated_keys else previous['last_update']
     
-    return {
-        'boulder_scores': boulder_scores,
-        'completed_boulders': completed_boulders,
-        'boulder_display': boulder_display,
-        'worst_finish_display': worst_finish_display
+    standings_state[competition_name] = {
+        'cards': cards, 'html': html, 'diff': diff, 'last_update': last_update
     }
-
-
-def create_strategy_display(row: pd.Series, boulder_info: Dict, competition_name: str) -> str:
-    """Create strategy display for boulder competitions"""
-    strategy_display = ""
-    completed_boulders = boulder_info['completed_boulders']
-    
-    if ("Semis" in competition_name or "Final" in competition_name) and completed_boulders == 3:
-        strategy_cols = {}
-        for col in row.index:
-            col_str = str(col)
-            if '1st Place Strategy' in col_str:
-                strategy_cols['1st'] = col
-            elif '2nd Place Strategy' in col_str:
-                strategy_cols['2nd'] = col
-            elif '3rd Place Strategy' in col_str:
-                strategy_cols['3rd'] = col
-            elif 'Points Needed for Top 8' in col_str:
-                strategy_cols['top8'] = col
-        
-        if strategy_cols:
-            strategies = []
-            has_impossible_top8 = False
-            
-            for place, col in strategy_cols.items():
-                strategy_value = row.get(col, '')
-                if strategy_value and str(strategy_value) not in ['', 'nan', 'N/A']:
-                    strategy_clean = DataProcessor.clean_text(str(strategy_value))
-                    if strategy_clean:
-                        if place == '1st':
-                            strategies.append(f"🥇 1st: {strategy_clean}")
-                        elif place == '2nd':
-                            strategies.append(f"🥈 2nd: {strategy_clean}")
-                        elif place == '3rd':
-                            strategies.append(f"🥉 3rd: {strategy_clean}")
-                        elif place == 'top8' and "Semis" in competition_name:
-                            strategies.append(f"🎯 Top 8: {strategy_clean}")
-                            if "IMPOSSIBLE" in strategy_clean.upper():
-                                has_impossible_top8 = True
-            
-            if strategies:
-                comp_type = "Final" if "Final" in competition_name else "Semi"
-                strategy_display = f"<br><div class='targets'><strong>{comp_type} Strategy:</strong> {' | '.join(strategies)}</div>"
-                
-                if has_impossible_top8 and "Semis" in competition_name:
-                    return strategy_display, "eliminated"
-    
-    return strategy_display
-
-
-def create_athlete_card(position_emoji: str, athlete: str, total_score: any, 
-                       boulder_info: Dict, strategy_display: str, card_class: str):
-    """Create and display an athlete card"""
-    completed_boulders = boulder_info['completed_boulders']
-    boulder_display = boulder_info['boulder_display']
-    worst_finish_display = boulder_info['worst_finish_display']
-    
-    # Ensure card_class is never empty
-    if not card_class or card_class.strip() == "":
-        card_class = "awaiting-result"
-    
-    # Check if strategy display indicates impossible Top 8
-    if isinstance(strategy_display, tuple):
-        strategy_display, override_class = strategy_display
-        if override_class == "eliminated":
-            card_class = "eliminated"
-            position_emoji = "❌"
-    
-    # Create detail text based on completion status
-    if completed_boulders == 4:
-        detail_text = f"Total: {total_score} | {boulder_display}{worst_finish_display}"
-    elif completed_boulders == 3:
-        detail_text = f"Total: {total_score} | {boulder_display} | 1 boulder remaining"
-    else:
-        detail_text = f"Total: {total_score} | {boulder_display} | Progress: {completed_boulders}/4"
     
-    st.markdown(f"""
-    <div class="athlete-row {card_class}">
-        <strong>{position_emoji} - {athlete}</strong><br>
-        <small>{detail_text}</small>{strategy_display}
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(html, unsafe_allow_html=True)
+    
+    if last_update is not None and diff.changed:
+        changes = ", ".join(f"{key} ({', '.join(fields)})" for key, fields in diff.changed.items())
+        st.caption(f"🔔 Updated at {last_update.strftime('%H:%M:%S')}: {changes}")
 
 
-def display_lead_results(df: pd.DataFrame, competition_name: str):
+@METRICS.timed("render_lead")
+def display_lead_results(snapshot: CompetitionSnapshot):
     """Enhanced lead competition results display"""
-    status, status_emoji = CompetitionStatusDetector.get_competition_status(df, competition_name)
-    status_class = f"badge-{status}"
+    competition_name = snapshot.name
+    status_class = f"badge-{snapshot.status}"
     
     st.markdown(f"""
     ### 🧗‍♀️ {competition_name}
-    <span class="status-badge {status_class}">{status_emoji} {status.upper()}</span>
+    <span class="status-badge {status_class}">{snapshot.status_emoji} {snapshot.status.upper()}</span>
     """, unsafe_allow_html=True)
     
-    if df.empty:
+    if snapshot.df.empty:
         st.markdown('<div class="error-card">⚠️ No data available for this competition</div>', unsafe_allow_html=True)
         return
     
-    if 'Name' not in df.columns:
-        st.markdown('<div class="error-card">⚠️ Name column not found in data</div>', unsafe_allow_html=True)
+    if not snapshot.is_valid:
+        st.markdown(f'<div class="error-card">⚠️ {"; ".join(snapshot.issues)}</div>', unsafe_allow_html=True)
         return
     
-    # Extract qualification info and filter active athletes
-    qualification_info = extract_qualification_info(df)
-    active_df = filter_active_athletes(df, competition_name)
-    
     # Display enhanced metrics
-    display_enhanced_metrics(active_df, competition_name)
+    display_enhanced_metrics(snapshot.metrics, competition_name)
     
     st.markdown("#### 📋 Current Standings")
     
     # Show qualification thresholds
-    display_qualification_thresholds(qualification_info)
+    display_qualification_thresholds(snapshot.qualification_info)
     
-    # Sort and display athletes
-    display_lead_athletes(active_df, qualification_info)
-
-
-def extract_qualification_info(df: pd.DataFrame) -> Dict[str, str]:
-    """Extract qualification threshold information from dataframe"""
-    qualification_info = {}
-    try:
-        threshold_cols = ['Hold for 1st', 'Hold for 2nd', 'Hold for 3rd', 'Hold to Qualify', 'Min to Qualify']
-        for _, row in df.iterrows():
-            if pd.isna(row.get('Name')) or row.get('Name') == '':
-                continue
-            for col in threshold_cols:
-                if col in df.columns and pd.notna(row.get(col)):
-                    qualification_info[col] = DataProcessor.clean_text(str(row.get(col)))
-    except Exception as e:
-        logger.warning(f"Error extracting qualification thresholds: {e}")
-    return qualification_info
-
-
-def filter_active_athletes(df: pd.DataFrame, competition_name: str) -> pd.DataFrame:
-    """Filter out reference rows to get only active athletes"""
-    try:
-        active_df = df[
-            df['Name'].notna() & 
-            (df['Name'] != '') & 
-            (~df['Name'].astype(str).str.isdigit()) &
-            (~df['Name'].astype(str).str.contains('Hold for', na=False)) &
-            (~df['Name'].astype(str).str.contains('Min to', na=False)) &
-            (~df['Name'].astype(str).str.contains('TBD|TBA|Qualification|Threshold|Zone|Top', na=False, case=False)) &
-            (~df['Name'].astype(str).str.startswith(('Hold', 'Min', '#'), na=False)) &
-            (~df['Name'].apply(is_placeholder_athlete))
-        ]
-        
-        # Set expected athlete counts based on competition type
-        if "Lead Semis" in competition_name:
-            expected_max = 24
-        elif "Boulder Semis" in competition_name:
-            expected_max = 20
-        elif "Final" in competition_name:
-            expected_max = 8
-        else:
-            expected_max = 999
-        
-        if "Lead Semis" in competition_name:
-            if len(active_df) >= 24:
-                active_df = active_df.head(24)
-                logger.info(f"{competition_name}: Using first 24 athletes")
-            else:
-                logger.warning(f"{competition_name}: Only found {len(active_df)} athletes, expected 24")
-        
-        elif expected_max < 999 and len(active_df) > expected_max and 'Current Rank' in active_df.columns:
-            active_df['temp_rank'] = pd.to_numeric(active_df['Current Rank'], errors='coerce')
-            
-            rank_filtered = active_df[
-                (active_df['temp_rank'].notna()) & 
-                (active_df['temp_rank'] >= 1) & 
-                (active_df['temp_rank'] <= expected_max)
-            ]
-            
-            if len(rank_filtered) == expected_max:
-                active_df = rank_filtered.drop('temp_rank', axis=1)
-            else:
-                active_df = active_df.drop('temp_rank', axis=1).head(expected_max)
-        
-        elif expected_max < 999 and len(active_df) > expected_max:
-            active_df = active_df.head(expected_max)
-        
-        return active_df
-        
-    except Exception as e:
-        logger.error(f"Error filtering athletes: {e}")
-        fallback_df = df[
-            df['Name'].notna() & 
-            (df['Name'] != '') &
-            (~df['Name'].astype(str).str.contains('Hold for', na=False))
-        ]
-        
-        if "Lead Semis" in competition_name:
-            fallback_df = fallback_df.head(24)
-        elif "Final" in competition_name:
-            fallback_df = fallback_df.head(8)
-            
-        return fallback_df
-
-
-def is_placeholder_athlete(name: str) -> bool:
-    """Check if name is a placeholder like 'Athlete 1', 'Athlete 23', etc."""
-    name_str = str(name).strip()
-    if name_str.startswith('Athlete '):
-        remaining = name_str[8:].strip()
-        return remaining.isdigit()
-    return False
+    # Display athletes, already filtered and sorted in the snapshot
+    display_lead_athletes(snapshot)
 
 
 def display_qualification_thresholds(qualification_info: Dict[str, str]):
@@ -1317,82 +988,14 @@ def display_qualification_thresholds(qualification_info: Dict[str, str]):
             """, unsafe_allow_html=True)
 
 
-def display_lead_athletes(active_df: pd.DataFrame, qualification_info: Dict[str, str]):
+def display_lead_athletes(snapshot: CompetitionSnapshot):
     """Display lead competition athletes with enhanced formatting"""
-    try:
-        if 'Current Rank' in active_df.columns:
-            active_df['Current Rank'] = pd.to_numeric(active_df['Current Rank'], errors='coerce')
-            active_df = active_df.sort_values('Current Rank', ascending=True).reset_index(drop=True)
-    except Exception as e:
-        logger.warning(f"Could not sort by rank: {e}")
-    
-    for _, row in active_df.iterrows():
-        name = DataProcessor.clean_text(str(row.get('Name', 'Unknown')))
-        score = row.get('Manual Score', 'N/A')
-        rank = row.get('Current Rank', 'N/A')
-        status = DataProcessor.clean_text(str(row.get('Status', 'Unknown')))
-        worst_finish = row.get('Worst Finish', 'N/A')
-        
-        has_score = score not in ['N/A', '', None] and not pd.isna(score)
-        
-        threshold_display = create_threshold_display(has_score, qualification_info)
-        
-        card_class, status_emoji = determine_lead_athlete_status(status, has_score)
-        
-        position_emoji = get_lead_position_emoji(rank, has_score, card_class, status_emoji)
-        
-        score_display = score if has_score else "Awaiting Result"
-        worst_finish_display = format_worst_finish(worst_finish, has_score)
-        
-        st.markdown(f"""
-        <div class="athlete-row {card_class}">
-            <strong>{position_emoji} #{rank} - {name}</strong><br>
-            <small>Score: {score_display} | Status: {status}{worst_finish_display}</small>{threshold_display}
-        </div>
-        """, unsafe_allow_html=True)
-
-
-def create_threshold_display(has_score: bool, qualification_info: Dict[str, str]) -> str:
-    """Create threshold display for athletes without scores"""
-    if has_score or not qualification_info:
-        return ""
-    
-    thresholds = []
-    for key, value in qualification_info.items():
-        if key == 'Hold for 1st':
-            thresholds.append(f'🥇 For 1st Hold: {value}')
-        elif key == 'Hold for 2nd':
-            thresholds.append(f'🥈 For 2nd Hold: {value}')
-        elif key == 'Hold for 3rd':
-            thresholds.append(f'🥉 For 3rd Hold: {value}')
-        elif key == 'Hold to Qualify':
-            thresholds.append(f'🎯 For 8th Hold: {value}')
-        elif key == 'Min to Qualify':
-            thresholds.append(f'📊 For 8th Points: {value}')
-    
-    if thresholds:
-        return f"<br><div class='targets'><strong>Targets:</strong><br>{' | '.join(thresholds)}</div>"
-    return ""
-
-
-def get_lead_position_emoji(rank: any, has_score: bool, card_class: str, status_emoji: str) -> str:
-    """Get position emoji for lead athletes"""
-    rank_num = DataProcessor.safe_numeric_conversion(rank)
-    if rank_num > 0:
-        return status_emoji if has_score and card_class else f"#{rank_num}"
-    return "📄"
-
-
-def format_worst_finish(worst_finish: any, has_score: bool) -> str:
-    """Format worst finish display"""
-    if not has_score or worst_finish in ['N/A', '', None] or pd.isna(worst_finish):
-        return ""
-    
-    worst_finish_clean = DataProcessor.clean_text(str(worst_finish))
-    return f" | Worst Finish: {worst_finish_clean}" if worst_finish_clean and worst_finish_clean != '-' else ""
+    render_standings(snapshot.name, snapshot.cards)
 
 
 if __name__ == "__main__":
+    pd.set_option("mode.copy_on_write", True)
+    configure_page()
     try:
         main()
     except Exception as e: